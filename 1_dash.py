@@ -1,71 +1,176 @@
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from datetime import datetime
 
+from utils.cache_figuras import normalizar_chave
+from utils.correlacao import correlacao, reta_tendencia
+from utils.dados import cache_figuras, carregar_anual, carregar_correlacoes, carregar_eventos, carregar_kpis, carregar_mensal, carregar_ohlc, exportar_metricas, metricas, relatorio_memoria, versao_dados
+from utils.exportacao import botoes_download
+from utils.instrumentacao import ETAPAS
+from utils.registro import situacao
+from utils.sparklines import sparklines_svg
+
 
 
 
 # -------------------------------------------- funções --------------------------------------------
 
-def plot_sparkline(df_ano, coluna, titulo):
-    """Cria um pequeno gráfico de linha (sparkline) para mostrar a evolução do KPI."""
+# preço exibido nos seletores -> coluna do preço nos dados mensais (a mesma para todas as seções)
+PRECOS = {
+    "Chicago - CBOT (US$/t)": "chicago_cbot_u$/t",
+    "FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t",
+    "Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca",
+    "Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca",
+    "Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca",
+    "Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca",
+}
+
+# KPIs anuais com sparkline no painel: coluna -> título (tooltip)
+SPARKLINES_ANUAIS = {
+    "saldo": "Saldo Oferta / Demanda",
+    "usdbrl": "Câmbio USD/BRL",
+    "estoque_inicial": "Estoque Inicial",
+    "producao": "Produção",
+    "importacao": "Importação",
+    "exportacao": "Exportação",
+    "processamento": "Processamento",
+}
+
+
+def dispersao(df, x, y, color, color_continuous_scale, labels, opacity=1):
+    """Dispersão `x` × `y` colorida pela coluna contínua `color`, como o px.scatter, só com graph_objects.
+
+    O plotly.express (~0,3 s de import) não é carregado: a figura é a mesma (escala em `coloraxis`, rótulos de `labels`).
+    """
+
+    rotulo = {coluna: labels.get(coluna, coluna) for coluna in (x, y, color)}
+
+    fig = go.Figure(go.Scatter(
+        x=df[x],
+        y=df[y],
+        mode="markers",
+        marker=dict(color=df[color], coloraxis="coloraxis", opacity=opacity, symbol="circle"),
+        hovertemplate=f"{rotulo[x]}=%{{x}}<br>{rotulo[y]}=%{{y}}<br>{rotulo[color]}=%{{marker.color}}<extra></extra>",
+        name="",
+        showlegend=False,
+    ))
+    fig.update_layout(
+        xaxis_title=rotulo[x],
+        yaxis_title=rotulo[y],
+        coloraxis=dict(colorscale=color_continuous_scale, colorbar=dict(title=rotulo[color])),
+        legend_tracegroupgap=0,
+    )
+    return fig
+
+
+def delta_yoy(variacao):
+    """Delta do st.metric com a variação YoY; None (sem delta) quando a faixa não tem o ano anterior."""
+
+    return None if pd.isna(variacao) else f"{variacao:.2f}% YoY"
+
+
+def sentido_correlacao(r):
+    """Delta do st.metric da correlação; None quando a faixa tem menos de dois meses (correlação indefinida)."""
+
+    if pd.isna(r):
+        return None
+    return "Positiva" if r > 0 else "Negativa"
 
-    # Definir se a tendência é de alta (verde) ou baixa (vermelho)
-    inicio = df_ano[coluna].iloc[0]
-    fim = df_ano[coluna].iloc[-1]
-    cor_verde = "#2ca02c"  # Verde vibrante do Streamlit
-    cor_vermelha = "#d62728"  # Vermelho vibrante do Streamlit
-    cor = cor_verde if fim >= inicio else cor_vermelha
-    fill_cor = "rgba(44, 200, 44, 0.3)" if fim >= inicio else "rgba(214, 39, 40, 0.3)"  # Transparência ajustada
 
-    fig = go.Figure()
-    
+def adicionar_tendencia(fig, correlacoes, df_faixa, coluna_preco, driver, anos):
+    """Desenha a reta OLS (driver em função do preço) com coeficientes das somas acumuladas pré-calculadas."""
+
+    inclinacao, intercepto, r2 = reta_tendencia(correlacoes, driver, coluna_preco, *anos)
+    x = [df_faixa[coluna_preco].min(), df_faixa[coluna_preco].max()]
+    y = [intercepto + inclinacao * valor for valor in x]
+
     fig.add_trace(go.Scatter(
-        x=df_ano["periodo"], 
-        y=df_ano[coluna], 
-        mode='lines',
-        fill='tozeroy',
-        line=dict(width=2, color=cor),
-        fillcolor=fill_cor,
-        name=titulo
+        x=x,
+        y=y,
+        mode="lines",
+        line=dict(color="blue"),
+        name="OLS trendline",
+        showlegend=False,
+        hovertemplate=f"<b>OLS trendline</b><br>{driver} = {inclinacao:.6g} * preço + {intercepto:.6g}<br>R²={r2:.6f}<extra></extra>"
     ))
 
-    # Personalizando o layout do gráfico
-    fig.update_layout(
-        height=50,  # Altura pequena para o gráfico ficar compacto
-        margin=dict(l=20, r=20, t=0, b=0),  # Remove margens para economizar espaço
-        xaxis=dict(showticklabels=False, showgrid=False, zeroline=False),  # Esconder eixos
-        yaxis=dict(showticklabels=False, showgrid=False, zeroline=False),
-    )
-    
     return fig
 
 
+def adicionar_anotacoes_cambio(fig, df_usdbrl, df_eventos):
+    """Adiciona as anotações de variação anual (YoY) e os marcadores de eventos com um único `update_layout`."""
+
+    # variação anual a partir do último registro de cada ano (o primeiro ano não tem base de comparação)
+    df_ultimo_dia_do_ano = df_usdbrl.groupby("ano").last().reset_index()
+    variacao_anual = (df_ultimo_dia_do_ano["usdbrl"].pct_change() * 100).to_numpy()[1:]
+    periodos = df_ultimo_dia_do_ano["periodo"].iloc[1:]
+    valores = df_ultimo_dia_do_ano["usdbrl"].to_numpy()[1:]
+    cores = np.where(variacao_anual > 0, "green", "red")
+
+    anotacoes = [
+        dict(x=periodo, y=valor, text=f"{variacao:.1f}%<br>YoY", showarrow=True, arrowhead=4,
+             ax=-15, ay=-60, font=dict(color=cor, size=12), bgcolor="rgba(255,255,255,0.7)")
+        for periodo, valor, variacao, cor in zip(periodos, valores, variacao_anual, cores)
+    ]
+
+    # eventos: linha vertical tracejada + rótulo no topo ou na base do gráfico (coluna `posicao`)
+    y_eventos = np.where(df_eventos["posicao"] == "topo", df_usdbrl["usdbrl"].max() + 1.5, df_usdbrl["usdbrl"].min())
+    textos = df_eventos["texto"].str.replace(" ", "<br>")
+
+    anotacoes += [
+        dict(x=data, y=y, text=texto, showarrow=False, font=dict(size=12, color="blue"),
+             bgcolor="rgba(255,255,255,0.7)", align="center")
+        for data, y, texto in zip(df_eventos["data"], y_eventos, textos)
+    ]
+    marcadores = [
+        dict(type="line", xref="x", yref="y domain", x0=data, x1=data, y0=0, y1=1,
+             line=dict(width=2, dash="dash", color="blue"))
+        for data in df_eventos["data"]
+    ]
+
+    fig.update_layout(annotations=anotacoes, shapes=marcadores)
+    return fig
+
 
+def figura_cacheada(secao, chave, construir):
+    """Busca a figura no cache LRU compartilhado entre sessões ou a constrói com `construir()` (miss)."""
 
-# ------------------------------------ Carregamento dos DADOS -----------------------------------------------------
+    # a versão dos dados entra na chave: figuras de arquivos antigos nunca são reaproveitadas
+    with metricas().span(secao, "figura"):
+        return cache_figuras().obter(secao, (versao_dados(), *normalizar_chave(chave)), construir)
 
-# dados mensais
-df = pd.read_csv("database/soja_mensal1.csv", index_col = 0)
-df = df.dropna()
 
+def exibir_grafico(secao, fig, **kwargs):
+    """`st.plotly_chart` na largura da coluna, medido como etapa de serialização da seção (JSON da figura enviado ao navegador)."""
 
-# dados anuais
-df_ano = pd.read_csv("database/soja_anual1.csv")
+    with metricas().span(secao, "serializacao"):
+        st.plotly_chart(fig, width="stretch", **kwargs)
 
 
+# ------------------------------------ Carregamento dos DADOS -----------------------------------------------------
 
+# dados compartilhados entre reruns, sessões e páginas (invalidados quando o arquivo muda); as faixas
+# de anos são fatias por busca binária sobre o índice de datas ordenado (sem máscara nem cópia)
 
+# tempo de carga registrado como a etapa "carga" da seção "dados" (painel admin e arquivo de métricas)
+with metricas().span("dados", "carga"):
+    # dados mensais (sem linhas incompletas, com `periodo` em datetime)
+    mensal = carregar_mensal()
 
-df_dolar = pd.read_csv("database/variacao_cambial.csv", index_col=0)
-#df = df[(df["ano"] >= 2000) & (df["ano"] <= 2024)]
-#df_ano = df_ano[(df_ano["periodo"] >= 2000) & (df_ano["periodo"] <= 2024)]
-df_dolar = df_dolar[(df_dolar["ano"] >= 2000) & (df_dolar["ano"] <= 2024)]
+    # dados anuais (com `saldo` anual)
+    anual = carregar_anual()
+    df_ano = anual.frame
 
+    # eventos marcados no gráfico do câmbio (database/eventos_cambio.csv)
+    df_eventos = carregar_eventos()
 
+    # KPIs (valor e variação YoY) materializados para todos os anos: o painel faz só uma consulta por linha
+    kpis = carregar_kpis()
 
+    # somas acumuladas para as correlações de Pearson (consulta O(1) por faixa de anos)
+    correlacoes = carregar_correlacoes()
 
 
 # ---------------------- config streamlit ----------------------------------------
@@ -88,1072 +193,1028 @@ with st.container(border=True):
 
 # ------------------------------------------------------- seção 01 - KPIs -------------------------------------------------------------------
 
-with st.container(border=True):
+# cada seção é um fragmento: interações com seus widgets reexecutam apenas a própria seção
+@st.fragment
+@metricas().medir("kpis", depois=exportar_metricas)
+def secao_kpis():
+    """Seção 01: KPIs do último ano selecionado."""
 
-    # container titulo KPIs
     with st.container(border=True):
 
-        subtitulo, espm, periodo, espm, preco = st.columns([1.5,0.1,1,0.1,1.5])   
-
-        with subtitulo:
-            st.markdown("<h4 style='text-align: center; margin-top: 18px;'>📊 Panorama KPIs Mercado da Soja</h4>", unsafe_allow_html=True)
-
-        with periodo:
-            anos_selecionados = st.slider(
-                "Selecione o Período:", 
-                min_value=int(df_ano["periodo"].min()), 
-                max_value=int(df_ano["periodo"].max()), 
-                value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
-                                        key="slider_1"
-                                        )
-
-        with preco:
-            preco_selecionado = st.selectbox(
-                "Selecione o Preço:", (
-                    "Chicago - CBOT (US$/t)", 
-                    "FOB Porto - Paranaguá (US$/t)", 
-                    "Maringá / PR - R$/saca (sem ICMS)", 
-                    "Mogiana / SP - R$/saca (sem ICMS)", 
-                    "Passo Fundo / RS - R$/saca (sem ICMS)", 
-                    "Rondonopolis / MT - R$/saca (sem ICMS)"
-                    ), 
-                index = 5,
-                key="select_1"
-                )
+        # container titulo KPIs
+        with st.container(border=True):
 
-    # filtro e tratamento de dados
-    df_kpi = df[(df["ano"] >= anos_selecionados[0]) & (df["ano"] <= anos_selecionados[1])]
-    df_ano_kpi = df_ano[(df_ano["periodo"] >= anos_selecionados[0]) & (df_ano["periodo"] <= anos_selecionados[1])]
-
-    df_kpi["ano_mes"] = pd.to_datetime(df_kpi["ano_mes"])
-    df_kpi["periodo"] = df_kpi["ano_mes"]
-    df_ano_kpi["saldo"] = df_ano_kpi["estoque_final"] - df_ano_kpi["estoque_inicial"]
-
-    #df_dolar_kpi = df_dolar[(df_dolar["ano"] >= anos_selecionados[0]) & (df_dolar["ano"] <= anos_selecionados[1])]
-    #df_dolar_kpi["periodo"] = pd.to_datetime(df_dolar_kpi["datetime"])
-    
-
-    # obter ultimo e penultimo ano disponiveis
-    ultimo_ano = df_ano_kpi["periodo"].max()
-    penultimo_ano = ultimo_ano - 1
-    ultimo_ano_mensal = df_kpi["ano"].max()
-    penultimo_ano_mensal = ultimo_ano_mensal - 1
-
-    # obter dados kpis
-    df_ultimo_ano = df_ano_kpi[df_ano_kpi["periodo"] == ultimo_ano]
-    df_penultimo_ano = df_ano_kpi[df_ano_kpi["periodo"] == penultimo_ano]
-
-
-    # Criando layout de 3 colunas oferta, demanda, chave
-        # oferta - kpi2, kpi3, kpi4
-        # demanda - kpi5, kpi6, 
-        # chave - kpi 1, kpi7, kpi8
-    chave, oferta, demanda = st.columns(3)
-    
-    # KPIs chave
-    with chave:
-        #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-
-        with st.container(border=True): # cria container
-            st.markdown("<h4 style='text-align: center;'>Indicadores Chaves</h4>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+            subtitulo, espm, periodo, espm, preco = st.columns([1.5,0.1,1,0.1,1.5])   
 
-            # Indicador de saldo oferta - demanda           
-            esp, kpi, esp = st.columns([0.15,1,0.15])
-            with kpi:
-                dado_atual_estoque = df_ultimo_ano["estoque_inicial"].iloc[0]
-                dado_anterior_estoque = df_penultimo_ano["estoque_inicial"].iloc[0]
-                dado_atual_saldo = df_ultimo_ano["estoque_final"].iloc[-1] - dado_atual_estoque
-                dado_anterior_saldo = df_penultimo_ano["estoque_final"].iloc[-1] - dado_anterior_estoque
-                variacao_saldo = ((dado_atual_saldo - dado_anterior_saldo) / dado_anterior_saldo) * 100
+            with subtitulo:
+                st.markdown("<h4 style='text-align: center; margin-top: 18px;'>📊 Panorama KPIs Mercado da Soja</h4>", unsafe_allow_html=True)
 
-                st.metric(
-                label = f"**Saldo Oferta/Demanda {df_ano_kpi["periodo"].max()} (1000 t)**",
-                value = f"{dado_atual_saldo/1000:.1f}k",
-                delta = f"{variacao_saldo:.2f}% YoY",
-                border = True
-                )
+            with periodo:
+                anos_selecionados = st.slider(
+                    "Selecione o Período:", 
+                    min_value=int(df_ano["periodo"].min()), 
+                    max_value=int(df_ano["periodo"].max()), 
+                    value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
+                                            key="slider_1"
+                                            )
 
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "saldo", "Saldo Oferta / Demanda"), use_container_width=True, config={'displayModeBar': False})
+            with preco:
+                preco_selecionado = st.selectbox(
+                    "Selecione o Preço:", list(PRECOS),
+                    index = 5,
+                    key="select_1"
+                    )
 
-            # Indicador do dolar
-            esp, kpi, esp = st.columns([0.15,1,0.15])
-            with kpi:
-                dado_atual_dolar = df_ultimo_ano["usdbrl"].iloc[-1]
-                dado_anterior_dolar = df_penultimo_ano["usdbrl"].iloc[-1]
-                variacao_dolar = ((dado_atual_dolar - dado_anterior_dolar) / dado_anterior_dolar) * 100
+        # filtro e tratamento de dados
+        with metricas().span("kpis", "filtro"):
+            df_kpi = mensal.anos(*anos_selecionados)
+            df_ano_kpi = anual.anos(*anos_selecionados)
 
-                st.metric(
-                    label = f"**Cambîo  USD/BRL {df_ano_kpi["periodo"].max()}**",
-                    value = f"{dado_atual_dolar}",
-                    delta = f"{variacao_dolar:.2f}% YoY",
-                    border = True
-                )
-    
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "usdbrl", "Câmbio USD/BRL"), use_container_width=True, config={'displayModeBar': False})
-
-            # Indicador de preco
-            esp, kpi, esp = st.columns([0.15,1,0.15])
-            with kpi:
-                tabela_preco = {
-                    "Chicago - CBOT (US$/t)": "chicago_cbot_u$/t",
-                    "FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t",
-                    "Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca",
-                    "Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca",
-                    "Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca",
-                    "Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca",
-                }
-
-                coluna_preco = tabela_preco[preco_selecionado]
-                df_preco_ultimo_ano = df_kpi[df_kpi["ano"] == ultimo_ano_mensal].sort_values("ano_mes")
-                df_preco_penultimo_ano = df_kpi[df_kpi["ano"] == penultimo_ano_mensal].sort_values("ano_mes")
-                dado_atual_preco = df_preco_ultimo_ano[coluna_preco].iloc[-1]
-                dado_anterior_preco = df_preco_penultimo_ano[coluna_preco].iloc[-1]
-                variacao_preco = ((dado_atual_preco - dado_anterior_preco) / dado_anterior_preco) * 100
-    
-                st.metric(
-            label = f"**{df_kpi["ano"].max()} {preco_selecionado}**",
-                    value = f"{dado_atual_preco:.2f}",
-                    delta = f"{variacao_preco:.2f}% YoY",
-                    border = True
-                )
+        #df_dolar_kpi = df_dolar[(df_dolar["ano"] >= anos_selecionados[0]) & (df_dolar["ano"] <= anos_selecionados[1])]
+        #df_dolar_kpi["periodo"] = pd.to_datetime(df_dolar_kpi["datetime"])
 
-            st.plotly_chart(plot_sparkline(df_kpi, coluna_preco, f"{preco_selecionado}"), use_container_width=True, config={'displayModeBar': False})
-    
-    # KPIs de oferta
-    with oferta:
-        #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-        with st.container(border=True): # cria container
-            st.markdown("<h4 style='text-align: center;'>Indicadores de Oferta</h4>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+        # obter ultimo ano disponivel e sua linha na tabela materializada de KPIs (valor e variação YoY)
+        with metricas().span("kpis", "agregacao"):
+            ultimo_ano = df_ano_kpi["periodo"].max()
+            kpis_ano = kpis.loc[ultimo_ano]
 
-            # Indicador de estoque inicial
-            esp, kpi, esp = st.columns([0.15,1,0.15])
-            with kpi:
-                dado_atual_estoque = df_ultimo_ano["estoque_inicial"].iloc[0]
-                dado_anterior_estoque = df_penultimo_ano["estoque_inicial"].iloc[0]
-                variacao_estoque = ((dado_atual_estoque - dado_anterior_estoque) / dado_anterior_estoque) * 100
+        # sem meses na faixa (ex.: só 2025), o preço e sua sparkline usam o último ano mensal disponível
+        if df_kpi.empty:
+            df_kpi = mensal.anos(kpis_ano["ano_preco"], kpis_ano["ano_preco"])
 
-                st.metric(
-                    label = f"**Estoque Inicial {df_ano_kpi["periodo"].max()} (1000 t)**",
-                    value = f"{dado_atual_estoque}",
-                    delta = f"{variacao_estoque:.2f}% YoY",
-                    border = True
-                )
+        coluna_preco = PRECOS[preco_selecionado]
 
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "estoque_inicial", "Estoque Inicial"), use_container_width=True, config={'displayModeBar': False})
+        # todas as sparklines do painel geradas de uma vez (um único item no cache) como SVG inline
+        def construir():
+            series = {coluna: (df_ano_kpi["periodo"], df_ano_kpi[coluna], titulo) for coluna, titulo in SPARKLINES_ANUAIS.items()}
+            series[coluna_preco] = (df_kpi["periodo"], df_kpi[coluna_preco], preco_selecionado)
+            return sparklines_svg(series)
 
-            # Indicador de producao
-            esp, kpi, esp = st.columns([0.15,1,0.15])
-            with kpi:
-                dado_atual_prod = df_ultimo_ano["producao"].iloc[-1]
-                dado_anterior_prod = df_penultimo_ano["producao"].iloc[-1]
-                variacao_prod = ((dado_atual_prod - dado_anterior_prod) / dado_anterior_prod) * 100
+        sparklines = figura_cacheada("kpis", ("sparklines", anos_selecionados, coluna_preco), construir)
 
-                st.metric(
-                    label = f"**Produção {df_ano_kpi["periodo"].max()} (1000 t)**",
-                    value = f"{dado_atual_prod/1000:.1f}k",
-                    delta = f"{variacao_prod:.2f}% YoY",
-                    border = True
-                )
 
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "producao", "Produção"), use_container_width=True, config={'displayModeBar': False})
+        # Criando layout de 3 colunas oferta, demanda, chave
+            # oferta - kpi2, kpi3, kpi4
+            # demanda - kpi5, kpi6, 
+            # chave - kpi 1, kpi7, kpi8
+        chave, oferta, demanda = st.columns(3)
 
-            # Indicador de importacao
-            esp, kpi, esp = st.columns([0.15,1,0.15])
-            with kpi:
-                dado_atual_imp = df_ultimo_ano["importacao"].iloc[-1]
-                dado_anterior_imp = df_penultimo_ano["importacao"].iloc[-1]
-                variacao_imp = ((dado_atual_imp - dado_anterior_imp) / dado_anterior_imp) * 100
+        # KPIs chave
+        with chave:
+            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-                st.metric(
-                    label = f"**Importação {df_ano_kpi["periodo"].max()} (1000 t)**",
-                    value = f"{dado_atual_imp}",
-                    delta = f"{variacao_imp:.2f}% YoY",
+            with st.container(border=True): # cria container
+                st.markdown("<h4 style='text-align: center;'>Indicadores Chaves</h4>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+
+                # Indicador de saldo oferta - demanda           
+                esp, kpi, esp = st.columns([0.15,1,0.15])
+                with kpi:
+                    dado_atual_saldo = kpis_ano["saldo"]
+                    variacao_saldo = kpis_ano["saldo_yoy"]
+
+                    st.metric(
+                    label = f"**Saldo Oferta/Demanda {df_ano_kpi["periodo"].max()} (1000 t)**",
+                    value = f"{dado_atual_saldo/1000:.1f}k",
+                    delta = delta_yoy(variacao_saldo),
                     border = True
-                )
-
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "importacao", "Importação"), use_container_width=True, config={'displayModeBar': False})
-
-    # KPIs de demanda e insight
-    with demanda:
-        #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-
-        with st.container(border=True): # cria container
-            st.markdown("<h4 style='text-align: center;'>Indicadores de Demanda</h4>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+                    )
 
-            # Indicador de exportacao
+                st.markdown(sparklines["saldo"], unsafe_allow_html=True)
 
-            esp, kpi, esp = st.columns([0.15,1,0.15])
+                # Indicador do dolar
+                esp, kpi, esp = st.columns([0.15,1,0.15])
+                with kpi:
+                    dado_atual_dolar = kpis_ano["usdbrl"]
+                    variacao_dolar = kpis_ano["usdbrl_yoy"]
 
-            with kpi:
-                dado_atual_exp = df_ultimo_ano["exportacao"].iloc[-1]
-                dado_anterior_exp = df_penultimo_ano["exportacao"].iloc[-1]
-                variacao_exp = ((dado_atual_exp - dado_anterior_exp) / dado_anterior_exp) * 100
+                    st.metric(
+                        label = f"**Cambîo  USD/BRL {df_ano_kpi["periodo"].max()}**",
+                        value = f"{dado_atual_dolar:.6g}",
+                        delta = delta_yoy(variacao_dolar),
+                        border = True
+                    )
 
-                st.metric(
-                    label = f"**Exportação {df_ano_kpi["periodo"].max()} (1000 t)**",
-                    value = f"{dado_atual_exp/1000:.1f}k",
-                    delta = f"{variacao_exp:.2f}% YoY",
-                    border = True
-                )
+                st.markdown(sparklines["usdbrl"], unsafe_allow_html=True)
 
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "exportacao", "Exportação"), use_container_width=True, config={'displayModeBar': False})
+                # Indicador de preco
+                esp, kpi, esp = st.columns([0.15,1,0.15])
+                with kpi:
+                    dado_atual_preco = kpis_ano[coluna_preco]
+                    variacao_preco = kpis_ano[f"{coluna_preco}_yoy"]
 
-            # indicador de processamento
-            esp, kpi, esp = st.columns([0.15,1,0.15])
+                    st.metric(
+                label = f"**{int(kpis_ano["ano_preco"])} {preco_selecionado}**",
+                        value = f"{dado_atual_preco:.2f}",
+                        delta = delta_yoy(variacao_preco),
+                        border = True
+                    )
 
-            with kpi:
-                dado_atual_proc = df_ultimo_ano["processamento"].iloc[-1]
-                dado_anterior_proc = df_penultimo_ano["processamento"].iloc[-1]
-                variacao_proc = ((dado_atual_proc - dado_anterior_proc) / dado_anterior_proc) * 100
+                st.markdown(sparklines[coluna_preco], unsafe_allow_html=True)
 
-                st.metric(
-                    label = f"**Processamento {df_ano_kpi["periodo"].max()} (1000 t)**",
-                    value = f"{dado_atual_proc/1000:.1f}k",
-                    delta = f"{variacao_proc:.2f}% YoY",
-                    border = True
-                )
+        # KPIs de oferta
+        with oferta:
+            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-            st.plotly_chart(plot_sparkline(df_ano_kpi, "processamento", "Processamento"), use_container_width=True, config={'displayModeBar': False})
+            with st.container(border=True): # cria container
+                st.markdown("<h4 style='text-align: center;'>Indicadores de Oferta</h4>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+
+                # Indicador de estoque inicial
+                esp, kpi, esp = st.columns([0.15,1,0.15])
+                with kpi:
+                    dado_atual_estoque = kpis_ano["estoque_inicial"]
+                    variacao_estoque = kpis_ano["estoque_inicial_yoy"]
+
+                    st.metric(
+                        label = f"**Estoque Inicial {df_ano_kpi["periodo"].max()} (1000 t)**",
+                        value = f"{dado_atual_estoque:.6g}",
+                        delta = delta_yoy(variacao_estoque),
+                        border = True
+                    )
 
-            # adicionando insight sobre os KPIs
-            st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+                st.markdown(sparklines["estoque_inicial"], unsafe_allow_html=True)
 
-            st.markdown("""
-            <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 30px; margin-top: 10px; text-align: center;'>
-                <p style='font-size: 14px;'>
-                        Os indicadores são essenciais para entender a dinâmica do mercado da soja. Aqui, destacamos historicamente os principais fatores que afetam a oferta e a demanda, além do impacto do câmbio na precificação da commodity.<br>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+                # Indicador de producao
+                esp, kpi, esp = st.columns([0.15,1,0.15])
+                with kpi:
+                    dado_atual_prod = kpis_ano["producao"]
+                    variacao_prod = kpis_ano["producao_yoy"]
 
-            st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+                    st.metric(
+                        label = f"**Produção {df_ano_kpi["periodo"].max()} (1000 t)**",
+                        value = f"{dado_atual_prod/1000:.1f}k",
+                        delta = delta_yoy(variacao_prod),
+                        border = True
+                    )
 
+                st.markdown(sparklines["producao"], unsafe_allow_html=True)
 
+                # Indicador de importacao
+                esp, kpi, esp = st.columns([0.15,1,0.15])
+                with kpi:
+                    dado_atual_imp = kpis_ano["importacao"]
+                    variacao_imp = kpis_ano["importacao_yoy"]
 
+                    st.metric(
+                        label = f"**Importação {df_ano_kpi["periodo"].max()} (1000 t)**",
+                        value = f"{dado_atual_imp:.6g}",
+                        delta = delta_yoy(variacao_imp),
+                        border = True
+                    )
 
-# --------------------------------------------------- seção 02 - macroeconomico -------------------------------------------------------------
+                st.markdown(sparklines["importacao"], unsafe_allow_html=True)
 
-with st.container(border=True):
+        # KPIs de demanda e insight
+        with demanda:
+            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-    # container titulo cambio
-    with st.container(border=True):
-        titulo, espm, periodo, espm, tipo_preco = st.columns([1.5, 0.1, 1, 0.1, 1.5])
-
-        with titulo:
-            st.markdown("<h4 style='text-align: center; margin-top: 18px;'>🌍 Impacto do Câmbio</h4>", unsafe_allow_html=True)
-
-        with periodo:
-            anos_selecionados_2 = st.slider(
-                "Selecione o Período:",
-                min_value=int(df_ano["periodo"].min()),
-                max_value=int(df_ano["periodo"].max()),
-                value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
-                key="slider_2"
-            )
+            with st.container(border=True): # cria container
+                st.markdown("<h4 style='text-align: center;'>Indicadores de Demanda</h4>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-        with tipo_preco:
-            preco_selecionado_2 = st.selectbox(
-                "Selecione o Preço:",
-                ["Chicago - CBOT (US$/t)", "FOB Porto - Paranaguá (US$/t)", 
-                "Maringá / PR - R$/saca (sem ICMS)", "Mogiana / SP - R$/saca (sem ICMS)", 
-                "Passo Fundo / RS - R$/saca (sem ICMS)", "Rondonopolis / MT - R$/saca (sem ICMS)"],
-                index=5,
-                key="select_2"
-            )
+                # Indicador de exportacao
 
-    # filtro e tratamento de dados
-    df_usdbrl = df[(df["ano"] >= anos_selecionados_2[0]) & (df["ano"] <= anos_selecionados_2[1])]
-    df_usdbrl["periodo"] = pd.to_datetime(df_usdbrl["ano_mes"])
+                esp, kpi, esp = st.columns([0.15,1,0.15])
 
-    # container do insight sobre o cambio
-    with st.container(border=False):
-        esp, texto, exp = st.columns([0.3,1,0.3])
+                with kpi:
+                    dado_atual_exp = kpis_ano["exportacao"]
+                    variacao_exp = kpis_ano["exportacao_yoy"]
 
-        with texto:
-            with st.container(border=True):
-                st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 40px; margin-top: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        A variação do dólar ao longo do tempo está fortemente influenciada por eventos políticos e econômicos. No gráfico a seguir, destacamos momentos de grande oscilação cambial e seu impacto no mercado da soja.<br>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                    st.metric(
+                        label = f"**Exportação {df_ano_kpi["periodo"].max()} (1000 t)**",
+                        value = f"{dado_atual_exp/1000:.1f}k",
+                        delta = delta_yoy(variacao_exp),
+                        border = True
+                    )
 
-    # Criando o gráfico do câmbio do cambio usd/brl
-    with st.container(border=True):
-        fig_cambio = go.Figure()
-
-        # Adicionando linha do câmbio ao longo do tempo
-        fig_cambio.add_trace(go.Scatter(
-            x=df_usdbrl["periodo"],
-            y=df_usdbrl["usdbrl"],
-            mode='lines',
-            name='Câmbio USD/BRL',
-            line=dict(color='#FF8800', width=3)
-        ))
-
-        # Identificando e destacando a variação anual
-
-        df_ultimo_dia_do_ano = df_usdbrl.groupby("ano").last().reset_index()
-        df_ultimo_dia_do_ano["var_anual"] = df_ultimo_dia_do_ano["usdbrl"].pct_change()*100
-        df_ultimo_dia_do_ano = df_ultimo_dia_do_ano.fillna(0)
-
-        for i in range(1, len(df_ultimo_dia_do_ano)):
-            ano = df_ultimo_dia_do_ano["ano"].iloc[i]
-            periodo = df_ultimo_dia_do_ano["periodo"].iloc[i]
-            valor = df_ultimo_dia_do_ano["usdbrl"].iloc[i]
-            variacao_anual = df_ultimo_dia_do_ano["var_anual"].iloc[i]
-        
-            fig_cambio.add_annotation(
-                x=periodo,
-                y=valor,
-                text=f"{variacao_anual:.1f}%<br>YoY",
-                showarrow=True,
-                arrowhead=4,
-                ax = -15,  # Define a posição final da seta no eixo X (ajuste conforme necessário)
-                ay = -60,  # Aumenta o comprimento da seta
-                font=dict(color="green" if variacao_anual > 0 else "red", size=12),
-                bgcolor="rgba(255,255,255,0.7)"
-            )
+                st.markdown(sparklines["exportacao"], unsafe_allow_html=True)
 
-        # adicionando eventos no grafico
-
-        eventos = [
-            {"data": "2002-10-28", "texto": "Lula eleito"},
-            {"data": "2008-07-27", "texto": "Crise Financeira"},
-            {"data": "2014-08-10", "texto": "Recessão Brasil"},
-            {"data": "2016-01-10", "texto": "Impeachment Dilma"},
-            {"data": "2018-10-28", "texto": "Bolsonaro eleito"},
-            {"data": "2020-02-02", "texto": "COVID-19"},
-            {"data": "2022-10-02", "texto": "Lula eleito"}
-        ]
-
-        df_eventos = pd.DataFrame(eventos)
-        df_eventos["data"] = pd.to_datetime(df_eventos["data"])
-
-        for i, row in df_eventos.iterrows():
-            fig_cambio.add_vline(
-                x = row["data"],
-                line_width=2,
-                line_dash="dash",
-                line_color="blue"
-                #annotation_position="top",
-                #annotation_font_size=12
-            )
+                # indicador de processamento
+                esp, kpi, esp = st.columns([0.15,1,0.15])
 
-                # Definir a posição da anotação (topo para os 3 primeiros, base para os demais)
-            if i < 3:
-                y_pos = df_usdbrl["usdbrl"].max()+1.5  # Anotações superiores
-                ay = -60  # Direção da seta para cima
-            else:
-                y_pos = df_usdbrl["usdbrl"].min()  # Anotações inferiores
-                ay = 60  # Direção da seta para baixo
-
-            # Transformar espaços em quebras de linha usando "<br>"
-            texto_formatado = row["texto"].replace(" ", "<br>")
-
-            fig_cambio.add_annotation(
-                x=row["data"],
-                y=y_pos,  # Posiciona no topo do gráfico
-                text=texto_formatado,
-                showarrow = False,
-                font=dict(size=12, color="blue"),
-                bgcolor="rgba(255,255,255,0.7)",
-                align="center"
-            )
+                with kpi:
+                    dado_atual_proc = kpis_ano["processamento"]
+                    variacao_proc = kpis_ano["processamento_yoy"]
 
-        fig_cambio.update_layout(
-            yaxis_title="USD/BRL",
-            xaxis_title="Periodo",
-            height=400,
-            margin=dict(l=10, r=10, t=25, b=10),
-            xaxis=dict(
-                showline=True,  
-                linecolor="gray",  
-                linewidth=1, 
-                tickmode="linear",
-                dtick="M12",
-                tickformat="%Y",
-                tickangle = 45,
-                showgrid = True,
-                gridwidth = 0.5
-                ),
-            yaxis=dict(
-                showline=True,  # Linha no zero do eixo Y
-                linecolor="gray",
-                linewidth=1,
-                showgrid = True,
-                gridwidth = 0.1
-                )
-        )   
+                    st.metric(
+                        label = f"**Processamento {df_ano_kpi["periodo"].max()} (1000 t)**",
+                        value = f"{dado_atual_proc/1000:.1f}k",
+                        delta = delta_yoy(variacao_proc),
+                        border = True
+                    )
 
-        st.plotly_chart(fig_cambio, use_container_width=True)
+                st.markdown(sparklines["processamento"], unsafe_allow_html=True)
 
-    # container do insight cambio vs preco
-    with st.container(border=False):
-        esp, texto, exp = st.columns([0.3,1,0.3])
+                # adicionando insight sobre os KPIs
+                st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-        with texto:
-            with st.container(border=True):
                 st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 40px; margin-top: 20px; text-align: center;'>
+                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 30px; margin-top: 10px; text-align: center;'>
                     <p style='font-size: 14px;'>
-                        O câmbio é um dos principais fatores que determinam o preço da soja no Brasil. Como mostram os gráficos abaixo, há uma forte correlação positiva entre a valorização do dólar e o aumento do preço da soja no mercado interno.<br>
+                            Os indicadores são essenciais para entender a dinâmica do mercado da soja. Aqui, destacamos historicamente os principais fatores que afetam a oferta e a demanda, além do impacto do câmbio na precificação da commodity.<br>
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
 
-    col1, col2 = st.columns(2)
-
-    # grafico cambio e preco
-    with col1:
-        with st.container(border=True): # cria container
-            st.markdown("<h5 style='text-align: center;'> 🔄 Comparação: Câmbio vs. Preço da Soja</h5>", unsafe_allow_html=True)
-    
-            fig_comp = go.Figure()
-            fig_comp.add_trace(go.Scatter(
-                x=df_usdbrl["periodo"],
-                y=df_usdbrl["usdbrl"],
-                mode='lines',
-                name='Câmbio USD/BRL',
-                yaxis='y1',
-                line=dict(color='#FF8800', width=2)
-            ))
-
-            tabela_preco_2 = {
-                "Chicago - CBOT (US$/t)": "chicago_cbot_u$/t",
-                "FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t",
-                "Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca",
-                "Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca",
-                "Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca",
-                "Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca",
-            }
-
-            coluna_preco_2 = tabela_preco_2[preco_selecionado_2]
-
-
-            fig_comp.add_trace(go.Scatter(
-                x=df_usdbrl["periodo"],
-                y=df_usdbrl[coluna_preco_2],
-                mode='lines',
-                name='Preço da Soja',
-                yaxis='y2',
-                line=dict(color='#ADFF2F', width=2)
-            ))
-
-            fig_comp.update_layout(
-                yaxis=dict(
-                    title="USD/BRL", 
-                    side="left",
-                    showline=True,
-                    linecolor="gray",
-                    linewidth=1
-                    ),
-                yaxis2=dict(
-                    title=preco_selecionado, 
-                    overlaying="y", 
-                    side="right",
-                    showline=True,
-                    linecolor="gray",
-                    linewidth=1
-                    ),
-                xaxis=dict(
-                    title="Periodo",
-                    showline=True,
-                    linecolor="gray",
-                    linewidth=1,
-                    tickmode="linear",
-                    dtick="M24",
-                    tickangle=45
-                    ),
-                height=400,
-                legend=dict(
-                    orientation="h",  # Deixa a legenda horizontal
-                    yanchor="top",
-                    y=-0.3, # Posiciona a legenda abaixo do gráfico
-                    xanchor="center",  # Centraliza a legenda
-                    x=0.5
-                ),
-                margin=dict(l=10, r=10, t=20, b=10)
-            )
+                st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-            st.plotly_chart(fig_comp, use_container_width=True)
-
-    # grafico correlacao cambio e preco
-    with col2:
-        with st.container(border=True): # cria container
-            st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Câmbio e Preço da Soja</h5>", unsafe_allow_html=True)
-
-            fig_scatter1 = px.scatter(
-                df_usdbrl, 
-                x=coluna_preco_2, 
-                y="usdbrl", 
-                color="ano",
-                color_continuous_scale="RdYlGn",
-                trendline="ols",  # Adiciona a linha de tendência automaticamente
-                trendline_color_override="blue",
-                labels={coluna_preco_2: f"Preço da Soja ({preco_selecionado_2})", "usdbrl": "Câmbio (USD/BRL)"},
-                color_discrete_sequence=["#ADFF2F"],
-                opacity=1
-            )
 
-            fig_scatter1.update_layout(
-                xaxis=dict(
-                    title = f"Preço da Soja ({preco_selecionado_2})",
-                    showline=True,
-                    linecolor="gray",
-                    linewidth=1
-                    ),
-                yaxis=dict(
-                    title = "Câmbio (USD/BRL)",
-                    showline=True,
-                    linecolor="gray",
-                    linewidth=1
-                    ),            
-                height=400,
-                margin=dict(l=10, r=10, t=20, b=10)
-            )
+secao_kpis()
 
-            st.plotly_chart(fig_scatter1, use_container_width=True)
 
 
-    # correlacao e insights do cambio
-    col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
-
-    # correlacao cambio e preco
-    with col1:
-        with st.container(border=False): # cria container
-            #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-    
-            # Calcular correlação
-            correlacao_cambio = df_usdbrl["usdbrl"].corr(df_usdbrl[coluna_preco_2])
-
-            # Exibir resultado formatado
-            st.metric(
-            label="Correlação de Pearson (USD/BRL vs. Preço Soja)",
-            value=f"{correlacao_cambio:.4f}",
-            delta="Positiva" if correlacao_cambio > 0 else "Negativa",
-            border = True
-            )
-
-    # insights cambio e preco
-    with col2:
-        with st.container(border=True): # cria container
-
-            st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        ✔  A correlação estatística confirma O câmbio ser um dos principais fatores que influenciam o preço da soja no Brasil, indicando que variações cambiais têm impacto mensurável sobre a formação de preços no mercado brasileiro.<br>
-                        ✔  Eventos macroeconômicos globais amplificam essa relação, tornando o acompanhamento do câmbio essencial para a análise e previsão dos preços da soja.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-
 
+# --------------------------------------------------- seção 02 - macroeconomico -------------------------------------------------------------
 
-# --------------------------------------------------------- seção 03 - Oferta ---------------------------------------------------------------
+@st.fragment
+@metricas().medir("cambio", depois=exportar_metricas)
+def secao_cambio():
+    """Seção 02: impacto do câmbio."""
 
-with st.container(border=True):
-    
-    # container titulo cambio
     with st.container(border=True):
-        titulo, espm, periodo, espm, tipo_preco = st.columns([2, 0.1, 1, 0.1, 1.5])
-
-        with titulo:
-            st.markdown("<h4 style='text-align: center; margin-top: 18px;'> 🧐 Oferta: Produção, Importação e Estoques</h4>", unsafe_allow_html=True)
-
-        with periodo:
-            anos_selecionados_3 = st.slider(
-                "Selecione o Período:",
-                min_value=int(df_ano["periodo"].min()),
-                max_value=int(df_ano["periodo"].max()),
-                value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
-                key="slider_3"
-            )
 
-        with tipo_preco:
-            preco_selecionado_3 = st.selectbox(
-                "Selecione o Preço:",
-                ["Chicago - CBOT (US$/t)", "FOB Porto - Paranaguá (US$/t)", 
-                "Maringá / PR - R$/saca (sem ICMS)", "Mogiana / SP - R$/saca (sem ICMS)", 
-                "Passo Fundo / RS - R$/saca (sem ICMS)", "Rondonopolis / MT - R$/saca (sem ICMS)"],
-                index=5,
-                key="select_3"
-        )
-
-    # filtro e tratamento de dados
-    df_oferta = df[(df["ano"] >= anos_selecionados_3[0]) & (df["ano"] <= anos_selecionados_3[1])]
-    df_oferta["periodo"] = pd.to_datetime(df_oferta["ano_mes"])
-    
-    df_oferta_anual = df_ano[(df_ano["periodo"] >= anos_selecionados_3[0]) & (df_ano["periodo"] <= anos_selecionados_3[1])]
-
-    # container estoques     
-    with st.container(border=False):
-        col1 , col2 = st.columns(2)
+        # container titulo cambio
+        with st.container(border=True):
+            titulo, espm, periodo, espm, tipo_preco = st.columns([1.5, 0.1, 1, 0.1, 1.5])
 
-        with col1:
-            with st.container(border=True):
-                st.markdown("<h5 style='text-align: center;'> 📈 Evolução dos Estoques</h5>", unsafe_allow_html=True)
-                
-                # Calcular a média móvel (ajustável)
-                window_size = 12  # Tamanho da janela da média móvel (ajuste conforme necessário)
-                df_oferta["tendencia_estoque"] = df_oferta["estoque"].rolling(window=window_size, min_periods=1).mean()
-
-                fig_estoques = go.Figure()
-
-                fig_estoques.add_trace(go.Bar(
-                    x=df_oferta["periodo"], 
-                    y=df_oferta["estoque"],
-                    marker_color="#006400",
-                    yaxis='y1',
-                    name="Estoque Mensal"
-                ))
+            with titulo:
+                st.markdown("<h4 style='text-align: center; margin-top: 18px;'>🌍 Impacto do Câmbio</h4>", unsafe_allow_html=True)
 
+            with periodo:
+                anos_selecionados_2 = st.slider(
+                    "Selecione o Período:",
+                    min_value=int(df_ano["periodo"].min()),
+                    max_value=int(df_ano["periodo"].max()),
+                    value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
+                    key="slider_2"
+                )
 
-                # Adicionar linha de tendência curva (Média Móvel)
-                fig_estoques.add_trace(go.Scatter(
-                    x=df_oferta["periodo"], 
-                    y=df_oferta["tendencia_estoque"],
-                    mode="lines",
-                    line=dict(color="#FF8800", width=3, dash="solid"), 
-                    yaxis='y1',
-                    name="Estoque (Média Móvel 12 Meses)"
-                ))
+            with tipo_preco:
+                preco_selecionado_2 = st.selectbox(
+                    "Selecione o Preço:",
+                    list(PRECOS),
+                    index=5,
+                    key="select_2"
+                )
 
-                tabela_preco_3 = {
-                    "Chicago - CBOT (US$/t)": "chicago_cbot_u$/t",
-                    "FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t",
-                    "Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca",
-                    "Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca",
-                    "Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca",
-                    "Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca",
-                }
-
-                coluna_preco_3 = tabela_preco_3[preco_selecionado_3]
-
-                fig_estoques.add_trace(go.Scatter(
-                    x=df_oferta["periodo"],
-                    y=df_oferta[coluna_preco_3],
-                    mode='lines',
-                    name='Preço da Soja',
-                    yaxis='y2',
-                    line=dict(color='#ADFF2F', width=2)
+        # filtro e tratamento de dados
+        with metricas().span("cambio", "filtro"):
+            df_usdbrl = mensal.anos(*anos_selecionados_2)
+
+            # candles do câmbio servidos do nível pré-agregado (semana/mês/ano) adequado à faixa selecionada
+            nivel_cambio, df_cambio_ohlc = carregar_ohlc(*anos_selecionados_2)
+
+        # coluna do preço selecionado (usada pelos gráficos e correlações da seção)
+        coluna_preco_2 = PRECOS[preco_selecionado_2]
+
+        # container do insight sobre o cambio
+        with st.container(border=False):
+            esp, texto, exp = st.columns([0.3,1,0.3])
+
+            with texto:
+                with st.container(border=True):
+                    st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 40px; margin-top: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            A variação do dólar ao longo do tempo está fortemente influenciada por eventos políticos e econômicos. No gráfico a seguir, destacamos momentos de grande oscilação cambial e seu impacto no mercado da soja.<br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+        # Criando o gráfico do câmbio do cambio usd/brl
+        with st.container(border=True):
+            # cada figura é construída apenas em caso de miss no cache compartilhado entre sessões
+            def construir():
+                fig_cambio = go.Figure()
+
+                # Adicionando os candles do câmbio ao longo do tempo
+                fig_cambio.add_trace(go.Candlestick(
+                    x=df_cambio_ohlc["datetime"],
+                    open=df_cambio_ohlc["open"],
+                    high=df_cambio_ohlc["high"],
+                    low=df_cambio_ohlc["low"],
+                    close=df_cambio_ohlc["close"],
+                    name=f'Câmbio USD/BRL ({nivel_cambio})'
                 ))
 
-                fig_estoques.update_layout(
+                # variação anual e eventos aplicados em uma única atualização do layout
+                adicionar_anotacoes_cambio(fig_cambio, df_usdbrl, df_eventos)
+
+                fig_cambio.update_layout(
+                    yaxis_title="USD/BRL",
+                    xaxis_title="Periodo",
+                    height=400,
+                    margin=dict(l=10, r=10, t=25, b=10),
                     xaxis=dict(
-                        title="Período",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1,
+                        showline=True,  
+                        linecolor="gray",  
+                        linewidth=1, 
                         tickmode="linear",
-                        dtick="M24",
-                        tickangle=45,
-                        tickformat="%Y",                          
-                        ), 
-                    yaxis=dict(
-                        title="Estoque Mil Toneladas",
-                        side="left",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
+                        dtick="M12",
+                        tickformat="%Y",
+                        tickangle = 45,
+                        showgrid = True,
+                        gridwidth = 0.5,
+                        rangeslider=dict(visible=False)
                         ),
-                    yaxis2=dict(
-                        title=preco_selecionado_3, 
-                        overlaying="y", 
-                        side="right",
-                        showline=True,
+                    yaxis=dict(
+                        showline=True,  # Linha no zero do eixo Y
                         linecolor="gray",
-                        linewidth=1
+                        linewidth=1,
+                        showgrid = True,
+                        gridwidth = 0.1
+                        )
+                )   
+                return fig_cambio
+
+            fig_cambio = figura_cacheada("cambio", ("fig_cambio", anos_selecionados_2), construir)
+
+            exibir_grafico("cambio", fig_cambio)
+
+        # container do insight cambio vs preco
+        with st.container(border=False):
+            esp, texto, exp = st.columns([0.3,1,0.3])
+
+            with texto:
+                with st.container(border=True):
+                    st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 40px; margin-top: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            O câmbio é um dos principais fatores que determinam o preço da soja no Brasil. Como mostram os gráficos abaixo, há uma forte correlação positiva entre a valorização do dólar e o aumento do preço da soja no mercado interno.<br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        # grafico cambio e preco
+        with col1:
+            with st.container(border=True): # cria container
+                st.markdown("<h5 style='text-align: center;'> 🔄 Comparação: Câmbio vs. Preço da Soja</h5>", unsafe_allow_html=True)
+
+                def construir():
+                    fig_comp = go.Figure()
+                    fig_comp.add_trace(go.Scatter(
+                        x=df_usdbrl["periodo"],
+                        y=df_usdbrl["usdbrl"],
+                        mode='lines',
+                        name='Câmbio USD/BRL',
+                        yaxis='y1',
+                        line=dict(color='#FF8800', width=2)
+                    ))
+
+                    fig_comp.add_trace(go.Scatter(
+                        x=df_usdbrl["periodo"],
+                        y=df_usdbrl[coluna_preco_2],
+                        mode='lines',
+                        name='Preço da Soja',
+                        yaxis='y2',
+                        line=dict(color='#ADFF2F', width=2)
+                    ))
+
+                    fig_comp.update_layout(
+                        yaxis=dict(
+                            title="USD/BRL", 
+                            side="left",
+                            showline=True,
+                            linecolor="gray",
+                            linewidth=1
+                            ),
+                        yaxis2=dict(
+                            title=preco_selecionado_2, 
+                            overlaying="y", 
+                            side="right",
+                            showline=True,
+                            linecolor="gray",
+                            linewidth=1
+                            ),
+                        xaxis=dict(
+                            title="Periodo",
+                            showline=True,
+                            linecolor="gray",
+                            linewidth=1,
+                            tickmode="linear",
+                            dtick="M24",
+                            tickangle=45
+                            ),
+                        height=400,
+                        legend=dict(
+                            orientation="h",  # Deixa a legenda horizontal
+                            yanchor="top",
+                            y=-0.3, # Posiciona a legenda abaixo do gráfico
+                            xanchor="center",  # Centraliza a legenda
+                            x=0.5
                         ),
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=0),
-                    legend=dict(
-                        orientation="h",  # Torna a legenda horizontal
-                        yanchor="top",    # Alinha no topo da posição definida
-                        y=-0.5,           # Move a legenda para a parte inferior do gráfico
-                        xanchor="center",  # Centraliza a legenda
-                        x=0.5
+                        margin=dict(l=10, r=10, t=20, b=10)
                     )
-                    )
-        
-                st.plotly_chart(fig_estoques, use_container_width=True)
-        
-        with col2:
+                    return fig_comp
 
-            with st.container(border=True): # cria container
-                st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Média Movel dos estoques e Preço da Soja</h5>", unsafe_allow_html=True)
-
-                fig_scatter2 = px.scatter(
-                    df_oferta, 
-                    x=coluna_preco_2, 
-                    y="tendencia_estoque", 
-                    color="ano",
-                    color_continuous_scale="RdYlGn",
-                    trendline="ols",  # Adiciona a linha de tendência automaticamente
-                    trendline_color_override="blue",
-                    labels={coluna_preco_2: f"Preço da Soja ({preco_selecionado_2})", "estoque": "Estoque Mil Toneladas"},
-                    color_discrete_sequence=["#ADFF2F"],
-                    opacity=1
-                )
+                fig_comp = figura_cacheada("cambio", ("fig_comp", anos_selecionados_2, preco_selecionado_2), construir)
 
-                fig_scatter2.update_layout(
-                    xaxis=dict(
-                        title = f"Preço da Soja ({preco_selecionado_2})",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis=dict(
-                        title = "Estoque (Mil Toneladas)",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),            
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10)
-                )
+                exibir_grafico("cambio", fig_comp)
 
-                st.plotly_chart(fig_scatter2, use_container_width=True)
+        # grafico correlacao cambio e preco
+        with col2:
+            with st.container(border=True): # cria container
+                st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Câmbio e Preço da Soja</h5>", unsafe_allow_html=True)
+
+                def construir():
+                    fig_scatter1 = dispersao(
+                        df_usdbrl, 
+                        x=coluna_preco_2, 
+                        y="usdbrl", 
+                        color="ano",
+                        color_continuous_scale="RdYlGn",
+                        labels={coluna_preco_2: f"Preço da Soja ({preco_selecionado_2})", "usdbrl": "Câmbio (USD/BRL)"},
+                        opacity=1
+                    )
 
-    # correlacao e insights do estoque
-    col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+                    fig_scatter1.update_layout(
+                        xaxis=dict(
+                            title = f"Preço da Soja ({preco_selecionado_2})",
+                            showline=True,
+                            linecolor="gray",
+                            linewidth=1
+                            ),
+                        yaxis=dict(
+                            title = "Câmbio (USD/BRL)",
+                            showline=True,
+                            linecolor="gray",
+                            linewidth=1
+                            ),            
+                        height=400,
+                        margin=dict(l=10, r=10, t=20, b=10)
+                    )
 
-    # correlacao estoques e preco
-    with col1:
-        with st.container(border=False): # cria container
-            #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-    
-            # Calcular correlação
-            correlacao_estoque = df_oferta["tendencia_estoque"].corr(df_oferta[coluna_preco_2])
-
-            # Exibir resultado formatado
-            st.metric(
-            label="Correlação de Pearson (Média Estoque vs. Preço Soja)",
-            value=f"{correlacao_estoque:.4f}",
-            delta="Positiva" if correlacao_estoque > 0 else "Negativa",
-            border = True
-            )
+                    # linha de tendência OLS a partir das somas acumuladas (sem statsmodels)
+                    adicionar_tendencia(fig_scatter1, correlacoes, df_usdbrl, coluna_preco_2, "usdbrl", anos_selecionados_2)
+                    return fig_scatter1
 
-    # insights estoque e preco
-    with col2:
-        with st.container(border=True): # cria container
-            st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        Os estoques de soja funcionam como um amortecedor de preços ao longo do tempo. Quando os estoques médios dos últimos 12 meses estão baixos, a menor oferta pode pressionar os preços para cima. No entanto, mesmo com estoques altos, os preços podem se manter firmes se a demanda interna e externa crescer na mesma proporção. Além disso, se o dólar sobe, a soja brasileira se torna mais competitiva para exportação, reduzindo estoques e sustentando os preços.<br>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                fig_scatter1 = figura_cacheada("cambio", ("fig_scatter1", anos_selecionados_2, preco_selecionado_2), construir)
+
+                exibir_grafico("cambio", fig_scatter1)
 
 
-    # container producao   
-    with st.container(border=False):
-        col1 , col2 = st.columns(2)
+        # correlacao e insights do cambio
+        col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
 
+        # correlacao cambio e preco
         with col1:
-            with st.container(border=True):
-                st.markdown("<h5 style='text-align: center;'> 📈 Evolução da Produção</h5>", unsafe_allow_html=True)
-                
-                # Calcular a somatorio ultimos 12 meses (ajustável)
-                window_size = 12  # Tamanho da janela da soma móvel (12 meses)
-                df_oferta["producao_12_meses"] = df_oferta["producao"].rolling(window=window_size, min_periods=1).sum()
-
-                fig_producao = go.Figure()
-
-                fig_producao.add_trace(go.Bar(
-                    x=df_oferta["periodo"], 
-                    y=df_oferta["producao"],
-                    marker_color="#006400", 
-                    name="Producao Mensal"
-                ))
+            with st.container(border=False): # cria container
+                #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
+                # Calcular correlação (somas acumuladas pré-calculadas)
+                with metricas().span("cambio", "agregacao"):
+                    correlacao_cambio = correlacao(correlacoes, "usdbrl", coluna_preco_2, *anos_selecionados_2)
 
-                # Adicionar linha de tendência curva
-                fig_producao.add_trace(go.Scatter(
-                    x=df_oferta["periodo"], 
-                    y=df_oferta["producao_12_meses"],
-                    mode="lines",
-                    line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
-                    name="Produção somatório 12 Meses"
-                ))
-
-                fig_producao.add_trace(go.Scatter(
-                    x=df_oferta["periodo"],
-                    y=df_oferta[coluna_preco_3],
-                    mode='lines',
-                    name='Preço da Soja',
-                    yaxis='y2',
-                    line=dict(color='#ADFF2F', width=2)
-                ))
+                # Exibir resultado formatado
+                st.metric(
+                label="Correlação de Pearson (USD/BRL vs. Preço Soja)",
+                value="n/d" if pd.isna(correlacao_cambio) else f"{correlacao_cambio:.4f}",
+                delta=sentido_correlacao(correlacao_cambio),
+                border = True
+                )
 
-                fig_producao.update_layout(
-                    xaxis=dict(
-                        title="Período",
-                        side="left",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1,
-                        tickmode="linear",
-                        dtick="M24",
-                        tickangle=45,
-                        tickformat="%Y",                          
-                        ), 
-                    yaxis=dict(
-                        title="Produção Mil Toneladas",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis2=dict(
-                        title=preco_selecionado_3, 
-                        overlaying="y", 
-                        side="right",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10),
-                    legend=dict(
-                        orientation="h",  # Torna a legenda horizontal
-                        yanchor="top",    # Alinha no topo da posição definida
-                        y=-0.5,           # Move a legenda para a parte inferior do gráfico
-                        xanchor="center",  # Centraliza a legenda
-                        x=0.5
-                    )
-                    )
-        
-                st.plotly_chart(fig_producao, use_container_width=True)
-        
-        # correlacao producao e preco
+        # insights cambio e preco
         with col2:
-
             with st.container(border=True): # cria container
-                st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Produção 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
-
-                fig_scatter3 = px.scatter(
-                    df_oferta, 
-                    x=coluna_preco_3, 
-                    y="producao_12_meses", 
-                    color="ano",
-                    color_continuous_scale="RdYlGn",
-                    trendline="ols",  # Adiciona a linha de tendência automaticamente
-                    trendline_color_override="blue",
-                    labels={coluna_preco_3: f"Preço da Soja ({preco_selecionado_3})", "producao": "Produção Mil Toneladas"},
-                    color_discrete_sequence=["#ADFF2F"],
-                    opacity=1
-                )
 
-                fig_scatter3.update_layout(
-                    xaxis=dict(
-                        title = f"Preço da Soja ({preco_selecionado_3})",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis=dict(
-                        title = "Produção (Mil Toneladas)",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),            
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10)
-                )
+                st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            ✔  A correlação estatística confirma O câmbio ser um dos principais fatores que influenciam o preço da soja no Brasil, indicando que variações cambiais têm impacto mensurável sobre a formação de preços no mercado brasileiro.<br>
+                            ✔  Eventos macroeconômicos globais amplificam essa relação, tornando o acompanhamento do câmbio essencial para a análise e previsão dos preços da soja.
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
 
-                st.plotly_chart(fig_scatter3, use_container_width=True)
 
+secao_cambio()
+        
 
 
-    # correlacao e insights da producao
-    col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
 
-    # correlacao producao e preco
-    with col1:
-        with st.container(border=False): # cria container
-            #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-    
-            # Calcular correlação
-            correlacao_producao = df_oferta["producao_12_meses"].corr(df_oferta[coluna_preco_3])
-
-            # Exibir resultado formatado
-            st.metric(
-            label="Correlação de Pearson (Produção 12 M vs. Preço Soja)",
-            value=f"{correlacao_producao:.4f}",
-            delta="Positiva" if correlacao_producao > 0 else "Negativa",
-            border = True
-            )
+# --------------------------------------------------------- seção 03 - Oferta ---------------------------------------------------------------
 
-    # insights producao e preco
-    with col2:
-        with st.container(border=True): # cria container
-            st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        A forte correlação positiva sugere que o crescimento da produção tem sido acompanhado por preços mais altos. As explicações: Aumento da demanda global, impulsionado pela China e outros grandes importadores. Expansão da capacidade de exportação brasileira, não gerando excesso de oferta interna. Câmbio favorável (USD/BRL alto), tornando a soja brasileira mais competitiva e sustentando os preços mesmo com produção crescente.<br>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+@st.fragment
+@metricas().medir("oferta", depois=exportar_metricas)
+def secao_oferta():
+    """Seção 03: oferta (estoques, produção e importação)."""
 
+    with st.container(border=True):
 
-    # container importacao  
-    with st.container(border=False):
-        col1 , col2 = st.columns(2)
+        # container titulo cambio
+        with st.container(border=True):
+            titulo, espm, periodo, espm, tipo_preco = st.columns([2, 0.1, 1, 0.1, 1.5])
 
-        with col1:
-            with st.container(border=True):
-                st.markdown("<h5 style='text-align: center;'> 📈 Evolução da Importação</h5>", unsafe_allow_html=True)
-                
-                # Calcular a somatorio ultimos 12 meses (ajustável)
-                window_size = 12  # Tamanho da janela da soma móvel (12 meses)
-                df_oferta["importacao_12_meses"] = df_oferta["importacao"].rolling(window=window_size, min_periods=1).sum()
-
-                fig_importacao = go.Figure()
-
-                fig_importacao.add_trace(go.Bar(
-                    x=df_oferta["periodo"], 
-                    y=df_oferta["importacao"],
-                    marker_color="#006400", 
-                    name="Importação Mensal"
-                ))
+            with titulo:
+                st.markdown("<h4 style='text-align: center; margin-top: 18px;'> 🧐 Oferta: Produção, Importação e Estoques</h4>", unsafe_allow_html=True)
 
+            with periodo:
+                anos_selecionados_3 = st.slider(
+                    "Selecione o Período:",
+                    min_value=int(df_ano["periodo"].min()),
+                    max_value=int(df_ano["periodo"].max()),
+                    value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
+                    key="slider_3"
+                )
 
-                # Adicionar linha de tendência curva
-                fig_importacao.add_trace(go.Scatter(
-                    x=df_oferta["periodo"], 
-                    y=df_oferta["importacao_12_meses"],
-                    mode="lines",
-                    line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
-                    name="Importação 12 Meses"
-                ))
+            with tipo_preco:
+                preco_selecionado_3 = st.selectbox(
+                    "Selecione o Preço:",
+                    list(PRECOS),
+                    index=5,
+                    key="select_3"
+            )
 
-                fig_importacao.add_trace(go.Scatter(
-                    x=df_oferta["periodo"],
-                    y=df_oferta[coluna_preco_3],
-                    mode='lines',
-                    name='Preço da Soja',
-                    yaxis='y2',
-                    line=dict(color='#ADFF2F', width=2)
-                ))
+        # filtro e tratamento de dados
+        with metricas().span("oferta", "filtro"):
+            df_oferta = mensal.anos(*anos_selecionados_3)
+
+        # coluna do preço selecionado (usada pelos gráficos e correlações da seção)
+        coluna_preco_3 = PRECOS[preco_selecionado_3]
+
+        # dados da seção para download (a própria fatia filtrada, convertida só no clique)
+        with st.popover("⬇️ Baixar dados da oferta"):
+            botoes_download(df_oferta, f"oferta_{anos_selecionados_3[0]}_{anos_selecionados_3[1]}", "oferta", anos_selecionados_3)
+
+        # container estoques     
+        with st.container(border=False):
+            col1 , col2 = st.columns(2)
+
+            with col1:
+                with st.container(border=True):
+                    st.markdown("<h5 style='text-align: center;'> 📈 Evolução dos Estoques</h5>", unsafe_allow_html=True)
+
+                    # média móvel de 12 meses já calculada sobre todo o histórico (utils/janelas.py)
+
+                    def construir():
+                        fig_estoques = go.Figure()
+
+                        fig_estoques.add_trace(go.Bar(
+                            x=df_oferta["periodo"], 
+                            y=df_oferta["estoque"],
+                            marker_color="#006400",
+                            yaxis='y1',
+                            name="Estoque Mensal"
+                        ))
+
+
+                        # Adicionar linha de tendência curva (Média Móvel)
+                        fig_estoques.add_trace(go.Scatter(
+                            x=df_oferta["periodo"], 
+                            y=df_oferta["tendencia_estoque"],
+                            mode="lines",
+                            line=dict(color="#FF8800", width=3, dash="solid"), 
+                            yaxis='y1',
+                            name="Estoque (Média Móvel 12 Meses)"
+                        ))
+
+                        fig_estoques.add_trace(go.Scatter(
+                            x=df_oferta["periodo"],
+                            y=df_oferta[coluna_preco_3],
+                            mode='lines',
+                            name='Preço da Soja',
+                            yaxis='y2',
+                            line=dict(color='#ADFF2F', width=2)
+                        ))
+
+                        fig_estoques.update_layout(
+                            xaxis=dict(
+                                title="Período",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1,
+                                tickmode="linear",
+                                dtick="M24",
+                                tickangle=45,
+                                tickformat="%Y",                          
+                                ), 
+                            yaxis=dict(
+                                title="Estoque Mil Toneladas",
+                                side="left",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis2=dict(
+                                title=preco_selecionado_3, 
+                                overlaying="y", 
+                                side="right",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=0),
+                            legend=dict(
+                                orientation="h",  # Torna a legenda horizontal
+                                yanchor="top",    # Alinha no topo da posição definida
+                                y=-0.5,           # Move a legenda para a parte inferior do gráfico
+                                xanchor="center",  # Centraliza a legenda
+                                x=0.5
+                            )
+                            )
+                        return fig_estoques
+
+                    fig_estoques = figura_cacheada("oferta", ("fig_estoques", anos_selecionados_3, preco_selecionado_3), construir)
+
+                    exibir_grafico("oferta", fig_estoques)
+
+            with col2:
+
+                with st.container(border=True): # cria container
+                    st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Média Movel dos estoques e Preço da Soja</h5>", unsafe_allow_html=True)
+
+                    def construir():
+                        fig_scatter2 = dispersao(
+                            df_oferta, 
+                            x=coluna_preco_3, 
+                            y="tendencia_estoque", 
+                            color="ano",
+                            color_continuous_scale="RdYlGn",
+                            labels={coluna_preco_3: f"Preço da Soja ({preco_selecionado_3})", "estoque": "Estoque Mil Toneladas"},
+                            opacity=1
+                        )
+
+                        fig_scatter2.update_layout(
+                            xaxis=dict(
+                                title = f"Preço da Soja ({preco_selecionado_3})",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis=dict(
+                                title = "Estoque (Mil Toneladas)",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),            
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10)
+                        )
+
+                        # linha de tendência OLS a partir das somas acumuladas (sem statsmodels)
+                        adicionar_tendencia(fig_scatter2, correlacoes, df_oferta, coluna_preco_3, "tendencia_estoque", anos_selecionados_3)
+                        return fig_scatter2
+
+                    fig_scatter2 = figura_cacheada("oferta", ("fig_scatter2", anos_selecionados_3, preco_selecionado_3), construir)
+
+                    exibir_grafico("oferta", fig_scatter2)
+
+        # correlacao e insights do estoque
+        col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+
+        # correlacao estoques e preco
+        with col1:
+            with st.container(border=False): # cria container
+                #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-                fig_importacao.update_layout(
-                    xaxis=dict(
-                        title="Período",
-                        side="left",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1,
-                        tickmode="linear",
-                        dtick="M24",
-                        tickangle=45,
-                        tickformat="%Y",                          
-                        ), 
-                    yaxis=dict(
-                        title="Importação Mil Toneladas",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis2=dict(
-                        title=preco_selecionado_3, 
-                        overlaying="y", 
-                        side="right",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10),
-                    legend=dict(
-                        orientation="h",  # Torna a legenda horizontal
-                        yanchor="top",    # Alinha no topo da posição definida
-                        y=-0.5,           # Move a legenda para a parte inferior do gráfico
-                        xanchor="center",  # Centraliza a legenda
-                        x=0.5
-                    )
-                    )
-        
-                st.plotly_chart(fig_importacao, use_container_width=True)
-        
-        # correlacao importacao e preco
-        with col2:
+                # Calcular correlação (somas acumuladas pré-calculadas)
+                with metricas().span("oferta", "agregacao"):
+                    correlacao_estoque = correlacao(correlacoes, "tendencia_estoque", coluna_preco_3, *anos_selecionados_3)
 
-            with st.container(border=True): # cria container
-                st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Importação 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
-
-                fig_scatter4 = px.scatter(
-                    df_oferta, 
-                    x=coluna_preco_3, 
-                    y="importacao_12_meses", 
-                    color="ano",
-                    color_continuous_scale="RdYlGn",
-                    trendline="ols",  # Adiciona a linha de tendência automaticamente
-                    trendline_color_override="blue",
-                    labels={coluna_preco_3: f"Preço da Soja ({preco_selecionado_3})", "importacao": "Importação Mil Toneladas"},
-                    color_discrete_sequence=["#ADFF2F"],
-                    opacity=1
+                # Exibir resultado formatado
+                st.metric(
+                label="Correlação de Pearson (Média Estoque vs. Preço Soja)",
+                value="n/d" if pd.isna(correlacao_estoque) else f"{correlacao_estoque:.4f}",
+                delta=sentido_correlacao(correlacao_estoque),
+                border = True
                 )
 
-                fig_scatter4.update_layout(
-                    xaxis=dict(
-                        title = f"Preço da Soja ({preco_selecionado_3})",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis=dict(
-                        title = "Importação (Mil Toneladas)",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),            
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10)
+        # insights estoque e preco
+        with col2:
+            with st.container(border=True): # cria container
+                st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            Os estoques de soja funcionam como um amortecedor de preços ao longo do tempo. Quando os estoques médios dos últimos 12 meses estão baixos, a menor oferta pode pressionar os preços para cima. No entanto, mesmo com estoques altos, os preços podem se manter firmes se a demanda interna e externa crescer na mesma proporção. Além disso, se o dólar sobe, a soja brasileira se torna mais competitiva para exportação, reduzindo estoques e sustentando os preços.<br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+
+        # container producao   
+        with st.container(border=False):
+            col1 , col2 = st.columns(2)
+
+            with col1:
+                with st.container(border=True):
+                    st.markdown("<h5 style='text-align: center;'> 📈 Evolução da Produção</h5>", unsafe_allow_html=True)
+
+                    # somatório dos últimos 12 meses já calculado sobre todo o histórico
+
+                    def construir():
+                        fig_producao = go.Figure()
+
+                        fig_producao.add_trace(go.Bar(
+                            x=df_oferta["periodo"], 
+                            y=df_oferta["producao"],
+                            marker_color="#006400", 
+                            name="Producao Mensal"
+                        ))
+
+
+                        # Adicionar linha de tendência curva
+                        fig_producao.add_trace(go.Scatter(
+                            x=df_oferta["periodo"], 
+                            y=df_oferta["producao_12_meses"],
+                            mode="lines",
+                            line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
+                            name="Produção somatório 12 Meses"
+                        ))
+
+                        fig_producao.add_trace(go.Scatter(
+                            x=df_oferta["periodo"],
+                            y=df_oferta[coluna_preco_3],
+                            mode='lines',
+                            name='Preço da Soja',
+                            yaxis='y2',
+                            line=dict(color='#ADFF2F', width=2)
+                        ))
+
+                        fig_producao.update_layout(
+                            xaxis=dict(
+                                title="Período",
+                                side="left",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1,
+                                tickmode="linear",
+                                dtick="M24",
+                                tickangle=45,
+                                tickformat="%Y",                          
+                                ), 
+                            yaxis=dict(
+                                title="Produção Mil Toneladas",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis2=dict(
+                                title=preco_selecionado_3, 
+                                overlaying="y", 
+                                side="right",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10),
+                            legend=dict(
+                                orientation="h",  # Torna a legenda horizontal
+                                yanchor="top",    # Alinha no topo da posição definida
+                                y=-0.5,           # Move a legenda para a parte inferior do gráfico
+                                xanchor="center",  # Centraliza a legenda
+                                x=0.5
+                            )
+                            )
+                        return fig_producao
+
+                    fig_producao = figura_cacheada("oferta", ("fig_producao", anos_selecionados_3, preco_selecionado_3), construir)
+
+                    exibir_grafico("oferta", fig_producao)
+
+            # correlacao producao e preco
+            with col2:
+
+                with st.container(border=True): # cria container
+                    st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Produção 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
+
+                    def construir():
+                        fig_scatter3 = dispersao(
+                            df_oferta, 
+                            x=coluna_preco_3, 
+                            y="producao_12_meses", 
+                            color="ano",
+                            color_continuous_scale="RdYlGn",
+                            labels={coluna_preco_3: f"Preço da Soja ({preco_selecionado_3})", "producao": "Produção Mil Toneladas"},
+                            opacity=1
+                        )
+
+                        fig_scatter3.update_layout(
+                            xaxis=dict(
+                                title = f"Preço da Soja ({preco_selecionado_3})",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis=dict(
+                                title = "Produção (Mil Toneladas)",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),            
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10)
+                        )
+
+                        # linha de tendência OLS a partir das somas acumuladas (sem statsmodels)
+                        adicionar_tendencia(fig_scatter3, correlacoes, df_oferta, coluna_preco_3, "producao_12_meses", anos_selecionados_3)
+                        return fig_scatter3
+
+                    fig_scatter3 = figura_cacheada("oferta", ("fig_scatter3", anos_selecionados_3, preco_selecionado_3), construir)
+
+                    exibir_grafico("oferta", fig_scatter3)
+
+
+
+        # correlacao e insights da producao
+        col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+
+        # correlacao producao e preco
+        with col1:
+            with st.container(border=False): # cria container
+                #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
+
+                # Calcular correlação (somas acumuladas pré-calculadas)
+                with metricas().span("oferta", "agregacao"):
+                    correlacao_producao = correlacao(correlacoes, "producao_12_meses", coluna_preco_3, *anos_selecionados_3)
+
+                # Exibir resultado formatado
+                st.metric(
+                label="Correlação de Pearson (Produção 12 M vs. Preço Soja)",
+                value="n/d" if pd.isna(correlacao_producao) else f"{correlacao_producao:.4f}",
+                delta=sentido_correlacao(correlacao_producao),
+                border = True
                 )
 
-                st.plotly_chart(fig_scatter4, use_container_width=True)
+        # insights producao e preco
+        with col2:
+            with st.container(border=True): # cria container
+                st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            A forte correlação positiva sugere que o crescimento da produção tem sido acompanhado por preços mais altos. As explicações: Aumento da demanda global, impulsionado pela China e outros grandes importadores. Expansão da capacidade de exportação brasileira, não gerando excesso de oferta interna. Câmbio favorável (USD/BRL alto), tornando a soja brasileira mais competitiva e sustentando os preços mesmo com produção crescente.<br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+
+        # container importacao  
+        with st.container(border=False):
+            col1 , col2 = st.columns(2)
+
+            with col1:
+                with st.container(border=True):
+                    st.markdown("<h5 style='text-align: center;'> 📈 Evolução da Importação</h5>", unsafe_allow_html=True)
+
+                    # somatório dos últimos 12 meses já calculado sobre todo o histórico
+
+                    def construir():
+                        fig_importacao = go.Figure()
+
+                        fig_importacao.add_trace(go.Bar(
+                            x=df_oferta["periodo"], 
+                            y=df_oferta["importacao"],
+                            marker_color="#006400", 
+                            name="Importação Mensal"
+                        ))
+
+
+                        # Adicionar linha de tendência curva
+                        fig_importacao.add_trace(go.Scatter(
+                            x=df_oferta["periodo"], 
+                            y=df_oferta["importacao_12_meses"],
+                            mode="lines",
+                            line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
+                            name="Importação 12 Meses"
+                        ))
+
+                        fig_importacao.add_trace(go.Scatter(
+                            x=df_oferta["periodo"],
+                            y=df_oferta[coluna_preco_3],
+                            mode='lines',
+                            name='Preço da Soja',
+                            yaxis='y2',
+                            line=dict(color='#ADFF2F', width=2)
+                        ))
+
+                        fig_importacao.update_layout(
+                            xaxis=dict(
+                                title="Período",
+                                side="left",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1,
+                                tickmode="linear",
+                                dtick="M24",
+                                tickangle=45,
+                                tickformat="%Y",                          
+                                ), 
+                            yaxis=dict(
+                                title="Importação Mil Toneladas",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis2=dict(
+                                title=preco_selecionado_3, 
+                                overlaying="y", 
+                                side="right",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10),
+                            legend=dict(
+                                orientation="h",  # Torna a legenda horizontal
+                                yanchor="top",    # Alinha no topo da posição definida
+                                y=-0.5,           # Move a legenda para a parte inferior do gráfico
+                                xanchor="center",  # Centraliza a legenda
+                                x=0.5
+                            )
+                            )
+                        return fig_importacao
+
+                    fig_importacao = figura_cacheada("oferta", ("fig_importacao", anos_selecionados_3, preco_selecionado_3), construir)
+
+                    exibir_grafico("oferta", fig_importacao)
+
+            # correlacao importacao e preco
+            with col2:
+
+                with st.container(border=True): # cria container
+                    st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Importação 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
+
+                    def construir():
+                        fig_scatter4 = dispersao(
+                            df_oferta, 
+                            x=coluna_preco_3, 
+                            y="importacao_12_meses", 
+                            color="ano",
+                            color_continuous_scale="RdYlGn",
+                            labels={coluna_preco_3: f"Preço da Soja ({preco_selecionado_3})", "importacao": "Importação Mil Toneladas"},
+                            opacity=1
+                        )
+
+                        fig_scatter4.update_layout(
+                            xaxis=dict(
+                                title = f"Preço da Soja ({preco_selecionado_3})",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis=dict(
+                                title = "Importação (Mil Toneladas)",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),            
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10)
+                        )
+
+                        # linha de tendência OLS a partir das somas acumuladas (sem statsmodels)
+                        adicionar_tendencia(fig_scatter4, correlacoes, df_oferta, coluna_preco_3, "importacao_12_meses", anos_selecionados_3)
+                        return fig_scatter4
+
+                    fig_scatter4 = figura_cacheada("oferta", ("fig_scatter4", anos_selecionados_3, preco_selecionado_3), construir)
+
+                    exibir_grafico("oferta", fig_scatter4)
+
+
+
+        # correlacao e insights da importacao
+        col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+
+        # correlacao importacao e preco
+        with col1:
+            with st.container(border=False): # cria container
+                #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
+                # Calcular correlação (somas acumuladas pré-calculadas)
+                with metricas().span("oferta", "agregacao"):
+                    correlacao_importacao = correlacao(correlacoes, "importacao_12_meses", coluna_preco_3, *anos_selecionados_3)
 
+                # Exibir resultado formatado
+                st.metric(
+                label="Correlação de Pearson (Importação 12 M vs. Preço Soja)",
+                value="n/d" if pd.isna(correlacao_importacao) else f"{correlacao_importacao:.4f}",
+                delta=sentido_correlacao(correlacao_importacao),
+                border = True
+                )
 
-    # correlacao e insights da importacao
-    col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+        # insights importacao e preco
+        with col2:
+            with st.container(border=True): # cria container
+                st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            A importação de soja tem baixo impacto na formação de preços. Como o Brasil é um grande produtor e exportador, a importação ocorre apenas em momentos pontuais, geralmente para suprir déficits da indústria. Mesmo quando as importações aumentam, os preços seguem sendo influenciados por fatores mais relevantes, como produção, estoques, exportação e câmbio. <br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
 
-    # correlacao importacao e preco
-    with col1:
-        with st.container(border=False): # cria container
-            #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-    
-            # Calcular correlação
-            correlacao_importacao = df_oferta["importacao_12_meses"].corr(df_oferta[coluna_preco_3])
-
-            # Exibir resultado formatado
-            st.metric(
-            label="Correlação de Pearson (Importação 12 M vs. Preço Soja)",
-            value=f"{correlacao_importacao:.4f}",
-            delta="Positiva" if correlacao_importacao > 0 else "Negativa",
-            border = True
-            )
 
-    # insights importacao e preco
-    with col2:
-        with st.container(border=True): # cria container
-            st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        A importação de soja tem baixo impacto na formação de preços. Como o Brasil é um grande produtor e exportador, a importação ocorre apenas em momentos pontuais, geralmente para suprir déficits da indústria. Mesmo quando as importações aumentam, os preços seguem sendo influenciados por fatores mais relevantes, como produção, estoques, exportação e câmbio. <br>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+secao_oferta()
 
 
 
@@ -1162,361 +1223,393 @@ with st.container(border=True):
 
 # ---------------------------------------------- seção 04 - Demanda ----------------------------------------------------------------------
 
-with st.container(border=True):
-    
-    # container titulo demanda
-    with st.container(border=True):
-        titulo, espm, periodo, espm, tipo_preco = st.columns([2, 0.1, 1, 0.1, 1.5])
-
-        with titulo:
-            st.markdown("<h4 style='text-align: center; margin-top: 18px;'> 🧐 Demanda: Exportação e Processamento</h4>", unsafe_allow_html=True)
-
-        with periodo:
-            anos_selecionados_4 = st.slider(
-                "Selecione o Período:",
-                min_value=int(df_ano["periodo"].min()),
-                max_value=int(df_ano["periodo"].max()),
-                value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
-                key="slider_4"
-            )
-
-        with tipo_preco:
-            preco_selecionado_4 = st.selectbox(
-                "Selecione o Preço:",
-                ["Chicago - CBOT (US$/t)", "FOB Porto - Paranaguá (US$/t)", 
-                "Maringá / PR - R$/saca (sem ICMS)", "Mogiana / SP - R$/saca (sem ICMS)", 
-                "Passo Fundo / RS - R$/saca (sem ICMS)", "Rondonopolis / MT - R$/saca (sem ICMS)"],
-                index=5,
-                key="select_4"
-        )
+@st.fragment
+@metricas().medir("demanda", depois=exportar_metricas)
+def secao_demanda():
+    """Seção 04: demanda (exportação e processamento)."""
 
+    with st.container(border=True):
 
-    # filtro e tratamento de dados
-    df_demanda = df[(df["ano"] >= anos_selecionados_4[0]) & (df["ano"] <= anos_selecionados_4[1])]
-    df_demanda["periodo"] = pd.to_datetime(df_demanda["ano_mes"])
-    #df_demanda_anual = df_ano[(df_ano["periodo"] >= anos_selecionados_4[0]) & (df_ano["periodo"] <= anos_selecionados_4[1])]
-    
+        # container titulo demanda
+        with st.container(border=True):
+            titulo, espm, periodo, espm, tipo_preco = st.columns([2, 0.1, 1, 0.1, 1.5])
 
-    # container exportacao  
-    with st.container(border=False):
-        col1 , col2 = st.columns(2)
+            with titulo:
+                st.markdown("<h4 style='text-align: center; margin-top: 18px;'> 🧐 Demanda: Exportação e Processamento</h4>", unsafe_allow_html=True)
 
-        with col1:
-            with st.container(border=True):
-                st.markdown("<h5 style='text-align: center;'> 📈 Evolução da Exportação</h5>", unsafe_allow_html=True)
-                
-                # Calcular a somatorio ultimos 12 meses (ajustável)
-                window_size = 12  # Tamanho da janela da soma móvel (12 meses)
-                df_demanda["exportacao_12_meses"] = df_demanda["exportacao"].rolling(window=window_size, min_periods=1).sum()
-
-                fig_exportacao = go.Figure()
-
-                fig_exportacao.add_trace(go.Bar(
-                    x=df_demanda["periodo"], 
-                    y=df_demanda["exportacao"],
-                    marker_color="#006400", 
-                    name="Exportação Mensal"
-                ))
+            with periodo:
+                anos_selecionados_4 = st.slider(
+                    "Selecione o Período:",
+                    min_value=int(df_ano["periodo"].min()),
+                    max_value=int(df_ano["periodo"].max()),
+                    value=(int(df_ano["periodo"].min()), int(df_ano["periodo"].max())),
+                    key="slider_4"
+                )
 
+            with tipo_preco:
+                preco_selecionado_4 = st.selectbox(
+                    "Selecione o Preço:",
+                    list(PRECOS),
+                    index=5,
+                    key="select_4"
+            )
 
-                # Adicionar linha de tendência curva
-                fig_exportacao.add_trace(go.Scatter(
-                    x=df_demanda["periodo"], 
-                    y=df_demanda["exportacao_12_meses"],
-                    mode="lines",
-                    line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
-                    name="Exportação 12 Meses"
-                ))
-                
-                tabela_preco_4 = {
-                    "Chicago - CBOT (US$/t)": "chicago_cbot_u$/t",
-                    "FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t",
-                    "Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca",
-                    "Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca",
-                    "Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca",
-                    "Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca",
-                }
-
-                coluna_preco_4 = tabela_preco_4[preco_selecionado_4]
-
-
-
-                fig_exportacao.add_trace(go.Scatter(
-                    x=df_demanda["periodo"],
-                    y=df_demanda[coluna_preco_4],
-                    mode='lines',
-                    name='Preço da Soja',
-                    yaxis='y2',
-                    line=dict(color='#ADFF2F', width=2)
-                ))
 
-                fig_exportacao.update_layout(
-                    xaxis=dict(
-                        title="Período",
-                        side="left",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1,
-                        tickmode="linear",
-                        dtick="M24",
-                        tickangle=45,
-                        tickformat="%Y",                          
-                        ), 
-                    yaxis=dict(
-                        title="Exportação Mil Toneladas",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis2=dict(
-                        title=preco_selecionado_4, 
-                        overlaying="y", 
-                        side="right",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10),
-                    legend=dict(
-                        orientation="h",  # Torna a legenda horizontal
-                        yanchor="top",    # Alinha no topo da posição definida
-                        y=-0.5,           # Move a legenda para a parte inferior do gráfico
-                        xanchor="center",  # Centraliza a legenda
-                        x=0.5
-                    )
-                    )
-        
-                st.plotly_chart(fig_exportacao, use_container_width=True)
+        # filtro e tratamento de dados
+        with metricas().span("demanda", "filtro"):
+            df_demanda = mensal.anos(*anos_selecionados_4)
+
+        # coluna do preço selecionado (usada pelos gráficos e correlações da seção)
+        coluna_preco_4 = PRECOS[preco_selecionado_4]
+
+        # dados da seção para download (a própria fatia filtrada, convertida só no clique)
+        with st.popover("⬇️ Baixar dados da demanda"):
+            botoes_download(df_demanda, f"demanda_{anos_selecionados_4[0]}_{anos_selecionados_4[1]}", "demanda", anos_selecionados_4)
+
+        # container exportacao  
+        with st.container(border=False):
+            col1 , col2 = st.columns(2)
+
+            with col1:
+                with st.container(border=True):
+                    st.markdown("<h5 style='text-align: center;'> 📈 Evolução da Exportação</h5>", unsafe_allow_html=True)
+
+                    # somatório dos últimos 12 meses já calculado sobre todo o histórico
+
+                    def construir():
+                        fig_exportacao = go.Figure()
+
+                        fig_exportacao.add_trace(go.Bar(
+                            x=df_demanda["periodo"], 
+                            y=df_demanda["exportacao"],
+                            marker_color="#006400", 
+                            name="Exportação Mensal"
+                        ))
+
+
+                        # Adicionar linha de tendência curva
+                        fig_exportacao.add_trace(go.Scatter(
+                            x=df_demanda["periodo"], 
+                            y=df_demanda["exportacao_12_meses"],
+                            mode="lines",
+                            line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
+                            name="Exportação 12 Meses"
+                        ))
+
+                        fig_exportacao.add_trace(go.Scatter(
+                            x=df_demanda["periodo"],
+                            y=df_demanda[coluna_preco_4],
+                            mode='lines',
+                            name='Preço da Soja',
+                            yaxis='y2',
+                            line=dict(color='#ADFF2F', width=2)
+                        ))
+
+                        fig_exportacao.update_layout(
+                            xaxis=dict(
+                                title="Período",
+                                side="left",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1,
+                                tickmode="linear",
+                                dtick="M24",
+                                tickangle=45,
+                                tickformat="%Y",                          
+                                ), 
+                            yaxis=dict(
+                                title="Exportação Mil Toneladas",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis2=dict(
+                                title=preco_selecionado_4, 
+                                overlaying="y", 
+                                side="right",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10),
+                            legend=dict(
+                                orientation="h",  # Torna a legenda horizontal
+                                yanchor="top",    # Alinha no topo da posição definida
+                                y=-0.5,           # Move a legenda para a parte inferior do gráfico
+                                xanchor="center",  # Centraliza a legenda
+                                x=0.5
+                            )
+                            )
+                        return fig_exportacao
+
+                    fig_exportacao = figura_cacheada("demanda", ("fig_exportacao", anos_selecionados_4, preco_selecionado_4), construir)
+
+                    exibir_grafico("demanda", fig_exportacao)
+
+            # correlacao exportacao e preco
+            with col2:
+
+                with st.container(border=True): # cria container
+                    st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Exportação 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
+
+                    def construir():
+                        fig_scatter5 = dispersao(
+                            df_demanda, 
+                            x=coluna_preco_4, 
+                            y="exportacao_12_meses", 
+                            color="ano",
+                            color_continuous_scale="RdYlGn",
+                            labels={coluna_preco_4: f"Preço da Soja ({preco_selecionado_4})", "exportacao": "Exportação Mil Toneladas"},
+                            opacity=1
+                        )
+
+                        fig_scatter5.update_layout(
+                            xaxis=dict(
+                                title = f"Preço da Soja ({preco_selecionado_4})",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis=dict(
+                                title = "Exportação (Mil Toneladas)",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),            
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10)
+                        )
+
+                        # linha de tendência OLS a partir das somas acumuladas (sem statsmodels)
+                        adicionar_tendencia(fig_scatter5, correlacoes, df_demanda, coluna_preco_4, "exportacao_12_meses", anos_selecionados_4)
+                        return fig_scatter5
+
+                    fig_scatter5 = figura_cacheada("demanda", ("fig_scatter5", anos_selecionados_4, preco_selecionado_4), construir)
+
+                    exibir_grafico("demanda", fig_scatter5)
+
+        # correlacao e insights da exportacao
+        col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
 
         # correlacao exportacao e preco
-        with col2:
+        with col1:
+            with st.container(border=False): # cria container
+                #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-            with st.container(border=True): # cria container
-                st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Exportação 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
-
-                fig_scatter5 = px.scatter(
-                    df_demanda, 
-                    x=coluna_preco_4, 
-                    y="exportacao_12_meses", 
-                    color="ano",
-                    color_continuous_scale="RdYlGn",
-                    trendline="ols",  # Adiciona a linha de tendência automaticamente
-                    trendline_color_override="blue",
-                    labels={coluna_preco_4: f"Preço da Soja ({preco_selecionado_4})", "exportacao": "Exportação Mil Toneladas"},
-                    color_discrete_sequence=["#ADFF2F"],
-                    opacity=1
-                )
+                # Calcular correlação (somas acumuladas pré-calculadas)
+                with metricas().span("demanda", "agregacao"):
+                    correlacao_exportacao = correlacao(correlacoes, "exportacao_12_meses", coluna_preco_4, *anos_selecionados_4)
 
-                fig_scatter5.update_layout(
-                    xaxis=dict(
-                        title = f"Preço da Soja ({preco_selecionado_4})",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis=dict(
-                        title = "Exportação (Mil Toneladas)",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),            
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10)
+                # Exibir resultado formatado
+                st.metric(
+                label="Correlação de Pearson (Exportação 12 M vs. Preço Soja)",
+                value="n/d" if pd.isna(correlacao_exportacao) else f"{correlacao_exportacao:.4f}",
+                delta=sentido_correlacao(correlacao_exportacao),
+                border = True
                 )
 
-                st.plotly_chart(fig_scatter5, use_container_width=True)
+        # insights exportacao e preco
+        with col2:
+            with st.container(border=True): # cria container
+                st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            A exportação de soja tem forte influência na formação de preços. Isso indica que, à medida que as exportações aumentam, os preços tendem a subir, refletindo a maior demanda externa. Além disso, a competitividade da soja brasileira no mercado global, impulsionada pelo câmbio e pela demanda internacional, reforça essa relação ao reduzir a oferta disponível no mercado interno. <br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+
+        # container processamento 
+        with st.container(border=False):
+            col1 , col2 = st.columns(2)
+
+            with col1:
+                with st.container(border=True):
+                    st.markdown("<h5 style='text-align: center;'> 📈 Evolução do Processamento</h5>", unsafe_allow_html=True)
+
+                    # somatório dos últimos 12 meses já calculado sobre todo o histórico
+
+                    def construir():
+                        fig_processamento = go.Figure()
+
+                        fig_processamento.add_trace(go.Bar(
+                            x=df_demanda["periodo"], 
+                            y=df_demanda["processamento"],
+                            marker_color="#006400", 
+                            name="Processamento Mensal"
+                        ))
+
+
+                        # Adicionar linha de tendência curva
+                        fig_processamento.add_trace(go.Scatter(
+                            x=df_demanda["periodo"], 
+                            y=df_demanda["processamento_12_meses"],
+                            mode="lines",
+                            line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
+                            name="Processamento 12 Meses"
+                        ))
+
+                        fig_processamento.add_trace(go.Scatter(
+                            x=df_demanda["periodo"],
+                            y=df_demanda[coluna_preco_4],
+                            mode='lines',
+                            name='Preço da Soja',
+                            yaxis='y2',
+                            line=dict(color='#ADFF2F', width=2)
+                        ))
+
+                        fig_processamento.update_layout(
+                            xaxis=dict(
+                                title="Período",
+                                side="left",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1,
+                                tickmode="linear",
+                                dtick="M24",
+                                tickangle=45,
+                                tickformat="%Y",                          
+                                ), 
+                            yaxis=dict(
+                                title="Processamento Mil Toneladas",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis2=dict(
+                                title=preco_selecionado_4, 
+                                overlaying="y", 
+                                side="right",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10),
+                            legend=dict(
+                                orientation="h",  # Torna a legenda horizontal
+                                yanchor="top",    # Alinha no topo da posição definida
+                                y=-0.5,           # Move a legenda para a parte inferior do gráfico
+                                xanchor="center",  # Centraliza a legenda
+                                x=0.5
+                            )
+                            )
+                        return fig_processamento
+
+                    fig_processamento = figura_cacheada("demanda", ("fig_processamento", anos_selecionados_4, preco_selecionado_4), construir)
+
+                    exibir_grafico("demanda", fig_processamento)
+
+            # correlacao processamento e preco
+            with col2:
+
+                with st.container(border=True): # cria container
+                    st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Processamento 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
+
+                    def construir():
+                        fig_scatter6 = dispersao(
+                            df_demanda, 
+                            x=coluna_preco_4, 
+                            y="processamento_12_meses", 
+                            color="ano",
+                            color_continuous_scale="RdYlGn",
+                            labels={coluna_preco_4: f"Preço da Soja ({preco_selecionado_4})", "processamento": "Processamento Mil Toneladas"},
+                            opacity=1
+                        )
+
+                        fig_scatter6.update_layout(
+                            xaxis=dict(
+                                title = f"Preço da Soja ({preco_selecionado_4})",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),
+                            yaxis=dict(
+                                title = "Processamento (Mil Toneladas)",
+                                showline=True,
+                                linecolor="gray",
+                                linewidth=1
+                                ),            
+                            height=400,
+                            margin=dict(l=10, r=10, t=20, b=10)
+                        )
+
+                        # linha de tendência OLS a partir das somas acumuladas (sem statsmodels)
+                        adicionar_tendencia(fig_scatter6, correlacoes, df_demanda, coluna_preco_4, "processamento_12_meses", anos_selecionados_4)
+                        return fig_scatter6
+
+                    fig_scatter6 = figura_cacheada("demanda", ("fig_scatter6", anos_selecionados_4, preco_selecionado_4), construir)
+
+                    exibir_grafico("demanda", fig_scatter6)
+
+        # correlacao e insights da exportacao
+        col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
 
-    # correlacao e insights da exportacao
-    col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+        # correlacao processamento e preco
+        with col1:
+            with st.container(border=False): # cria container
+                #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
+                #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
 
-    # correlacao exportacao e preco
-    with col1:
-        with st.container(border=False): # cria container
-            #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-    
-            # Calcular correlação
-            correlacao_exportacao = df_demanda["exportacao_12_meses"].corr(df_demanda[coluna_preco_4])
-
-            # Exibir resultado formatado
-            st.metric(
-            label="Correlação de Pearson (Exportação 12 M vs. Preço Soja)",
-            value=f"{correlacao_exportacao:.4f}",
-            delta="Positiva" if correlacao_exportacao > 0 else "Negativa",
-            border = True
-            )
+                # Calcular correlação (somas acumuladas pré-calculadas)
+                with metricas().span("demanda", "agregacao"):
+                    correlacao_processamento = correlacao(correlacoes, "processamento_12_meses", coluna_preco_4, *anos_selecionados_4)
 
-    # insights exportacao e preco
-    with col2:
-        with st.container(border=True): # cria container
-            st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        A exportação de soja tem forte influência na formação de preços. Isso indica que, à medida que as exportações aumentam, os preços tendem a subir, refletindo a maior demanda externa. Além disso, a competitividade da soja brasileira no mercado global, impulsionada pelo câmbio e pela demanda internacional, reforça essa relação ao reduzir a oferta disponível no mercado interno. <br>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
+                # Exibir resultado formatado
+                st.metric(
+                label="Correlação de Pearson (Processamento 12 M vs. Preço Soja)",
+                value="n/d" if pd.isna(correlacao_processamento) else f"{correlacao_processamento:.4f}",
+                delta=sentido_correlacao(correlacao_processamento),
+                border = True
+                )
 
-    # container processamento 
-    with st.container(border=False):
-        col1 , col2 = st.columns(2)
+        # insights processamento e preco
+        with col2:
+            with st.container(border=True): # cria container
+                st.markdown("""
+                    <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
+                        <p style='font-size: 14px;'>
+                            O processamento de soja tem forte impacto na formação de preços. Isso indica que, à medida que a demanda interna por farelo e óleo de soja cresce, os preços tendem a subir, refletindo a menor disponibilidade de grãos no mercado. Além disso, o processamento acompanha o aumento da produção e exportação, reforçando sua influência sobre a dinâmica de oferta e demanda. <br>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
 
-        with col1:
-            with st.container(border=True):
-                st.markdown("<h5 style='text-align: center;'> 📈 Evolução do Processamento</h5>", unsafe_allow_html=True)
-                
-                # Calcular a somatorio ultimos 12 meses (ajustável)
-                window_size = 12  # Tamanho da janela da soma móvel (12 meses)
-                df_demanda["processamento_12_meses"] = df_demanda["processamento"].rolling(window=window_size, min_periods=1).sum()
-
-                fig_processamento = go.Figure()
-
-                fig_processamento.add_trace(go.Bar(
-                    x=df_demanda["periodo"], 
-                    y=df_demanda["processamento"],
-                    marker_color="#006400", 
-                    name="Processamento Mensal"
-                ))
 
+secao_demanda()
 
-                # Adicionar linha de tendência curva
-                fig_processamento.add_trace(go.Scatter(
-                    x=df_demanda["periodo"], 
-                    y=df_demanda["processamento_12_meses"],
-                    mode="lines",
-                    line=dict(color="#FF8800", width=3, dash="solid"),  # Linha contínua vermelha
-                    name="Processamento 12 Meses"
-                ))
-                
-                tabela_preco_4 = {
-                    "Chicago - CBOT (US$/t)": "chicago_cbot_u$/t",
-                    "FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t",
-                    "Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca",
-                    "Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca",
-                    "Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca",
-                    "Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca",
-                }
-
-                coluna_preco_4 = tabela_preco_4[preco_selecionado_4]
-
-
-
-                fig_processamento.add_trace(go.Scatter(
-                    x=df_demanda["periodo"],
-                    y=df_demanda[coluna_preco_4],
-                    mode='lines',
-                    name='Preço da Soja',
-                    yaxis='y2',
-                    line=dict(color='#ADFF2F', width=2)
-                ))
 
-                fig_processamento.update_layout(
-                    xaxis=dict(
-                        title="Período",
-                        side="left",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1,
-                        tickmode="linear",
-                        dtick="M24",
-                        tickangle=45,
-                        tickformat="%Y",                          
-                        ), 
-                    yaxis=dict(
-                        title="Processamento Mil Toneladas",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis2=dict(
-                        title=preco_selecionado_4, 
-                        overlaying="y", 
-                        side="right",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10),
-                    legend=dict(
-                        orientation="h",  # Torna a legenda horizontal
-                        yanchor="top",    # Alinha no topo da posição definida
-                        y=-0.5,           # Move a legenda para a parte inferior do gráfico
-                        xanchor="center",  # Centraliza a legenda
-                        x=0.5
-                    )
-                    )
-        
-                st.plotly_chart(fig_processamento, use_container_width=True)
-
-        # correlacao processamento e preco
-        with col2:
 
-            with st.container(border=True): # cria container
-                st.markdown("<h5 style='text-align: center;'> 🔍 Correlação entre Processamento 12 Meses e Preço da Soja</h5>", unsafe_allow_html=True)
-
-                fig_scatter6 = px.scatter(
-                    df_demanda, 
-                    x=coluna_preco_4, 
-                    y="processamento_12_meses", 
-                    color="ano",
-                    color_continuous_scale="RdYlGn",
-                    trendline="ols",  # Adiciona a linha de tendência automaticamente
-                    trendline_color_override="blue",
-                    labels={coluna_preco_4: f"Preço da Soja ({preco_selecionado_4})", "processamento": "Processamento Mil Toneladas"},
-                    color_discrete_sequence=["#ADFF2F"],
-                    opacity=1
-                )
 
-                fig_scatter6.update_layout(
-                    xaxis=dict(
-                        title = f"Preço da Soja ({preco_selecionado_4})",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),
-                    yaxis=dict(
-                        title = "Processamento (Mil Toneladas)",
-                        showline=True,
-                        linecolor="gray",
-                        linewidth=1
-                        ),            
-                    height=400,
-                    margin=dict(l=10, r=10, t=20, b=10)
-                )
+# ---------------------------------------------- painel admin (oculto) ----------------------------------------------------------------------
 
-                st.plotly_chart(fig_scatter6, use_container_width=True)
+# visível apenas com ?admin=1 na URL: tempos por seção/etapa, memória, cache de figuras (hits/misses por seção) e datasets do registro
+if st.query_params.get("admin") == "1":
+    with st.sidebar.expander("⏱️ Tempos por seção", expanded=True):
+        spans = pd.DataFrame(metricas().spans(), columns=["secao", "etapa", "execucoes", "total_s", "max_s", "ultimo_s"])
+        spans["media_ms"] = spans["total_s"] / spans["execucoes"] * 1000
+        tabela_spans = spans.pivot_table(index="secao", columns="etapa", values="media_ms")
+        st.caption("média por execução (ms); seções reexecutadas isoladamente a cada interação com seus widgets")
+        st.dataframe(tabela_spans.reindex(columns=[etapa for etapa in ETAPAS if etapa in tabela_spans.columns]).round(1), width="stretch")
 
-    # correlacao e insights da exportacao
-    col, col1, col2, esp = st.columns([0.15,1.2,2.5,0.15])
+    with st.sidebar.expander("🧠 Memória", expanded=False):
+        memoria = relatorio_memoria()
+        mb = lambda valor: f"{valor/1024**2:.1f} MB" if valor else "—"
+        st.caption(f"processo {mb(memoria['processo_bytes'])} · compartilhado {mb(memoria['compartilhado_bytes'])} · "
+                   f"{memoria['sessoes_ativas']} sessões ativas · {mb(memoria['processo_por_sessao_bytes'])} de processo por sessão")
+        if memoria["rastreando"]:
+            st.caption(f"pico médio por sessão (tracemalloc): {mb(memoria['pico_por_sessao_bytes'])}")
+            st.dataframe(pd.DataFrame(memoria["secoes"]).set_index("secao").round(1), width="stretch")
+            st.dataframe(pd.DataFrame(memoria["sessoes"]).round(1), width="stretch", hide_index=True)
+        else:
+            st.caption("tracemalloc desligado: inicie com SOJAMETRICS_TRACEMALLOC=1 para medir a memória por seção e por sessão (as seções passam a rodar uma de cada vez)")
 
-    # correlacao processamento e preco
-    with col1:
-        with st.container(border=False): # cria container
-            #st.markdown("<h5 style='margin-left: 50px;'> 📊 Estatísticas da Correlação</h5>", unsafe_allow_html=True)
-            #st.markdown("<br>", unsafe_allow_html=True)  # Adiciona espaço entre os blocos
-    
-            # Calcular correlação
-            correlacao_processamento = df_demanda["processamento_12_meses"].corr(df_demanda[coluna_preco_4])
-
-            # Exibir resultado formatado
-            st.metric(
-            label="Correlação de Pearson (Processamento 12 M vs. Preço Soja)",
-            value=f"{correlacao_processamento:.4f}",
-            delta="Positiva" if correlacao_processamento > 0 else "Negativa",
-            border = True
-            )
+    with st.sidebar.expander("⚙️ Cache de figuras", expanded=True):
+        estatisticas = cache_figuras().estatisticas()
+        st.caption(f"{estatisticas['itens']}/{estatisticas['max_itens']} figuras · {estatisticas['bytes']/1024**2:.1f}/{estatisticas['max_bytes']/1024**2:.0f} MB")
+        st.dataframe(pd.DataFrame(estatisticas["secoes"]).T, width="stretch")
 
-    # insights processamento e preco
-    with col2:
-        with st.container(border=True): # cria container
-            st.markdown("""
-                <div style='margin-left: 30px; margin-right: 30px; margin-bottom: 20px; text-align: center;'>
-                    <p style='font-size: 14px;'>
-                        O processamento de soja tem forte impacto na formação de preços. Isso indica que, à medida que a demanda interna por farelo e óleo de soja cresce, os preços tendem a subir, refletindo a menor disponibilidade de grãos no mercado. Além disso, o processamento acompanha o aumento da produção e exportação, reforçando sua influência sobre a dinâmica de oferta e demanda. <br>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
+    with st.sidebar.expander("⚙️ Datasets carregados", expanded=False):
+        st.dataframe(situacao(), width="stretch", hide_index=True)
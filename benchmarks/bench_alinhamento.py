@@ -0,0 +1,71 @@
+"""Benchmark do alinhamento diário -> mensal (utils/alinhamento.py).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_alinhamento --anos 10 20 40
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.alinhamento import POLITICAS, alinhar_mensal
+
+
+def gerar_serie(anos, seed=42):
+    """Série diária sintética de câmbio (passeio aleatório) com volume, cobrindo `anos` anos."""
+
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range("1990-01-01", periods=anos * 365, freq="D")
+    fechamento = np.exp(np.cumsum(rng.normal(0, 0.01, len(datas))))
+    volume = rng.integers(1, 1000, len(datas)).astype("float64")
+    return pd.DataFrame({"ano_mes": datas, "usdbrl": fechamento, "volume": volume})
+
+
+def alinhar_groupby_apply(df):
+    # implementação anterior do tratamento_dados.py (um loop python por mês)
+    df = df.copy()
+    df["ano"] = df["ano_mes"].dt.year
+    df["mes"] = df["ano_mes"].dt.month
+    df = df.sort_values(["ano", "mes", "ano_mes"])
+    return (
+        df.groupby(["ano", "mes"])
+        .apply(lambda x: x.iloc[(x["ano_mes"] - pd.to_datetime(x["ano_mes"].dt.strftime("%Y-%m-01"))).abs().argmin()])
+        .reset_index(drop=True)
+    )
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--anos", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'anos':>5} {'linhas':>8} {'política':>10} {'ms':>10}")
+    for anos in args.anos:
+        df = gerar_serie(anos)
+
+        # confere que a política "inicio" reproduz a implementação anterior
+        esperado = alinhar_groupby_apply(df)["usdbrl"].to_numpy()
+        obtido = alinhar_mensal(df, "ano_mes", "usdbrl", politica="inicio")["usdbrl"].to_numpy()
+        assert np.array_equal(esperado, obtido), "alinhamento divergente da implementação anterior"
+
+        ms = medir(lambda: alinhar_groupby_apply(df), max(1, args.repeticoes // 2))
+        print(f"{anos:>5} {len(df):>8} {'apply':>10} {ms:>10.2f}")
+        for politica in POLITICAS:
+            ms = medir(lambda: alinhar_mensal(df, "ano_mes", "usdbrl", politica=politica, coluna_peso="volume"), args.repeticoes)
+            print(f"{anos:>5} {len(df):>8} {politica:>10} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark do recorte por faixa de anos: máscara booleana vs. FrameTemporal (utils/temporal.py).
+
+Mede tempo e memória alocada (tracemalloc) por consulta, como acontece a cada interação com os sliders.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_fatias --anos 30 100 300
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from utils.temporal import FrameTemporal
+
+
+def gerar_mensal(anos, colunas=20, seed=42):
+    """Frame mensal sintético com `ano`, `ano_mes` e `colunas` medidas float64."""
+
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range("1900-01-01", periods=anos * 12, freq="MS")
+    df = pd.DataFrame(rng.normal(size=(len(datas), colunas)).astype("float64"), columns=[f"m{i}" for i in range(colunas)])
+    df["ano_mes"] = datas
+    df["ano"] = datas.year.astype("int16")
+    return df
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tempos) * 1e6, pico / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--anos", type=int, nargs="+", default=[30, 100, 300])
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'anos':>5} {'linhas':>8} {'método':>10} {'µs':>10} {'KB alocados':>12}")
+    for anos in args.anos:
+        df = gerar_mensal(anos)
+        temporal = FrameTemporal(df, "ano_mes")
+        a, b = 1900 + anos // 4, 1900 + anos // 2
+
+        mascara = df[(df["ano"] >= a) & (df["ano"] <= b)]
+        fatia = temporal.anos(a, b)
+        assert mascara.reset_index(drop=True).equals(fatia.reset_index(drop=True)), "recortes divergentes"
+
+        for nome, funcao in (("máscara", lambda: df[(df["ano"] >= a) & (df["ano"] <= b)]), ("fatia", lambda: temporal.anos(a, b))):
+            us, kb = medir(funcao, args.repeticoes)
+            print(f"{anos:>5} {len(df):>8} {nome:>10} {us:>10.1f} {kb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Benchmark da partida a frio de cada ponto de entrada: interpretador novo + imports + primeira execução.
+
+Cada página (1_dash.py e pages/2_forecast.py) roda num processo novo com `python -X importtime`: o processo
+importa o AppTest e executa a página uma vez (seleções padrão), como o primeiro acesso a um worker recém-criado.
+O tempo é o relógio de parede do processo inteiro, da partida do interpretador ao fim da primeira execução
+(mediana de `--repeticoes` processos); imports feitos dentro de funções durante essa execução entram na conta.
+O alvo "streamlit" é a mesma partida sem executar página nenhuma (a base de todo worker) e "tratamento" é o
+import do tratamento_dados.py (o ETL em si só roda como script).
+
+Os módulos mais caros vêm do `-X importtime`, e carregar uma biblioteca proibida para a página na primeira
+execução é falha. O resultado é gravado em JSON e o processo sai com código 1 se algum limite for ultrapassado.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_imports --saida benchmarks/resultados/imports.json
+    python -m benchmarks.bench_imports --referencia benchmarks/resultados/imports.json --tolerancia 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# alvo -> página executada na partida (None = só a partida do AppTest, a base de todo worker; "tratamento" só importa)
+ALVOS = {
+    "streamlit": None,
+    "dashboard": "1_dash.py",
+    "forecast": "pages/2_forecast.py",
+    "tratamento": "tratamento_dados.py",
+}
+
+# limite absoluto da partida a frio de cada alvo (s)
+LIMITE_SEGUNDOS = 10.0
+
+# bibliotecas que a partida de cada alvo não pode carregar
+PROIBIDOS = {
+    "1_dash.py": ("plotly.express", "statsmodels", "scipy", "seaborn", "matplotlib"),
+    "pages/2_forecast.py": ("statsmodels", "scipy", "plotly.express", "seaborn", "matplotlib"),
+    "tratamento_dados.py": ("plotly", "statsmodels", "seaborn", "matplotlib"),
+}
+PESADOS = ("plotly", "plotly.express", "statsmodels", "scipy", "seaborn", "matplotlib", "sklearn")
+
+# partida de um worker: importa o AppTest, executa a página uma vez e imprime (JSON) erros e bibliotecas pesadas
+_PARTIDA = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+erros = []
+if {pagina!r}:
+    at = AppTest.from_file({pagina!r}, default_timeout=300).run()
+    erros = [str(e.value) for e in at.exception]
+print(json.dumps({{"erros": erros, "carregados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+# import do ETL (o processamento só roda com `python tratamento_dados.py`)
+_IMPORT_ETL = """
+import json, sys
+import tratamento_dados
+print(json.dumps({{"erros": [], "carregados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def codigo_partida(nome):
+    """Código executado no processo novo de cada alvo."""
+
+    arquivo = ALVOS[nome]
+    if nome == "tratamento":
+        return _IMPORT_ETL.format(pesados=PESADOS)
+    return _PARTIDA.format(pagina=os.path.join(RAIZ, arquivo) if arquivo else "", pesados=PESADOS)
+
+
+def ler_importtime(saida):
+    """Interpreta o stderr do `-X importtime`: {módulo de primeiro nível: cumulativo (s)}."""
+
+    modulos = {}
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        if nome.strip() == "imported package" or nome.startswith("  "):
+            continue  # cabeçalho ou submódulo (indentado): já entra no cumulativo do pai
+        modulos[nome.strip()] = modulos.get(nome.strip(), 0.0) + int(cumulativo) / 1e6
+    return modulos
+
+
+def medir_alvo(nome, repeticoes):
+    """Mediana da partida a frio (relógio de parede do processo), módulos mais caros e bibliotecas carregadas."""
+
+    codigo = codigo_partida(nome)
+    medidas = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        processo = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ, capture_output=True, text=True,
+                                  env={**os.environ, "PYTHONPATH": RAIZ})
+        segundos = time.perf_counter() - inicio
+        if processo.returncode != 0:
+            raise RuntimeError(f"❌ Falha na partida de {nome}:\n{processo.stderr[-2000:]}")
+        medidas.append((segundos, ler_importtime(processo.stderr), json.loads(processo.stdout.strip().splitlines()[-1])))
+
+    medidas.sort(key=lambda medida: medida[0])
+    total, modulos, sonda = medidas[len(medidas) // 2]
+    mais_caros = sorted(modulos.items(), key=lambda item: item[1], reverse=True)[:8]
+    return {
+        "segundos": total,
+        "min_s": medidas[0][0],
+        "max_s": medidas[-1][0],
+        "mediana_s": statistics.median(medida[0] for medida in medidas),
+        "import_s": sum(modulos.values()),
+        "modulos": [{"modulo": nome, "segundos": segundos} for nome, segundos in mais_caros],
+        "erros": sonda["erros"],
+        "carregados": sonda["carregados"],
+    }
+
+
+def verificar(alvos, referencia, tolerancia):
+    """Lista de violações: limite absoluto, exceções, bibliotecas proibidas carregadas e regressões contra um resultado anterior."""
+
+    falhas = []
+    for nome, alvo in alvos.items():
+        if alvo["mediana_s"] > LIMITE_SEGUNDOS:
+            falhas.append(f"{nome}: partida em {alvo['mediana_s']:.2f} s > {LIMITE_SEGUNDOS} s")
+        if alvo["erros"]:
+            falhas.append(f"{nome}: exceção {alvo['erros'][0]!r}")
+        for modulo in set(alvo["carregados"]) & set(PROIBIDOS.get(ALVOS[nome], ())):
+            falhas.append(f"{nome}: partida carregou {modulo}")
+
+    if referencia:
+        for nome, alvo in alvos.items():
+            anterior = referencia["alvos"].get(nome)
+            if anterior is None:
+                continue
+            limite = anterior["mediana_s"] * (1 + tolerancia)
+            if alvo["mediana_s"] > limite:
+                falhas.append(f"{nome}: partida em {alvo['mediana_s']:.3f} s > {limite:.3f} s "
+                              f"(referência {anterior['mediana_s']:.3f} + {tolerancia:.0%})")
+    return falhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alvos", nargs="+", default=list(ALVOS), choices=list(ALVOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON com o resultado")
+    parser.add_argument("--referencia", help="resultado anterior (JSON) para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="piora máxima aceita contra a referência (0.5 = +50%%)")
+    args = parser.parse_args()
+
+    # uma execução descartada para compilar os .pyc: a medida é a de um processo com cache de bytecode
+    alvos = {}
+    for nome in args.alvos:
+        medir_alvo(nome, 1)
+        alvos[nome] = medir_alvo(nome, args.repeticoes)
+
+    referencia = None
+    if args.referencia:
+        with open(args.referencia, encoding="utf-8") as arquivo:
+            referencia = json.load(arquivo)
+    falhas = verificar(alvos, referencia, args.tolerancia)
+
+    print(f"{'alvo':<12} {'mediana s':>10} {'mín s':>8} {'máx s':>8} {'import s':>9}  módulos mais caros")
+    for nome, alvo in alvos.items():
+        caros = ", ".join(f"{m['modulo']} {m['segundos']:.2f}" for m in alvo["modulos"][:4])
+        print(f"{nome:<12} {alvo['mediana_s']:>10.3f} {alvo['min_s']:>8.3f} {alvo['max_s']:>8.3f} {alvo['import_s']:>9.3f}  {caros}")
+    for nome, alvo in alvos.items():
+        print(f"{nome}: carrega {', '.join(alvo['carregados']) or 'nenhuma biblioteca pesada'}")
+
+    if args.saida:
+        os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+        resultado = {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "repeticoes": args.repeticoes,
+            "limites": {"segundos": LIMITE_SEGUNDOS, "proibidos": PROIBIDOS},
+            "alvos": alvos,
+            "falhas": falhas,
+        }
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+    for falha in falhas:
+        print(f"❌ {falha}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark da redução de séries (utils/reducao.py), usada pelas sparklines dos KPIs.
+
+Mede o tempo da redução e o tamanho da série em JSON com e sem redução, no orçamento de pontos das sparklines.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_reducao --anos 5 25 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.reducao import METODOS, reduzir_serie
+from utils.sparklines import PONTOS_MAX
+
+
+def gerar_serie(anos, seed=42):
+    """Série diária sintética de câmbio (passeio aleatório) cobrindo `anos` anos."""
+
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range("1990-01-01", periods=anos * 365, freq="D")
+    return datas, np.exp(np.cumsum(rng.normal(0, 0.01, len(datas))))
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--anos", type=int, nargs="+", default=[5, 25, 100])
+    parser.add_argument("--pontos", type=int, default=PONTOS_MAX)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'anos':>5} {'linhas':>8} {'método':>8} {'pontos':>8} {'ms':>10} {'json KB':>10}")
+    for anos in args.anos:
+        datas, valores = gerar_serie(anos)
+
+        completo = go.Figure(go.Scatter(x=datas, y=valores, mode="lines")).to_json()
+        print(f"{anos:>5} {len(datas):>8} {'-':>8} {len(datas):>8} {0:>10.2f} {len(completo)/1024:>10.1f}")
+
+        for metodo in METODOS:
+            ms, (x, y) = medir(lambda: reduzir_serie(datas, valores, args.pontos, metodo), args.repeticoes)
+            tamanho = len(go.Figure(go.Scatter(x=x, y=y, mode="lines")).to_json())
+            print(f"{anos:>5} {len(datas):>8} {metodo:>8} {len(y):>8} {ms:>10.2f} {tamanho/1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
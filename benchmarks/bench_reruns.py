@@ -0,0 +1,244 @@
+"""Benchmark de reruns das páginas (1_dash.py e pages/2_forecast.py) com o AppTest do Streamlit, sem navegador.
+
+Cada cenário abre a página e repete interações roteirizadas nos widgets (slider_N/select_N de cada seção do
+dashboard; horizonte, câmbio e preço do forecast). Cada interação é um `AppTest.run()` do script inteiro: o
+tempo de parede medido é o do rerun da página (`pagina_s`). O tempo de cada seção vem dos spans que o próprio
+dashboard registra em `metricas()` (carga/filtro/agregacao/figura/serializacao/total por seção, ver
+utils/instrumentacao.py), lidos antes e depois de cada rerun. Numa segunda passada com tracemalloc é medido o
+pico de memória alocada. O resultado é gravado em JSON para acompanhar a tendência entre commits, e o processo
+sai com código 1 se algum limite for ultrapassado.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_reruns --repeticoes 3 --saida benchmarks/resultados/reruns.json
+    python -m benchmarks.bench_reruns --referencia benchmarks/resultados/reruns.json --tolerancia 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from utils.dados import metricas
+from utils.instrumentacao import ETAPAS
+from utils.registro import invalidar
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TIMEOUT = 300                # limite do AppTest por rerun (s)
+
+# limites absolutos por rerun da página: acima disso o benchmark falha
+LIMITE_SEGUNDOS = 15.0
+LIMITE_PICO_MB = 400.0
+
+
+# página -> [(seção do widget, interação, ação)]; cada ação recebe o AppTest e a repetição (alterna os
+# valores para que reruns seguidos não sejam idênticos)
+CENARIOS = {
+    "1_dash.py": [
+        ("kpis", "slider_1", lambda at, i: at.slider(key="slider_1").set_value((2005 + i % 2, 2020))),
+        ("kpis", "select_1", lambda at, i: at.selectbox(key="select_1").select_index(i % 2)),
+        ("cambio", "slider_2", lambda at, i: at.slider(key="slider_2").set_value((2005 + i % 2, 2020))),
+        ("cambio", "select_2", lambda at, i: at.selectbox(key="select_2").select_index(i % 2)),
+        ("oferta", "slider_3", lambda at, i: at.slider(key="slider_3").set_value((2005 + i % 2, 2020))),
+        ("oferta", "select_3", lambda at, i: at.selectbox(key="select_3").select_index(i % 2)),
+        ("demanda", "slider_4", lambda at, i: at.slider(key="slider_4").set_value((2005 + i % 2, 2020))),
+        ("demanda", "select_4", lambda at, i: at.selectbox(key="select_4").select_index(i % 2)),
+    ],
+    "pages/2_forecast.py": [
+        ("forecast", "horizonte", lambda at, i: at.slider[0].set_value(24 + i % 2)),
+        ("forecast", "cambio", lambda at, i: at.number_input[0].set_value(5.5 + 0.1 * (i % 2))),
+        ("forecast", "preco", lambda at, i: at.selectbox[0].select_index(i % 2)),
+    ],
+}
+
+
+def limpar_caches():
+    """Volta ao estado de um processo recém-iniciado (registro de datasets e caches do Streamlit vazios)."""
+
+    invalidar()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def _acumulado():
+    # (seção, etapa) -> (execuções, tempo total) dos spans registrados pelas páginas até agora
+    return {(s["secao"], s["etapa"]): (s["execucoes"], s["total_s"]) for s in metricas().spans()}
+
+
+def _rerun(executar, memoria):
+    """Executa um rerun; devolve o AppTest, o tempo da página, o pico de memória, os erros e os spans do rerun."""
+
+    antes = _acumulado()
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    at = executar()
+    segundos = time.perf_counter() - inicio
+    pico_mb = None
+    if memoria:
+        pico_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    erros = [str(e.value) for e in at.exception]
+
+    # spans executados neste rerun: diferença dos acumulados (seção -> etapa -> s)
+    spans = {}
+    for (secao, etapa), (execucoes, total) in _acumulado().items():
+        execucoes_antes, total_antes = antes.get((secao, etapa), (0, 0.0))
+        if execucoes > execucoes_antes:
+            spans.setdefault(secao, {})[etapa] = total - total_antes
+    return at, segundos, pico_mb, erros, spans
+
+
+def passada(pagina, repeticoes, memoria):
+    """Abre a página a frio e executa todas as interações da página `repeticoes` vezes; devolve os reruns."""
+
+    limpar_caches()
+    at = AppTest.from_file(os.path.join(RAIZ, pagina), default_timeout=TIMEOUT)
+    at, segundos, pico_mb, erros, spans = _rerun(at.run, memoria)
+    reruns = [{"pagina": pagina, "secao": "carga", "interacao": "inicial", "repeticao": 0,
+               "pagina_s": segundos, "pico_mb": pico_mb, "erros": erros, "spans": spans}]
+
+    for i in range(repeticoes):
+        for secao, interacao, acao in CENARIOS[pagina]:
+            at, segundos, pico_mb, erros, spans = _rerun(lambda: acao(at, i).run(), memoria)
+            reruns.append({"pagina": pagina, "secao": secao, "interacao": interacao, "repeticao": i,
+                           "pagina_s": segundos, "pico_mb": pico_mb, "erros": erros, "spans": spans})
+    return reruns
+
+
+def medir(pagina, repeticoes):
+    """Tempo numa passada sem tracemalloc (que distorce o tempo) e pico de memória numa segunda passada."""
+
+    reruns = passada(pagina, repeticoes, memoria=False)
+    for rerun, com_memoria in zip(reruns, passada(pagina, repeticoes, memoria=True)):
+        rerun["pico_mb"] = com_memoria["pico_mb"]
+    return reruns
+
+
+def _mediana(valores):
+    valores = [v for v in valores if v is not None]
+    return statistics.median(valores) if valores else None
+
+
+def resumir(reruns):
+    """Agrega os reruns por (página, seção do widget alterado).
+
+    `pagina_*` é o rerun da página inteira; `secao_s` e `etapas` são os spans da própria seção (mediana por
+    etapa), None nas páginas sem instrumentação (forecast) e na carga inicial.
+    """
+
+    grupos = {}
+    for rerun in reruns:
+        grupos.setdefault((rerun["pagina"], rerun["secao"]), []).append(rerun)
+
+    secoes = []
+    for (pagina, secao), itens in grupos.items():
+        proprios = [r["spans"].get(secao, {}) for r in itens]
+        etapas = {etapa: _mediana(p.get(etapa) for p in proprios) for etapa in ETAPAS}
+        secoes.append({
+            "pagina": pagina,
+            "secao": secao,
+            "reruns": len(itens),
+            "pagina_mediana_s": statistics.median(r["pagina_s"] for r in itens),
+            "pagina_max_s": max(r["pagina_s"] for r in itens),
+            "secao_s": etapas.pop("total"),
+            "etapas": {etapa: valor for etapa, valor in etapas.items() if valor is not None},
+            "pico_mb": max(r["pico_mb"] for r in itens),
+        })
+    return secoes
+
+
+def verificar(reruns, secoes, referencia, tolerancia):
+    """Lista de violações: erros na página, limites absolutos e regressões contra um resultado anterior."""
+
+    falhas = []
+    for r in reruns:
+        nome = f"{r['pagina']} {r['secao']}/{r['interacao']} #{r['repeticao']}"
+        if r["erros"]:
+            falhas.append(f"{nome}: exceção {r['erros'][0]!r}")
+        if r["pagina_s"] > LIMITE_SEGUNDOS:
+            falhas.append(f"{nome}: rerun da página em {r['pagina_s']:.2f} s > {LIMITE_SEGUNDOS} s")
+        if r["pico_mb"] > LIMITE_PICO_MB:
+            falhas.append(f"{nome}: pico {r['pico_mb']:.1f} MB > {LIMITE_PICO_MB} MB")
+
+    if referencia:
+        anteriores = {(s["pagina"], s["secao"]): s for s in referencia["secoes"]}
+        for s in secoes:
+            anterior = anteriores.get((s["pagina"], s["secao"]))
+            if anterior is None:
+                continue
+            for campo in ("pagina_mediana_s", "secao_s", "pico_mb"):
+                if s.get(campo) is None or anterior.get(campo) is None:
+                    continue  # campo ausente (página sem spans ou referência de versão anterior)
+                limite = anterior[campo] * (1 + tolerancia)
+                if s[campo] > limite:
+                    falhas.append(f"{s['pagina']} {s['secao']}: {campo} {s[campo]:.3f} > {limite:.3f} "
+                                  f"(referência {anterior[campo]:.3f} + {tolerancia:.0%})")
+    return falhas
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paginas", nargs="+", default=list(CENARIOS), choices=list(CENARIOS))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", help="arquivo JSON com o resultado")
+    parser.add_argument("--referencia", help="resultado anterior (JSON) para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="piora máxima aceita contra a referência (0.5 = +50%%)")
+    args = parser.parse_args()
+
+    reruns = []
+    for pagina in args.paginas:
+        reruns.extend(medir(pagina, args.repeticoes))
+    secoes = resumir(reruns)
+
+    referencia = None
+    if args.referencia:
+        with open(args.referencia, encoding="utf-8") as arquivo:
+            referencia = json.load(arquivo)
+    falhas = verificar(reruns, secoes, referencia, args.tolerancia)
+
+    print(f"{'página':<22} {'seção':<10} {'reruns':>6} {'página s':>9} {'máx s':>8} {'seção s':>8} {'pico MB':>8}  etapas da seção (s)")
+    for s in secoes:
+        secao_s = f"{s['secao_s']:>8.3f}" if s["secao_s"] is not None else f"{'-':>8}"
+        etapas = ", ".join(f"{etapa} {valor:.3f}" for etapa, valor in s["etapas"].items())
+        print(f"{s['pagina']:<22} {s['secao']:<10} {s['reruns']:>6} {s['pagina_mediana_s']:>9.3f} {s['pagina_max_s']:>8.3f} "
+              f"{secao_s} {s['pico_mb']:>8.1f}  {etapas}")
+
+    if args.saida:
+        os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+        resultado = {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "repeticoes": args.repeticoes,
+            "limites": {"segundos": LIMITE_SEGUNDOS, "pico_mb": LIMITE_PICO_MB},
+            "secoes": secoes,
+            "reruns": reruns,
+            "falhas": falhas,
+        }
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+    for falha in falhas:
+        print(f"❌ {falha}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
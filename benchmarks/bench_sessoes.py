@@ -0,0 +1,300 @@
+"""Teste de carga local: N sessões simultâneas falando o protocolo websocket do Streamlit com o app.
+
+Sobe `streamlit run 1_dash.py` em localhost (ou usa um servidor já rodando, com --url) e abre N clientes
+websocket por nível de concorrência. Cada sessão faz a carga inicial e repete um roteiro realista: mexe
+em slider_N/select_N das quatro seções (rerun só do fragmento, como o navegador) e de vez em quando vai à
+página de forecast, altera horizonte/câmbio/preço e volta. Latência = envio do rerun até o script_finished.
+
+Por nível são reportados p50/p95/p99 da latência, vazão (reruns/s) e a memória residente do servidor.
+Tudo roda offline: nenhuma requisição sai de localhost.
+
+Requer o cliente `websockets`, que não faz parte das dependências do app:
+    pip install -r benchmarks/requirements.txt
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_sessoes --sessoes 1 5 10 20 --duracao 30
+    python -m benchmarks.bench_sessoes --url ws://localhost:8501 --pid 1234 --sessoes 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ROTA_STREAM = "/_stcore/stream"
+ROTA_SAUDE = "/_stcore/health"
+TIMEOUT_RERUN = 120              # espera máxima por um script_finished (s)
+ANOS = (1999, 2025)              # limites dos sliders de período do dashboard
+CHANCE_FORECAST = 0.1            # probabilidade de cada passo ser uma visita à página de forecast
+WIDGETS = ("slider", "selectbox", "number_input")
+
+
+class Sessao:
+    """Cliente websocket de uma sessão: guarda os widgets vistos e o estado enviado a cada rerun, como o navegador."""
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.paginas = {}        # nome da página -> page_script_hash
+        self.widgets = {}        # (página, chave) -> {"tipo", "id", "fragmento", "opcoes"}
+        self.estados = {}        # id do widget -> WidgetState enviado
+        self.pagina = ""
+
+    async def abrir(self):
+        self.ws = await websockets.connect(self.url + ROTA_STREAM, subprotocols=["streamlit"], max_size=None)
+
+    async def fechar(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _chave(self, widget, tipo):
+        # widgets com key terminam o id com ela (ex.: "...-slider_1"); os sem key são identificados pelo tipo
+        sufixo = widget.id.rsplit("-", 1)[-1]
+        return sufixo if sufixo != "None" else tipo
+
+    async def rerun(self, pagina=None, fragmento=""):
+        """Envia um rerun (página inteira ou só o fragmento) e espera o script_finished; devolve (segundos, erros)."""
+
+        if pagina is not None and pagina != self.pagina:
+            self.pagina, self.estados = pagina, {}
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = self.paginas.get(self.pagina, "")
+        msg.rerun_script.page_name = self.pagina
+        msg.rerun_script.fragment_id = fragmento
+        msg.rerun_script.widget_states.widgets.extend(self.estados.values())
+
+        inicio = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        erros = 0
+        while True:
+            recebida = ForwardMsg()
+            recebida.ParseFromString(await asyncio.wait_for(self.ws.recv(), TIMEOUT_RERUN))
+            tipo = recebida.WhichOneof("type")
+
+            if tipo == "navigation":
+                self.paginas = {p.url_pathname: p.page_script_hash for p in recebida.navigation.app_pages}
+            elif tipo == "delta" and recebida.delta.WhichOneof("type") == "new_element":
+                elemento = recebida.delta.new_element
+                tipo_elemento = elemento.WhichOneof("type")
+                if tipo_elemento == "exception":
+                    erros += 1
+                elif tipo_elemento in WIDGETS:
+                    widget = getattr(elemento, tipo_elemento)
+                    self.widgets[(self.pagina, self._chave(widget, tipo_elemento))] = {
+                        "tipo": tipo_elemento,
+                        "id": widget.id,
+                        "fragmento": recebida.delta.fragment_id,
+                        "opcoes": list(widget.options) if tipo_elemento == "selectbox" else None,
+                    }
+            elif tipo == "script_finished":
+                if recebida.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    erros += 1
+                if recebida.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - inicio, erros
+
+    async def alterar(self, chave, valor):
+        """Altera um widget da página atual e reexecuta seu fragmento (ou a página, fora de fragmentos)."""
+
+        widget = self.widgets[(self.pagina, chave)]
+        estado = self.estados.setdefault(widget["id"], WidgetState(id=widget["id"]))
+        if widget["tipo"] == "slider":
+            estado.double_array_value.ClearField("data")
+            estado.double_array_value.data.extend(valor if isinstance(valor, (list, tuple)) else [valor])
+        elif widget["tipo"] == "selectbox":
+            estado.string_value = widget["opcoes"][valor]
+        else:
+            estado.double_value = valor
+        return await self.rerun(fragmento=widget["fragmento"])
+
+
+def passo_dashboard(rng):
+    """Sorteia uma interação do dashboard: período (slider_N) ou preço (select_N) de uma das quatro seções."""
+
+    secao = rng.randint(1, 4)
+    if rng.random() < 0.6:
+        inicio = rng.randint(ANOS[0], ANOS[1] - 1)
+        return f"slider_{secao}", (float(inicio), float(rng.randint(inicio + 1, ANOS[1])))
+    return f"select_{secao}", rng.randint(0, 5)
+
+
+def passos_forecast(rng):
+    """Interações da página de forecast: horizonte (meses), câmbio esperado e preço previsto."""
+
+    return [
+        ("slider", float(rng.randint(1, 48))),
+        ("number_input", round(rng.uniform(4.0, 7.0), 1)),
+        ("selectbox", rng.randint(0, 5)),
+    ]
+
+
+async def usuario(url, semente, fim, pausa, latencias, contagem):
+    """Uma sessão: carga inicial e interações até `fim` (monotonic), com pausa aleatória entre elas."""
+
+    rng = random.Random(semente)
+    sessao = Sessao(url)
+    try:
+        await sessao.abrir()
+        segundos, erros = await sessao.rerun(pagina="")
+        latencias.append(segundos)
+        contagem["erros"] += erros
+
+        while time.monotonic() < fim:
+            await asyncio.sleep(rng.uniform(0, 2 * pausa))
+            if rng.random() < CHANCE_FORECAST and "forecast" in sessao.paginas:
+                resultados = [await sessao.rerun(pagina="forecast")]
+                resultados += [await sessao.alterar(chave, valor) for chave, valor in passos_forecast(rng)]
+                resultados.append(await sessao.rerun(pagina=""))
+            else:
+                resultados = [await sessao.alterar(*passo_dashboard(rng))]
+            for segundos, erros in resultados:
+                latencias.append(segundos)
+                contagem["erros"] += erros
+    except (OSError, asyncio.TimeoutError, websockets.WebSocketException, KeyError) as erro:
+        contagem["falhas"] += 1
+        contagem["ultima_falha"] = repr(erro)
+    finally:
+        await sessao.fechar()
+
+
+async def aquecer(url):
+    """Carrega o dashboard e o forecast uma vez (dados, imports e cache de figuras) antes da medição."""
+
+    sessao = Sessao(url)
+    try:
+        await sessao.abrir()
+        await sessao.rerun(pagina="")
+        await sessao.rerun(pagina="forecast")
+    finally:
+        await sessao.fechar()
+
+
+def memoria_residente(pid):
+    """VmRSS (bytes) do processo, lida de /proc (None onde não existe)."""
+
+    try:
+        with open(f"/proc/{pid}/status") as arquivo:
+            for linha in arquivo:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def amostrar_memoria(pid, amostras, intervalo=0.5):
+    while True:
+        rss = memoria_residente(pid) if pid else None
+        if rss is not None:
+            amostras.append(rss)
+        await asyncio.sleep(intervalo)
+
+
+async def nivel(url, pid, sessoes, duracao, pausa, semente):
+    """Roda `sessoes` usuários simultâneos por `duracao` segundos e resume latência, vazão e memória."""
+
+    latencias, contagem, amostras = [], {"erros": 0, "falhas": 0, "ultima_falha": None}, []
+    rss_antes = memoria_residente(pid) if pid else None
+    amostrador = asyncio.create_task(amostrar_memoria(pid, amostras))
+
+    inicio = time.monotonic()
+    fim = inicio + duracao
+    await asyncio.gather(*(usuario(url, semente + i, fim, pausa, latencias, contagem) for i in range(sessoes)))
+    decorrido = time.monotonic() - inicio
+    amostrador.cancel()
+
+    ms = np.array(latencias) * 1000
+    rss_max = max(amostras) if amostras else None
+    return {
+        "sessoes": sessoes,
+        "reruns": len(latencias),
+        "erros": contagem["erros"],
+        "falhas": contagem["falhas"],
+        "ultima_falha": contagem["ultima_falha"],
+        "p50_ms": float(np.percentile(ms, 50)) if len(ms) else None,
+        "p95_ms": float(np.percentile(ms, 95)) if len(ms) else None,
+        "p99_ms": float(np.percentile(ms, 99)) if len(ms) else None,
+        "vazao_rps": len(latencias) / decorrido,
+        "rss_antes_mb": rss_antes / 1024 ** 2 if rss_antes else None,
+        "rss_max_mb": rss_max / 1024 ** 2 if rss_max else None,
+        "mb_por_sessao": (rss_max - rss_antes) / 1024 ** 2 / sessoes if rss_max and rss_antes else None,
+    }
+
+
+def iniciar_servidor(porta):
+    """Sobe o app em localhost, sem telemetria nem file watcher, e espera o health check responder."""
+
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(RAIZ, "1_dash.py"),
+         "--server.headless", "true", "--server.port", str(porta), "--server.address", "127.0.0.1",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(120):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}{ROTA_SAUDE}", timeout=1):
+                return processo
+        except OSError:
+            if processo.poll() is not None:
+                break
+            time.sleep(0.5)
+    processo.kill()
+    raise RuntimeError(f"❌ O servidor Streamlit não respondeu na porta {porta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 5, 10, 20], help="níveis de concorrência")
+    parser.add_argument("--duracao", type=float, default=30, help="duração de cada nível (s)")
+    parser.add_argument("--pausa", type=float, default=0.5, help="pausa média entre interações de uma sessão (s)")
+    parser.add_argument("--porta", type=int, default=8599)
+    parser.add_argument("--url", help="servidor já rodando (ex.: ws://localhost:8501); por padrão sobe um local")
+    parser.add_argument("--pid", type=int, help="pid do servidor informado em --url, para medir a memória")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON com o resultado")
+    args = parser.parse_args()
+
+    processo = None
+    if args.url:
+        url, pid = args.url.rstrip("/"), args.pid
+    else:
+        processo = iniciar_servidor(args.porta)
+        url, pid = f"ws://127.0.0.1:{args.porta}", processo.pid
+
+    try:
+        asyncio.run(aquecer(url))
+        niveis = [asyncio.run(nivel(url, pid, n, args.duracao, args.pausa, args.semente)) for n in args.sessoes]
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait(timeout=30)
+
+    formatar = lambda valor, fmt: format(valor, fmt) if valor is not None else "—"
+    print(f"{'sessões':>7} {'reruns':>7} {'erros':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'reruns/s':>9} {'RSS MB':>8} {'MB/sessão':>10}")
+    for n in niveis:
+        print(f"{n['sessoes']:>7} {n['reruns']:>7} {n['erros'] + n['falhas']:>6} {formatar(n['p50_ms'], '8.1f')} "
+              f"{formatar(n['p95_ms'], '8.1f')} {formatar(n['p99_ms'], '8.1f')} {n['vazao_rps']:>9.2f} "
+              f"{formatar(n['rss_max_mb'], '8.1f')} {formatar(n['mb_por_sessao'], '10.2f')}")
+        if n["ultima_falha"]:
+            print(f"   ⚠️ {n['falhas']} sessões falharam; última: {n['ultima_falha']}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"duracao": args.duracao, "pausa": args.pausa, "niveis": niveis}, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
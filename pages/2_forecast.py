@@ -1,12 +1,14 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from datetime import datetime
-import statsmodels.api as sm
 import numpy as np
 import os
 
+from utils.correlacao import regressao_linear
+from utils.dados import carregar_saldo
+from utils.exportacao import botoes_download
+
 # ---------------------- config streamlit ----------------------------------------
 
 st.set_page_config(page_title = "Forecast da Soja", layout = "wide")
@@ -21,45 +23,11 @@ st.sidebar.markdown("Desenvolvido por [Leonardo Martini](https://www.linkedin.co
 # Obtendo o diretório base do script atual
 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "database"))
 
-# Construindo os caminhos completos para os arquivos
-path_soja_mensal = os.path.join(base_dir, "soja_mensal.csv")
-path_soja_anual = os.path.join(base_dir, "soja_anual.csv")
-path_variacao_cambial = os.path.join(base_dir, "variacao_cambial.csv")
-
-# Verificando se os arquivos existem antes de carregar
-if not os.path.exists(path_soja_mensal):
-    raise FileNotFoundError(f"❌ Arquivo não encontrado: {path_soja_mensal}")
-if not os.path.exists(path_soja_anual):
-    raise FileNotFoundError(f"❌ Arquivo não encontrado: {path_soja_anual}")
-if not os.path.exists(path_variacao_cambial):
-    raise FileNotFoundError(f"❌ Arquivo não encontrado: {path_variacao_cambial}")
-
-# Carregando os arquivos CSV no pandas
-df = pd.read_csv(path_soja_mensal, index_col=0)
-df_ano = pd.read_csv(path_soja_anual)
-df_dolar = pd.read_csv(path_variacao_cambial, index_col=0)
-
-# 1️⃣ Garantir que a coluna de datas está no formato correto
-df["ano_mes"] = pd.to_datetime(df["ano_mes"])
-df["periodo"] = df["ano_mes"]
-df_ano["periodo"] = pd.to_datetime(df_ano["periodo"], format="%Y")
-df_dolar["periodo"] = pd.to_datetime(df_dolar["datetime"])
-df_dolar = df_dolar.rename(columns={"close": "cambio_usdbrl"})
-
-# 2️⃣ Criar `df_saldo` com os dados mensais
-df_saldo = df[(df["ano"] >= 2000) & (df["ano"] <= 2024)].copy()
-df_saldo["periodo"] = pd.to_datetime(df_saldo["ano_mes"])
-df_saldo.loc[:, "saldo_estoque"] = df_saldo["estoque"].diff()
-df_saldo = df_saldo.fillna(0)
-
-# 3️⃣ Converter `df_dolar` para dados mensais pegando o último valor de cada mês
-df_dolar_mensal = df_dolar.resample("M", on="periodo").last().reset_index()
-
-# 4️⃣ Ajustar `periodo` para o primeiro dia do mês (01)
-df_dolar_mensal["periodo"] = df_dolar_mensal["periodo"].dt.to_period("M").dt.to_timestamp()
-
-# 4️⃣ Mesclar `df_saldo` (mensal) com `df_dolar_mensal` (câmbio mensal)
-df_saldo = df_saldo.merge(df_dolar_mensal[["periodo", "cambio_usdbrl"]], on="periodo", how="left")
+# `df_saldo` mensal (soja_mensal1, 2000-2024) com `periodo`, `saldo_estoque` e o câmbio do fim de cada mês
+# (`cambio_usdbrl`): vem do registro de datasets, compartilhado com o dashboard (sem recarregar entre páginas).
+# Os preços do soja_mensal1 têm precisão cheia (o antigo soja_mensal.csv vinha arredondado e de outra extração),
+# então a previsão e os limites podem diferir do cálculo antigo na segunda casa decimal
+df_saldo = carregar_saldo(pasta=base_dir)
 
 
 # ------------------------------------ Interface do Usuário ----------------------------------------
@@ -105,21 +73,12 @@ with st.container(border=True):
     df_modelo = df_modelo[["periodo", coluna_preco, "cambio_usdbrl"]].dropna()
 
     # **3️⃣ Construção do Modelo de Machine Learning (Regressão OLS Simples)**
-    X = df_modelo[["cambio_usdbrl"]]
-    y = df_modelo[[coluna_preco]]
-    X, y = X.align(y, join="inner", axis=0)
-    X = sm.add_constant(X)
-    model = sm.OLS(y, X).fit()
-    residuos = model.resid  # Diferença entre valores reais e previstos
-    desvio_padrao = np.std(residuos)
+    # coeficientes em forma fechada (médias e somas centralizadas), sem statsmodels
+    inclinacao, intercepto, r2, residuos = regressao_linear(df_modelo["cambio_usdbrl"], df_modelo[coluna_preco])
+    desvio_padrao = np.std(residuos)  # residuos: diferença entre valores reais e previstos
 
     # Previsão do Preço Futuro 
-    dados_previstos = pd.DataFrame({
-        "const": 1,
-        "cambio_usdbrl": cambio_previsto
-    }, index=[df_modelo["periodo"].max() + pd.DateOffset(months=periodo_previsto)])
-
-    previsao = model.predict(dados_previstos)[0]
+    previsao = intercepto + inclinacao * cambio_previsto
 
     df_futuro = df_modelo.copy()
     df_futuro["periodo"] = pd.to_datetime(df_futuro["periodo"])
@@ -212,13 +171,13 @@ with st.container(border=True):
         )
     )
 
-    st.plotly_chart(fig_forecast, use_container_width=True)
+    st.plotly_chart(fig_forecast, width="stretch")
 
     # 🔍 Exibir estatísticas do modelo
 
     col1, col2, col3, col4, col5 = st.columns([0.25, 0.25, 0.2, 0.2, 0.2])
     with col1:
-        st.metric(label="Coeficiente de Determinação (R²)", value=f"{model.rsquared:.4f}")
+        st.metric(label="Coeficiente de Determinação (R²)", value=f"{r2:.4f}")
     
     with col2:
         st.metric(label="Desvio Padrão dos Resíduos", value=f"{desvio_padrao:.2f}")
@@ -230,4 +189,8 @@ with st.container(border=True):
         st.metric(label="Previsão", value=f"{previsao:.2f}")
 
     with col5:
-        st.metric(label="Limite inferior", value=f"{limite_inferior:.2f}")
\ No newline at end of file
+        st.metric(label="Limite inferior", value=f"{limite_inferior:.2f}")
+
+    # histórico usado no modelo + ponto previsto, gerado só no clique
+    with st.popover("⬇️ Baixar dados da previsão"):
+        botoes_download(df_futuro, f"forecast_{coluna_preco.split('_')[0]}_{periodo_previsto}m", "forecast", (coluna_preco, periodo_previsto, cambio_previsto))
\ No newline at end of file
@@ -0,0 +1,87 @@
+import argparse
+import glob
+import json
+import os
+from datetime import datetime
+
+import plotly.offline
+from streamlit.testing.v1 import AppTest
+
+from utils.cache_planilha import hash_arquivo
+from utils.dados import versao_dados
+from utils.snapshot import carregar_tema, pagina_html
+
+# ------------------------------------ instantâneo estático do dashboard (seleções padrão) ------------------------------------
+
+# o Streamlit serve a pasta static/ ao lado do 1_dash.py em /app/static/ (server.enableStaticServing). O instantâneo é
+# uma página estática à parte (/app/static/dashboard.html), não substitui o painel servido na raiz; o ETL regera
+# o arquivo ao fim de cada execução
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+PAGINA = os.path.join(RAIZ, "1_dash.py")
+SAIDA = os.path.join(RAIZ, "static")
+TEMA = os.path.join(RAIZ, ".streamlit", "config.toml")
+TIMEOUT = 300
+
+# arquivos que mudam o HTML gerado mesmo com os mesmos dados: a página, o tema e todos os módulos de utils/
+# (a página importa vários deles, além do próprio conversor)
+FONTES = (PAGINA, TEMA, *sorted(glob.glob(os.path.join(RAIZ, "utils", "*.py"))))
+
+# a partir de /app/static/dashboard.html o painel interativo fica dois níveis acima (respeita server.baseUrlPath)
+DESTINO = "../../"
+
+
+def versao_atual():
+    """sha256 dos datasets e das FONTES (só o conteúdo: mtime muda a cada checkout/cópia)."""
+
+    fontes = [hash_arquivo(caminho) if os.path.exists(caminho) else None for caminho in FONTES]
+    return [assinatura[2] for assinatura in versao_dados()] + fontes
+
+
+def atualizado(saida):
+    """True se o instantâneo em `saida` foi gerado a partir dos dados e das FONTES atuais."""
+
+    try:
+        with open(os.path.join(saida, "dashboard.json"), encoding="utf-8") as arquivo:
+            return json.load(arquivo)["versao_dados"] == versao_atual()
+    except (FileNotFoundError, KeyError, ValueError):
+        return False
+
+
+def gerar(saida=SAIDA):
+    """Executa o 1_dash.py sem interação (seleções padrão) e grava dashboard.html, dashboard.json e plotly.min.js."""
+
+    at = AppTest.from_file(PAGINA, default_timeout=TIMEOUT).run()
+    if at.exception:
+        raise RuntimeError(f"❌ Falha ao executar {PAGINA}: {at.exception[0].value}")
+
+    gerado_em = datetime.now().strftime("%d/%m/%Y %H:%M")
+    tema = carregar_tema(TEMA)
+    html, dados = pagina_html(at, "Dinâmica da Soja", tema, gerado_em, DESTINO, "plotly.min.js")
+
+    os.makedirs(saida, exist_ok=True)
+    plotly_js = os.path.join(saida, "plotly.min.js")
+    if not os.path.exists(plotly_js):
+        with open(plotly_js, "w", encoding="utf-8") as arquivo:
+            arquivo.write(plotly.offline.get_plotlyjs())
+
+    # grava em temporários e troca no fim: quem está servindo a pasta nunca vê arquivo pela metade
+    dados = {"gerado_em": gerado_em, "versao_dados": versao_atual(), **dados}
+    for nome, conteudo in (("dashboard.json", json.dumps(dados, ensure_ascii=False)), ("dashboard.html", html)):
+        destino = os.path.join(saida, nome)
+        with open(f"{destino}.tmp", "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(f"{destino}.tmp", destino)
+
+    print(f"✅ Instantâneo gravado em {saida} ({len(dados['graficos'])} gráficos, {len(dados['metricas'])} métricas)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pré-renderiza o dashboard com as seleções padrão em HTML/JSON estático.")
+    parser.add_argument("--saida", default=SAIDA, help="pasta de saída (padrão: static/, servida em /app/static/)")
+    parser.add_argument("--forcar", action="store_true", help="regera mesmo que dados e fontes não tenham mudado")
+    args = parser.parse_args()
+
+    if not args.forcar and atualizado(args.saida):
+        print("Instantâneo já está atualizado (mesmos dados e fontes).")
+    else:
+        gerar(args.saida)
@@ -1,108 +1,24 @@
+import argparse
+import os
+
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 
+from utils.alinhamento import alinhar_mensal
+from utils.armazenamento import salvar_arrow
+from utils.cache_planilha import carregar_planilha
+from utils.juncao import inicio_mes, juntar_mensal
+from utils.incremental import aplicar_patch, carregar_snapshot, chaves_alteradas, proximas_datas, salvar_snapshot
+from utils.piramide import construir_piramide
+
 # Caminho do arquivo (ajuste conforme necessário)
 file_path = "database/complexo-soja.xlsx"
-df_balanco = pd.read_excel(file_path, sheet_name="BALANÇO ANUAL").iloc[:, :-2]
-df_processamento = pd.read_excel(file_path, sheet_name="PROCESSAMENTO").iloc[:, :-2]
-df_exportacao = pd.read_excel(file_path, sheet_name="EXPORTAÇÃO TOTAL").iloc[:, :-2]
-df_importacao = pd.read_excel(file_path, sheet_name="IMPORTAÇÃO").iloc[:, :-2]
-df_estoques = pd.read_excel(file_path, sheet_name="ESTOQUES").iloc[:, :-2]
-df_precos = pd.read_excel(file_path, sheet_name="PREÇOS").iloc[:, :-2]
-df_compra = pd.read_excel(file_path, sheet_name="COMPRAS").iloc[:, :-2]
 dolar_path = "database/variacao_cambial.csv"
-df_dolar = pd.read_csv(dolar_path, index_col=0)
-
-
-# tratando df_balanco para salvar como soja_anual.csv
-df_balanco = df_balanco[df_balanco['PRODUTO'] == '1. Grão']
-df_balanco = df_balanco.pivot(index="DATA", columns="DISCRIMINAÇÃO", values="VALOR")
-df_balanco = df_balanco.reset_index()
-df_balanco.columns.name = None
-df_balanco["DATA"] = pd.to_datetime(df_balanco["DATA"]).dt.year
-df_balanco = df_balanco.rename(columns={"DATA": "periodo"})
-df_balanco = df_balanco.rename(columns={"2.1.1. - Estoque Inicial": "estoque_inicial"})
-df_balanco = df_balanco.rename(columns={"2.1.2. - Produção": "producao"})
-df_balanco = df_balanco.rename(columns={"2.1.3. - Importação": "importacao"})
-df_balanco = df_balanco.rename(columns={"2.1.4. - Sementes/Outros": "Sementes/Outros"})
-df_balanco = df_balanco.rename(columns={"2.1.5. - Exportação": "exportacao"})
-df_balanco = df_balanco.rename(columns={"2.1.6. - Processamento": "processamento"})
-df_balanco = df_balanco.rename(columns={"2.1.7. - Estoque Final": "estoque_final"})
-df_balanco = df_balanco.round(2)
-
-df_dolar_ano = df_dolar.rename(columns={"datetime": "ano_mes"})
-df_dolar_ano = df_dolar_ano.rename(columns={"close": "usdbrl"})
-df_dolar_ano["ano_mes"] = pd.to_datetime(df_dolar_ano["ano_mes"])
-df_dolar_ano["ano"] = df_dolar_ano["ano_mes"].dt.year
-df_dolar_ano = df_dolar_ano.sort_values(["ano", "ano_mes"], ascending=[True, True])
-df_dolar_ano = df_dolar_ano.groupby("ano").last().reset_index()
-df_dolar_ano = df_dolar_ano[["ano", "usdbrl"]]
-df_dolar_ano = df_dolar_ano.rename(columns={"ano": "periodo"})
-
-df_balanco = pd.merge(df_balanco, df_dolar_ano, on="periodo", how="left")
-
-# exportando para csv
-df_balanco.to_csv("database/soja_anual1.csv", index=False, encoding="utf-8")
-
-# tratando df_estoques contendo saldo para salvar como soja_mensal.csv
-df_estoques = df_estoques.iloc[:, :-2]
-df_estoques = df_estoques.rename(columns={"DATA": "ano_mes"})
-df_estoques = df_estoques.rename(columns={"SOJA": "estoque"})
-df_estoques = df_estoques.sort_values(by="ano_mes")
-df_estoques["saldo"] = df_estoques["estoque"].diff()
-df_estoques = df_estoques.sort_values(by="ano_mes", ascending=False)
-df_estoques = df_estoques.fillna(0)
-
-# tratando df_exportacao para salvar como soja_mensal.csv
-df_exportacao = df_exportacao.iloc[:, :-2]
-df_exportacao = df_exportacao.rename(columns={"DATA": "ano_mes"})
-df_exportacao = df_exportacao.rename(columns={"SOJA": "exportacao"})
-
-# tratando df_processamento para salvar como soja_mensal.csv
-df_processamento = df_processamento.rename(columns={"DATA": "ano_mes"})
-df_processamento = df_processamento.rename(columns={"VALOR": "processamento"})
-
-# tratando df_compra para salvar como soja_mensal.csv
-df_compra = df_compra.rename(columns={"DATA": "ano_mes"})
-df_compra = df_compra.rename(columns={"COMPRAS": "compra_liquida"})
-
-# tratando df_importacao para salvar como soja_mensal.csv
-df_importacao = df_importacao.iloc[:, :-2]
-df_importacao = df_importacao.rename(columns={"DATA": "ano_mes"})
-df_importacao = df_importacao.rename(columns={"SOJA": "importacao"})
-
-# tratando df_precos para salvar como soja_mensal.csv
-df_precos = df_precos[df_precos['produto'] == '1 - Grão']
-df_precos = df_precos.iloc[:, 4:]
-df_precos = df_precos[['data', 'discriminacao', 'valor']]
-df_precos = df_precos.pivot(index="data", columns="discriminacao", values="valor")
-df_precos = df_precos.loc[:, ~df_precos.columns.isna()]
-df_precos = df_precos.reset_index()
-df_precos.columns.name = None
-df_precos = df_precos.drop(columns=["1.2 - Prêmio (US$/t)"])
-df_precos = df_precos.rename(columns={"data": "ano_mes"})
-df_precos = df_precos.rename(columns={"1.1 - Chicago - CBOT (US$/t)": "chicago_cbot_u$/t"})
-df_precos = df_precos.rename(columns={"1.3 - FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t"})
-df_precos = df_precos.rename(columns={"1.4 - Mercado Interno - Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca"})
-df_precos = df_precos.rename(columns={"1.5 - Mercado Interno - Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca"})
-df_precos = df_precos.rename(columns={"1.6 - Mercado Interno - Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca"})
-df_precos = df_precos.rename(columns={"1.7 - Mercado Interno - Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca"})
-
-# criando dataframe soja_mensal
-soja_mensal = pd.DataFrame()
-soja_mensal = pd.merge(df_estoques, df_exportacao, on="ano_mes", how="outer")
-soja_mensal = pd.merge(soja_mensal, df_processamento, on="ano_mes", how="outer")
-soja_mensal = pd.merge(soja_mensal, df_compra, on="ano_mes", how="outer")
-soja_mensal = pd.merge(soja_mensal, df_importacao, on="ano_mes", how="outer")
-soja_mensal = pd.merge(soja_mensal, df_precos, on="ano_mes", how="outer")
-soja_mensal["ano"] = pd.to_datetime(soja_mensal["ano_mes"]).dt.year
-soja_mensal["mes"] = pd.to_datetime(soja_mensal["ano_mes"]).dt.month
-
-#adicionando producao em soja_mensal
+anual_path = "database/soja_anual1.csv"
+mensal_path = "database/soja_mensal1.csv"
+
+# todas as abas são lidas em uma única passada (ou direto do cache parquet, se a planilha não mudou)
+abas = ["BALANÇO ANUAL", "PROCESSAMENTO", "EXPORTAÇÃO TOTAL", "IMPORTAÇÃO", "ESTOQUES", "PREÇOS", "COMPRAS"]
 
 pesos_mensais = {
     1: 0.10,  # Janeiro
@@ -119,36 +35,297 @@ pesos_mensais = {
     12: 0  # Dezembro
 }
 
-producao = df_balanco[['periodo', 'producao']].rename(columns={"periodo": "ano"})
-soja_mensal = pd.merge(soja_mensal, producao, on="ano", how="outer")
-soja_mensal['producao'] = soja_mensal['producao'] * soja_mensal['mes'].map(pesos_mensais)
+colunas_anual = ['periodo','estoque_inicial','producao','importacao','Sementes/Outros','exportacao','processamento','estoque_final']
+colunas_mensal = ['mes','ano','ano_mes','estoque','exportacao','processamento','compra_liquida','importacao','saldo','producao','chicago_cbot_u$/t','fob_porto_paranagua_u$/t','maringa_r$/saca','mogiana_r$/saca','passofundo_r$/saca','rondonopolis_r$/saca','usdbrl']
+
+# chaves de cada fonte normalizada (usadas para comparar com o snapshot anterior)
+chaves_fontes = {
+    "balanco": ["DATA", "DISCRIMINAÇÃO"],
+    "estoques": ["ano_mes"],
+    "exportacao": ["ano_mes"],
+    "processamento": ["ano_mes"],
+    "compra": ["ano_mes"],
+    "importacao": ["ano_mes"],
+    "precos": ["data", "discriminacao"],
+    "dolar": ["ano_mes"],
+}
+
+
+
+
+# -------------------------------------------- tratamento das fontes --------------------------------------------
+
+def tratar_fontes(planilhas, df_dolar):
+    """Normaliza as abas da planilha e o câmbio diário, sem nenhum cálculo derivado."""
+
+    # balanço anual (formato longo, apenas grão)
+    df_balanco = planilhas["BALANÇO ANUAL"].iloc[:, :-2]
+    df_balanco = df_balanco[df_balanco['PRODUTO'] == '1. Grão']
+    df_balanco = df_balanco[["DATA", "DISCRIMINAÇÃO", "VALOR"]]
+
+    # tratando df_estoques
+    df_estoques = planilhas["ESTOQUES"].iloc[:, :-2].iloc[:, :-2]
+    df_estoques = df_estoques.rename(columns={"DATA": "ano_mes"})
+    df_estoques = df_estoques.rename(columns={"SOJA": "estoque"})
+
+    # tratando df_exportacao
+    df_exportacao = planilhas["EXPORTAÇÃO TOTAL"].iloc[:, :-2].iloc[:, :-2]
+    df_exportacao = df_exportacao.rename(columns={"DATA": "ano_mes"})
+    df_exportacao = df_exportacao.rename(columns={"SOJA": "exportacao"})
+
+    # tratando df_processamento
+    df_processamento = planilhas["PROCESSAMENTO"].iloc[:, :-2]
+    df_processamento = df_processamento.rename(columns={"DATA": "ano_mes"})
+    df_processamento = df_processamento.rename(columns={"VALOR": "processamento"})
+
+    # tratando df_compra
+    df_compra = planilhas["COMPRAS"].iloc[:, :-2]
+    df_compra = df_compra.rename(columns={"DATA": "ano_mes"})
+    df_compra = df_compra.rename(columns={"COMPRAS": "compra_liquida"})
+
+    # tratando df_importacao
+    df_importacao = planilhas["IMPORTAÇÃO"].iloc[:, :-2].iloc[:, :-2]
+    df_importacao = df_importacao.rename(columns={"DATA": "ano_mes"})
+    df_importacao = df_importacao.rename(columns={"SOJA": "importacao"})
+
+    # tratando df_precos (formato longo, o pivot fica para o cálculo mensal)
+    df_precos = planilhas["PREÇOS"].iloc[:, :-2]
+    df_precos = df_precos[df_precos['produto'] == '1 - Grão']
+    df_precos = df_precos.iloc[:, 4:]
+    df_precos = df_precos[['data', 'discriminacao', 'valor']]
+    df_precos = df_precos[df_precos['discriminacao'].notna()]
+
+    # tratando df_dolar (série diária)
+    df_dolar = df_dolar.rename(columns={"datetime": "ano_mes"})
+    df_dolar = df_dolar.rename(columns={"close": "usdbrl"})
+    df_dolar["ano_mes"] = pd.to_datetime(df_dolar["ano_mes"])
+    df_dolar = df_dolar[["ano_mes", "usdbrl"]]
+
+    fontes = {
+        "balanco": df_balanco,
+        "estoques": df_estoques,
+        "exportacao": df_exportacao,
+        "processamento": df_processamento,
+        "compra": df_compra,
+        "importacao": df_importacao,
+        "precos": df_precos,
+        "dolar": df_dolar,
+    }
+    return {nome: df_fonte.reset_index(drop=True) for nome, df_fonte in fontes.items()}
+
+
+# -------------------------------------------- soja_anual --------------------------------------------
+
+def calcular_anual(fontes, anos=None):
+    """Monta soja_anual para todos os anos ou apenas para os anos informados."""
+
+    df_balanco = fontes["balanco"]
+    df_dolar_ano = fontes["dolar"].copy()
+    if anos is not None:
+        df_balanco = df_balanco[df_balanco["DATA"].dt.year.isin(anos)]
+        df_dolar_ano = df_dolar_ano[df_dolar_ano["ano_mes"].dt.year.isin(anos)]
+
+    # tratando df_balanco para salvar como soja_anual.csv
+    df_balanco = df_balanco.pivot(index="DATA", columns="DISCRIMINAÇÃO", values="VALOR")
+    df_balanco = df_balanco.reset_index()
+    df_balanco.columns.name = None
+    df_balanco["DATA"] = pd.to_datetime(df_balanco["DATA"]).dt.year
+    df_balanco = df_balanco.rename(columns={"DATA": "periodo"})
+    df_balanco = df_balanco.rename(columns={"2.1.1. - Estoque Inicial": "estoque_inicial"})
+    df_balanco = df_balanco.rename(columns={"2.1.2. - Produção": "producao"})
+    df_balanco = df_balanco.rename(columns={"2.1.3. - Importação": "importacao"})
+    df_balanco = df_balanco.rename(columns={"2.1.4. - Sementes/Outros": "Sementes/Outros"})
+    df_balanco = df_balanco.rename(columns={"2.1.5. - Exportação": "exportacao"})
+    df_balanco = df_balanco.rename(columns={"2.1.6. - Processamento": "processamento"})
+    df_balanco = df_balanco.rename(columns={"2.1.7. - Estoque Final": "estoque_final"})
+    df_balanco = df_balanco.reindex(columns=colunas_anual)
+    df_balanco = df_balanco.round(2)
+
+    df_dolar_ano["ano"] = df_dolar_ano["ano_mes"].dt.year
+    df_dolar_ano = df_dolar_ano.sort_values(["ano", "ano_mes"], ascending=[True, True])
+    df_dolar_ano = df_dolar_ano.groupby("ano").last().reset_index()
+    df_dolar_ano = df_dolar_ano[["ano", "usdbrl"]]
+    df_dolar_ano = df_dolar_ano.rename(columns={"ano": "periodo"})
+
+    df_balanco = pd.merge(df_balanco, df_dolar_ano, on="periodo", how="left")
+    return df_balanco
+
+
+# -------------------------------------------- soja_mensal --------------------------------------------
+
+def calcular_mensal(fontes, meses=None):
+    """Monta soja_mensal para todos os meses ou apenas para os meses (primeiro dia) informados."""
+
+    def filtrar(df_fonte, coluna="ano_mes"):
+        return df_fonte if meses is None else df_fonte[inicio_mes(df_fonte[coluna]).isin(meses)]
+
+    # saldo = diferença do estoque para o mês anterior da série; no modo parcial
+    # entram também os meses imediatamente anteriores aos afetados
+    df_estoques = fontes["estoques"].sort_values(by="ano_mes").reset_index(drop=True)
+    if meses is not None:
+        pos = np.flatnonzero(inicio_mes(df_estoques["ano_mes"]).isin(meses))
+        pos = np.union1d(pos, pos - 1)
+        df_estoques = df_estoques.iloc[pos[pos >= 0]]
+    df_estoques["saldo"] = df_estoques["estoque"].diff()
+    df_estoques = df_estoques.fillna(0)
+    df_estoques = filtrar(df_estoques)
+
+    df_exportacao = filtrar(fontes["exportacao"])
+    df_processamento = filtrar(fontes["processamento"])
+    df_compra = filtrar(fontes["compra"])
+    df_importacao = filtrar(fontes["importacao"])
+
+    # pivot dos preços apenas para os meses necessários
+    df_precos = filtrar(fontes["precos"], "data")
+    df_precos = df_precos.pivot(index="data", columns="discriminacao", values="valor")
+    df_precos = df_precos.reset_index()
+    df_precos.columns.name = None
+    df_precos = df_precos.drop(columns=["1.2 - Prêmio (US$/t)"], errors="ignore")
+    df_precos = df_precos.rename(columns={"data": "ano_mes"})
+    df_precos = df_precos.rename(columns={"1.1 - Chicago - CBOT (US$/t)": "chicago_cbot_u$/t"})
+    df_precos = df_precos.rename(columns={"1.3 - FOB Porto - Paranaguá (US$/t)": "fob_porto_paranagua_u$/t"})
+    df_precos = df_precos.rename(columns={"1.4 - Mercado Interno - Maringá / PR - R$/saca (sem ICMS)": "maringa_r$/saca"})
+    df_precos = df_precos.rename(columns={"1.5 - Mercado Interno - Mogiana / SP - R$/saca (sem ICMS)": "mogiana_r$/saca"})
+    df_precos = df_precos.rename(columns={"1.6 - Mercado Interno - Passo Fundo / RS - R$/saca (sem ICMS)": "passofundo_r$/saca"})
+    df_precos = df_precos.rename(columns={"1.7 - Mercado Interno - Rondonopolis / MT - R$/saca (sem ICMS)": "rondonopolis_r$/saca"})
+
+    # cotação mais próxima do início de cada mês
+    df_dolar = filtrar(fontes["dolar"])
+    df_dolar_proximo = alinhar_mensal(df_dolar, "ano_mes", "usdbrl", politica="inicio")
+
+    # criando dataframe soja_mensal (todas as fontes alinhadas em uma única junção)
+    soja_mensal = juntar_mensal(
+        {
+            "estoques": df_estoques,
+            "exportacao": df_exportacao,
+            "processamento": df_processamento,
+            "compra": df_compra,
+            "importacao": df_importacao,
+            "precos": df_precos,
+        },
+        complementares={"dolar": df_dolar_proximo},
+    )
+    soja_mensal["ano"] = soja_mensal["ano_mes"].dt.year
+    soja_mensal["mes"] = soja_mensal["ano_mes"].dt.month
+
+    #adicionando producao em soja_mensal (distribuída pelos pesos mensais da colheita)
+    producao = fontes["balanco"][fontes["balanco"]["DISCRIMINAÇÃO"] == "2.1.2. - Produção"]
+    producao = pd.Series(producao["VALOR"].round(2).to_numpy(), index=producao["DATA"].dt.year)
+    soja_mensal['producao'] = soja_mensal['ano'].map(producao) * soja_mensal['mes'].map(pesos_mensais)
+
+    # organizando colunas
+    soja_mensal = soja_mensal.reindex(columns=colunas_mensal)
+    return soja_mensal
+
+
+# -------------------------------------------- modo incremental --------------------------------------------
+
+def calcular_impacto(fontes, antigas):
+    """Compara as fontes com o snapshot anterior e retorna (meses, anos) que precisam ser recalculados."""
+
+    alteradas = {nome: chaves_alteradas(fontes[nome], antigas[nome], chaves) for nome, chaves in chaves_fontes.items()}
+
+    # meses alterados diretamente nas abas mensais
+    meses = pd.concat([
+        alteradas["estoques"]["ano_mes"],
+        alteradas["exportacao"]["ano_mes"],
+        alteradas["processamento"]["ano_mes"],
+        alteradas["compra"]["ano_mes"],
+        alteradas["importacao"]["ano_mes"],
+        alteradas["precos"]["data"],
+        alteradas["dolar"]["ano_mes"],
+    ])
+
+    # o saldo do mês seguinte depende do estoque alterado
+    meses = pd.concat([meses, proximas_datas(fontes["estoques"]["ano_mes"], alteradas["estoques"]["ano_mes"]).to_series()])
+
+    # anos afetados: balanço anual e câmbio de fim de ano
+    anos = set(alteradas["balanco"]["DATA"].dt.year) | set(alteradas["dolar"]["ano_mes"].dt.year)
+
+    # a produção mensal é derivada da produção anual: todos os meses dos anos alterados no balanço
+    anos_balanco = set(alteradas["balanco"]["DATA"].dt.year)
+    todos_meses = pd.concat([fontes[nome]["ano_mes"] for nome in ["estoques", "exportacao", "processamento", "compra", "importacao"]] + [fontes["precos"]["data"]])
+    meses = pd.concat([meses, todos_meses[todos_meses.dt.year.isin(anos_balanco)]])
+
+    return pd.DatetimeIndex(inicio_mes(meses.dropna()).unique()).sort_values(), sorted(anos)
+
+
+def salvar_saidas(soja_anual, soja_mensal, df_dolar):
+    # exportando para csv
+    soja_anual.to_csv(anual_path, index=False, encoding="utf-8")
+    soja_mensal.to_csv(mensal_path, index=True, encoding="utf-8")
+
+    # exportando para arrow tipado (lido via memory-map pelas páginas)
+    salvar_arrow(soja_anual, "soja_anual1")
+    salvar_arrow(soja_mensal, "soja_mensal1")
+    salvar_arrow(df_dolar, "variacao_cambial")
+
+    # pirâmide OHLC do câmbio (semana -> mês -> ano) consultada pelo gráfico de candles
+    df_ohlc = df_dolar.assign(datetime=pd.to_datetime(df_dolar["datetime"]))
+    salvar_arrow(construir_piramide(df_ohlc), "variacao_cambial_ohlc")
+
+
+def atualizar_instantaneo():
+    """Regera o instantâneo estático do dashboard (prerender.py) se dados ou fontes mudaram desde o último."""
+
+    # import tardio: o prerender carrega o AppTest e o plotly, que o ETL em si não usa
+    import prerender
+
+    if prerender.atualizado(prerender.SAIDA):
+        print("Instantâneo do dashboard já está atualizado.")
+    else:
+        prerender.gerar()
+
+
+def executar(incremental=False, instantaneo=True):
+    """Executa o ETL completo ou, no modo incremental, recalcula apenas meses e anos cujas fontes mudaram.
+
+    Com `instantaneo`, regera no fim o static/dashboard.html a partir das saídas novas.
+    """
+
+    recalcular_saidas(incremental)
+    if instantaneo:
+        atualizar_instantaneo()
+
+
+def recalcular_saidas(incremental):
+
+    planilhas = carregar_planilha(file_path, abas)
+    df_dolar = pd.read_csv(dolar_path, index_col=0)
+    fontes = tratar_fontes(planilhas, df_dolar)
 
-# adicionando variação cambial
+    antigas = carregar_snapshot(chaves_fontes) if incremental else None
+    saidas_existem = os.path.exists(anual_path) and os.path.exists(mensal_path)
 
-df_dolar = df_dolar.rename(columns={"datetime": "ano_mes"})
-df_dolar = df_dolar.rename(columns={"close": "usdbrl"})
+    if antigas is None or not saidas_existem:
+        if incremental:
+            print("Snapshot anterior não encontrado: executando ETL completo.")
+        salvar_saidas(calcular_anual(fontes), calcular_mensal(fontes), df_dolar)
+        salvar_snapshot(fontes)
+        return
 
-df_dolar["ano_mes"] = pd.to_datetime(df_dolar["ano_mes"])
-soja_mensal["ano_mes"] = pd.to_datetime(soja_mensal["ano_mes"])
+    meses, anos = calcular_impacto(fontes, antigas)
+    if len(meses) == 0 and len(anos) == 0:
+        print("Nenhuma alteração nas fontes: saídas mantidas.")
+        return
 
-df_dolar["ano"] = df_dolar["ano_mes"].dt.year
-df_dolar["mes"] = df_dolar["ano_mes"].dt.month
-df_dolar = df_dolar.sort_values(["ano", "mes", "ano_mes"])
-df_dolar_proximo = (
-    df_dolar.groupby(["ano", "mes"])
-    .apply(lambda x: x.iloc[(x["ano_mes"] - pd.to_datetime(x["ano_mes"].dt.strftime("%Y-%m-01"))).abs().argmin()])
-    .reset_index(drop=True)
-)
+    # patch das saídas existentes apenas com as linhas recalculadas. Nenhum valor de saída é soma de várias linhas
+    # e o CSV guarda o repr de cada float: lido com round_trip, o que é mantido volta bit a bit igual ao ETL completo
+    soja_anual = pd.read_csv(anual_path, float_precision="round_trip")
+    soja_anual = aplicar_patch(soja_anual, calcular_anual(fontes, anos), "periodo", anos)
 
-df_dolar_proximo["ano_mes"] = df_dolar_proximo["ano_mes"].dt.strftime("%Y-%m-01")
-df_dolar_proximo["ano_mes"] = pd.to_datetime(df_dolar_proximo["ano_mes"])
-df_dolar_proximo = df_dolar_proximo[['ano_mes','usdbrl']]
+    soja_mensal = pd.read_csv(mensal_path, index_col=0, parse_dates=["ano_mes"], float_precision="round_trip")
+    soja_mensal = aplicar_patch(soja_mensal, calcular_mensal(fontes, meses), "ano_mes", meses)
 
-soja_mensal = pd.merge(soja_mensal, df_dolar_proximo, on="ano_mes", how="left")
+    salvar_saidas(soja_anual, soja_mensal, df_dolar)
+    salvar_snapshot(fontes)
+    print(f"ETL incremental: {len(meses)} meses e {len(anos)} anos recalculados.")
 
 
-# organizando colunas
-soja_mensal = soja_mensal[['mes','ano','ano_mes','estoque','exportacao','processamento','compra_liquida','importacao','saldo','producao','chicago_cbot_u$/t','fob_porto_paranagua_u$/t','maringa_r$/saca','mogiana_r$/saca','passofundo_r$/saca','rondonopolis_r$/saca','usdbrl']]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tratamento dos dados da soja (ABIOVE + câmbio).")
+    parser.add_argument("--incremental", action="store_true", help="recalcula apenas os meses/anos alterados desde a última execução")
+    parser.add_argument("--sem-instantaneo", action="store_true", help="não regera o instantâneo estático do dashboard (prerender.py)")
+    args = parser.parse_args()
 
-# exportando para csv
-soja_mensal.to_csv("database/soja_mensal1.csv", index=True, encoding="utf-8")
+    executar(incremental=args.incremental, instantaneo=not args.sem_instantaneo)
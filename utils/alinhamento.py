@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+# ------------------------------------ alinhamento diário -> mensal ------------------------------------
+
+# políticas disponíveis para escolher o valor de cada mês
+POLITICAS = ("inicio", "primeiro", "ultimo", "media", "vwap")
+
+
+def alinhar_mensal(df, coluna_data, coluna_valor, politica="ultimo", coluna_peso=None, mesmo_mes=True):
+    """Converte uma série diária/semanal em mensal (uma linha por mês, com `ano_mes` no primeiro dia).
+
+    Políticas:
+        inicio   - observação mais próxima do primeiro dia do mês
+                   (com mesmo_mes=False pode vir do fim do mês anterior)
+        primeiro - primeira observação do mês
+        ultimo   - última observação do mês
+        media    - média simples das observações do mês
+        vwap     - média ponderada por `coluna_peso` (ex.: volume)
+
+    Tudo é feito sobre arrays ordenados (searchsorted/reduceat/merge_asof), sem groupby.apply.
+    """
+
+    if politica not in POLITICAS:
+        raise ValueError(f"Política inválida: {politica}. Use uma de {POLITICAS}.")
+    if politica == "vwap" and coluna_peso is None:
+        raise ValueError("A política 'vwap' exige `coluna_peso`.")
+
+    datas = pd.to_datetime(df[coluna_data])
+    ok = datas.notna().to_numpy()
+    datas = datas.to_numpy()[ok]
+    valores = df[coluna_valor].to_numpy(dtype="float64")[ok]
+
+    # ordenação estável por data
+    ordem = np.argsort(datas, kind="stable")
+    datas = datas[ordem]
+    valores = valores[ordem]
+
+    # limites de cada mês na série ordenada
+    meses = datas.astype("datetime64[M]")
+    unicos = np.unique(meses)
+    inicio_grupo = np.searchsorted(meses, unicos, side="left")
+    fim_grupo = np.searchsorted(meses, unicos, side="right") - 1
+    ano_mes = pd.DatetimeIndex(unicos.astype(datas.dtype))
+
+    if politica == "primeiro" or (politica == "inicio" and mesmo_mes):
+        # dentro do mês, a observação mais próxima do dia 1 é a primeira
+        resultado = valores[inicio_grupo]
+    elif politica == "inicio":
+        df_serie = pd.DataFrame({"data": datas, "valor": valores})
+        df_alvo = pd.DataFrame({"ano_mes": ano_mes})
+        resultado = pd.merge_asof(df_alvo, df_serie, left_on="ano_mes", right_on="data", direction="nearest")["valor"].to_numpy()
+    elif politica == "ultimo":
+        resultado = valores[fim_grupo]
+    elif politica == "media":
+        contagem = fim_grupo - inicio_grupo + 1
+        resultado = np.add.reduceat(valores, inicio_grupo) / contagem
+    else:
+        pesos = df[coluna_peso].to_numpy(dtype="float64")[ok][ordem]
+        resultado = np.add.reduceat(valores * pesos, inicio_grupo) / np.add.reduceat(pesos, inicio_grupo)
+
+    return pd.DataFrame({"ano_mes": ano_mes, coluna_valor: resultado})
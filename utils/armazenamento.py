@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from utils.piramide import NIVEIS
+
+
+# ------------------------------------ armazenamento colunar tipado ------------------------------------
+
+# meses como categoria fixa (1..12), independente dos meses presentes no arquivo
+MES = pd.CategoricalDtype(categories=list(range(1, 13)), ordered=True)
+
+# níveis da pirâmide OHLC do câmbio, do mais fino para o mais grosso
+NIVEL = pd.CategoricalDtype(categories=list(NIVEIS), ordered=True)
+
+MEDIDAS_MENSAL = ['estoque','exportacao','processamento','compra_liquida','importacao','saldo','producao','chicago_cbot_u$/t','fob_porto_paranagua_u$/t','maringa_r$/saca','mogiana_r$/saca','passofundo_r$/saca','rondonopolis_r$/saca','usdbrl']
+MEDIDAS_ANUAL = ['estoque_inicial','producao','importacao','Sementes/Outros','exportacao','processamento','estoque_final','usdbrl']
+
+# esquema explícito de cada dataset derivado: medidas float64 (correlações e OLS do forecast em dupla precisão),
+# ano int16, mês categórico, datas nativas
+ESQUEMAS = {
+    "soja_mensal1": {"mes": MES, "ano": "int16", "ano_mes": "datetime64[ns]", **{c: "float64" for c in MEDIDAS_MENSAL}},
+    "soja_anual1": {"periodo": "int16", **{c: "float64" for c in MEDIDAS_ANUAL}},
+    "variacao_cambial": {"datetime": "datetime64[ns]", "symbol": "category", "open": "float64", "high": "float64", "low": "float64", "close": "float64", "ano": "int16", "mes": MES},
+    "variacao_cambial_ohlc": {"nivel": NIVEL, "datetime": "datetime64[ns]", "open": "float64", "high": "float64", "low": "float64", "close": "float64"},
+}
+
+DATABASE_DIR = "database"
+
+
+def caminho_arrow(nome, pasta=DATABASE_DIR):
+    return os.path.join(pasta, f"{nome}.arrow")
+
+
+def tipar(df, nome):
+    """Aplica o esquema do dataset (colunas na ordem do esquema)."""
+
+    esquema = ESQUEMAS[nome]
+    return df[list(esquema)].astype(esquema).reset_index(drop=True)
+
+
+def _tabela(df):
+    # NaN gravado como valor (sem bitmap de nulos): a coluna float volta para o pandas sem cópia
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    for i, campo in enumerate(tabela.schema):
+        if pa.types.is_floating(campo.type):
+            tabela = tabela.set_column(i, campo, pa.array(df[campo.name].to_numpy(), from_pandas=False))
+    return tabela
+
+
+def salvar_arrow(df, nome, pasta=DATABASE_DIR):
+    """Grava o dataset tipado em Arrow IPC (Feather v2) sem compressão, para poder ser mapeado em memória.
+
+    A gravação vai para um temporário trocado no fim: processos com o arquivo antigo mapeado continuam lendo o inode antigo.
+    """
+
+    caminho = caminho_arrow(nome, pasta)
+    feather.write_feather(_tabela(tipar(df, nome)), f"{caminho}.tmp", compression="uncompressed")
+    os.replace(f"{caminho}.tmp", caminho)
+
+
+def carregar_arrow(nome, pasta=DATABASE_DIR):
+    """Carrega o dataset via memory-map (sem parse de texto); cai para o CSV tipado se o .arrow não existir.
+
+    As colunas numéricas e de data viram arrays numpy sobre as páginas do arquivo mapeado (zero-copy, somente
+    leitura), compartilhadas pelo page cache entre processos; só os códigos das categorias são copiados.
+    """
+
+    caminho = caminho_arrow(nome, pasta)
+    if os.path.exists(caminho):
+        # split_blocks: um bloco por coluna, sem consolidar (a consolidação copiaria tudo para o heap)
+        return feather.read_table(caminho, memory_map=True).to_pandas(split_blocks=True, self_destruct=False)
+
+    caminho_csv = os.path.join(pasta, f"{nome}.csv")
+    if not os.path.exists(caminho_csv):
+        raise FileNotFoundError(f"❌ Arquivo não encontrado: {caminho} (nem {caminho_csv})")
+
+    esquema = ESQUEMAS[nome]
+    datas = [c for c, tipo in esquema.items() if str(tipo).startswith("datetime64")]
+    return tipar(pd.read_csv(caminho_csv, parse_dates=datas), nome)
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+
+# ------------------------------------ cache LRU de figuras plotly ------------------------------------
+
+MAX_ITENS = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class CacheFiguras:
+    """Cache LRU de figuras compartilhado entre sessões, limitado por quantidade e por memória.
+
+    Além de figuras plotly, guarda renderizações prontas em HTML/SVG (str ou dict de str), como as sparklines.
+
+    As figuras devolvidas são compartilhadas: quem chama não deve alterá-las depois de obtidas.
+    """
+
+    def __init__(self, max_itens=MAX_ITENS, max_bytes=MAX_BYTES):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()  # (secao, chave) -> (figura, tamanho em bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._contadores = {}        # secao -> {"hits", "misses", "evictions"}
+
+    def _contar(self, secao, evento):
+        contadores = self._contadores.setdefault(secao, {"hits": 0, "misses": 0, "evictions": 0})
+        contadores[evento] += 1
+
+    def obter(self, secao, chave, construir):
+        """Devolve a figura de (secao, chave); em caso de miss chama `construir()` e guarda o resultado."""
+
+        item = (secao, chave)
+        with self._lock:
+            if item in self._itens:
+                self._itens.move_to_end(item)
+                self._contar(secao, "hits")
+                return self._itens[item][0]
+            self._contar(secao, "misses")
+
+        # a construção fica fora do lock para não serializar as sessões
+        figura = construir()
+        tamanho = tamanho_figura(figura)
+
+        with self._lock:
+            if item in self._itens:
+                self._bytes -= self._itens.pop(item)[1]
+            self._itens[item] = (figura, tamanho)
+            self._bytes += tamanho
+
+            # descarta as menos usadas até respeitar os limites (mantém pelo menos a recém-inserida)
+            while len(self._itens) > 1 and (len(self._itens) > self.max_itens or self._bytes > self.max_bytes):
+                (secao_antiga, _), (_, tamanho_antigo) = self._itens.popitem(last=False)
+                self._bytes -= tamanho_antigo
+                self._contar(secao_antiga, "evictions")
+
+        return figura
+
+    def estatisticas(self):
+        """Contadores por seção e ocupação atual do cache."""
+
+        with self._lock:
+            return {
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                "max_itens": self.max_itens,
+                "max_bytes": self.max_bytes,
+                "secoes": {secao: dict(c) for secao, c in self._contadores.items()},
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+
+def tamanho_figura(figura):
+    """Tamanho (bytes) do payload enviado ao navegador: JSON da figura plotly ou o HTML/SVG já renderizado."""
+
+    if isinstance(figura, str):
+        return len(figura.encode())
+    if isinstance(figura, dict):
+        return sum(tamanho_figura(valor) for valor in figura.values())
+    return len(pio.to_json(figura, validate=False))
+
+
+def normalizar_chave(valor):
+    """Converte as entradas de uma seção em uma chave hashable estável (tuplas e escalares python)."""
+
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar_chave(v) for v in valor)
+    if hasattr(valor, "item"):  # escalares numpy (ex.: anos vindos de um DataFrame)
+        return valor.item()
+    return valor
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+
+# ------------------------------------ cache da planilha ABIOVE ------------------------------------
+
+# diretório padrão do cache (um subdiretório por hash do arquivo)
+CACHE_DIR = os.path.join("database", ".cache")
+
+
+def hash_arquivo(file_path, bloco=1 << 20):
+    """Calcula o sha256 do conteúdo do arquivo (lido em blocos)."""
+
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def _nome_arquivo(indice):
+    # nomes das abas têm acentos e espaços, então salvamos por posição e guardamos o nome no manifesto
+    return f"aba_{indice:02d}.parquet"
+
+
+def _ler_cache(pasta, abas):
+    manifesto_path = os.path.join(pasta, "manifesto.json")
+    if not os.path.exists(manifesto_path):
+        return None
+
+    with open(manifesto_path, encoding="utf-8") as f:
+        manifesto = json.load(f)
+
+    if any(aba not in manifesto for aba in abas):
+        return None
+
+    try:
+        return {aba: pd.read_parquet(os.path.join(pasta, manifesto[aba])) for aba in abas}
+    except (OSError, ValueError):
+        # cache corrompido ou incompleto: volta a ler a planilha
+        return None
+
+
+def _salvar_cache(pasta, planilhas):
+    os.makedirs(pasta, exist_ok=True)
+    manifesto = {}
+    for indice, (aba, df_aba) in enumerate(planilhas.items()):
+        nome = _nome_arquivo(indice)
+        df_aba.to_parquet(os.path.join(pasta, nome), index=False)
+        manifesto[aba] = nome
+
+    # o manifesto é escrito por último: só existe se todas as abas foram salvas
+    with open(os.path.join(pasta, "manifesto.json"), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+
+def carregar_planilha(file_path, abas, cache_dir=CACHE_DIR):
+    """Lê as abas da planilha uma única vez e guarda um snapshot parquet chaveado pelo hash do arquivo.
+
+    Se a planilha não mudou desde a última execução, as abas vêm direto do parquet, sem abrir o openpyxl.
+    """
+
+    pasta = os.path.join(cache_dir, hash_arquivo(file_path))
+
+    planilhas = _ler_cache(pasta, abas)
+    if planilhas is not None:
+        return planilhas
+
+    # uma única abertura do arquivo para todas as abas
+    planilhas = pd.read_excel(file_path, sheet_name=list(abas))
+
+    # colunas sem nome viram texto para o parquet aceitar
+    for df_aba in planilhas.values():
+        df_aba.columns = [str(c) for c in df_aba.columns]
+
+    _salvar_cache(pasta, planilhas)
+    return planilhas
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+
+# ------------------------------------ correlação de Pearson por faixa de anos ------------------------------------
+
+DRIVERS = ["usdbrl", "tendencia_estoque", "producao_12_meses", "importacao_12_meses", "exportacao_12_meses", "processamento_12_meses"]
+PRECOS = ["chicago_cbot_u$/t", "fob_porto_paranagua_u$/t", "maringa_r$/saca", "mogiana_r$/saca", "passofundo_r$/saca", "rondonopolis_r$/saca"]
+
+# estatísticas suficientes acumuladas para cada par (driver, preço)
+ESTATISTICAS = ("n", "x", "y", "xx", "yy", "xy")
+
+
+def calcular_somas(df, drivers=DRIVERS, precos=PRECOS, coluna_ano="ano"):
+    """Pré-calcula somas acumuladas de n, x, y, x², y² e xy para todos os pares driver × preço.
+
+    `df` deve estar ordenado no tempo. As colunas são centralizadas pela média antes de acumular,
+    o que evita o cancelamento numérico em séries grandes (Pearson não muda com deslocamentos).
+    """
+
+    x = df[list(drivers)].to_numpy(dtype="float64")
+    y = df[list(precos)].to_numpy(dtype="float64")
+    media_x = np.nanmean(x, axis=0)
+    media_y = np.nanmean(y, axis=0)
+    x = x - media_x
+    y = y - media_y
+
+    # máscara de pares válidos (linhas x colunas x preços)
+    validos = ~np.isnan(x)[:, :, None] & ~np.isnan(y)[:, None, :]
+    xp = np.where(validos, x[:, :, None], 0.0)
+    yp = np.where(validos, y[:, None, :], 0.0)
+
+    termos = {"n": validos.astype("float64"), "x": xp, "y": yp, "xx": xp * xp, "yy": yp * yp, "xy": xp * yp}
+    somas = {}
+    for nome, termo in termos.items():
+        acumulado = np.concatenate([np.zeros((1,) + termo.shape[1:]), np.cumsum(termo, axis=0)])
+        acumulado.setflags(write=False)
+        somas[nome] = acumulado
+
+    anos = df[coluna_ano].to_numpy()
+    anos.setflags(write=False)
+    return {"anos": anos, "drivers": list(drivers), "precos": list(precos), "somas": somas, "medias": (media_x, media_y)}
+
+
+def _pearson(s):
+    n = s["n"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = s["xy"] - s["x"] * s["y"] / n
+        var_x = s["xx"] - s["x"] ** 2 / n
+        var_y = s["yy"] - s["y"] ** 2 / n
+        r = cov / np.sqrt(var_x * var_y)
+    return np.where(n >= 2, np.clip(r, -1.0, 1.0), np.nan)
+
+
+def _faixa(correlacoes, ano_inicio, ano_fim):
+    # linhas do intervalo [ano_inicio, ano_fim] por busca binária nos anos ordenados
+    anos = correlacoes["anos"]
+    i = np.searchsorted(anos, ano_inicio, side="left")
+    j = np.searchsorted(anos, ano_fim, side="right")
+    return {nome: soma[j] - soma[i] for nome, soma in correlacoes["somas"].items()}
+
+
+def correlacao(correlacoes, driver, preco, ano_inicio, ano_fim):
+    """Correlação de Pearson entre `driver` e `preco` no intervalo de anos, em O(1)."""
+
+    d = correlacoes["drivers"].index(driver)
+    p = correlacoes["precos"].index(preco)
+    s = {nome: valor[d, p] for nome, valor in _faixa(correlacoes, ano_inicio, ano_fim).items()}
+    return float(_pearson(s))
+
+
+def matriz_correlacao(correlacoes, ano_inicio, ano_fim):
+    """Matriz completa driver × preço para o intervalo de anos, em uma única consulta."""
+
+    r = _pearson(_faixa(correlacoes, ano_inicio, ano_fim))
+    return pd.DataFrame(r, index=correlacoes["drivers"], columns=correlacoes["precos"])
+
+
+def reta_tendencia(correlacoes, driver, preco, ano_inicio, ano_fim):
+    """Reta de mínimos quadrados driver = intercepto + inclinação * preço no intervalo, em O(1).
+
+    Retorna (inclinacao, intercepto, r2) a partir das mesmas somas usadas na correlação.
+    """
+
+    d = correlacoes["drivers"].index(driver)
+    p = correlacoes["precos"].index(preco)
+    s = {nome: valor[d, p] for nome, valor in _faixa(correlacoes, ano_inicio, ano_fim).items()}
+
+    n = s["n"]
+    if n < 2:
+        return np.nan, np.nan, np.nan
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        inclinacao = (s["xy"] - s["x"] * s["y"] / n) / (s["yy"] - s["y"] ** 2 / n)
+
+    # volta das variáveis centralizadas para a escala original
+    media_x, media_y = correlacoes["medias"]
+    media_driver = s["x"] / n + media_x[d]
+    media_preco = s["y"] / n + media_y[p]
+    intercepto = media_driver - inclinacao * media_preco
+
+    return float(inclinacao), float(intercepto), float(_pearson(s)) ** 2
+
+
+def regressao_linear(x, y):
+    """OLS simples y = intercepto + inclinação * x em forma fechada (o mesmo ajuste do sm.OLS com constante).
+
+    Retorna (inclinacao, intercepto, r2, residuos).
+    """
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    dx = x - x.mean()
+    dy = y - y.mean()
+
+    inclinacao = (dx @ dy) / (dx @ dx)
+    intercepto = y.mean() - inclinacao * x.mean()
+    residuos = y - (intercepto + inclinacao * x)
+    r2 = 1.0 - (residuos @ residuos) / (dy @ dy)
+    return float(inclinacao), float(intercepto), float(r2), residuos
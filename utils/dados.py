@@ -0,0 +1,246 @@
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.alinhamento import alinhar_mensal
+from utils.armazenamento import DATABASE_DIR
+from utils.cache_figuras import CacheFiguras
+from utils.correlacao import calcular_somas
+from utils.instrumentacao import Metricas, exportar
+from utils.janelas import adicionar_janelas
+from utils.kpis import materializar_kpis
+from utils.piramide import MAX_CANDLES, selecionar_nivel, separar_niveis
+from utils.registro import assinatura_arquivo, assinatura_dataset, contadores, invalidar, obter, registrar, situacao
+from utils.temporal import FrameTemporal
+
+
+# ------------------------------------ camada de acesso aos dados das páginas ------------------------------------
+
+# os datasets e derivados abaixo vivem no registro (utils/registro.py): carregados uma vez por processo,
+# compartilhados por todas as páginas e sessões e recalculados só quando um arquivo de origem muda
+
+TTL_CACHE = 6 * 60 * 60          # validade máxima de cada entrada do cache de arquivos avulsos (s)
+
+# arquivo de métricas para um scraper local (.jsonl = JSON lines, outra extensão = texto Prometheus); vazio = desligado
+ARQUIVO_METRICAS = os.environ.get("SOJAMETRICS_METRICAS", "")
+INTERVALO_EXPORTACAO = 15        # intervalo mínimo entre gravações do arquivo de métricas (s)
+
+# contabilidade de memória por seção/sessão com tracemalloc (número de frames guardados por alocação); 0 = desligada.
+# Ligada, as seções medidas rodam uma de cada vez no processo (modo de diagnóstico, ver utils/instrumentacao.py)
+FRAMES_TRACEMALLOC = int(os.environ.get("SOJAMETRICS_TRACEMALLOC", "0") or 0)
+
+
+@registrar("mensal_base", "soja_mensal1")
+def _mensal_base(df):
+    # soja_mensal1 completo (com meses incompletos), ordenado e com `periodo` (datetime)
+    df = df.sort_values("ano_mes", ignore_index=True)
+    df["periodo"] = df["ano_mes"]
+    return df
+
+
+@registrar("mensal", "mensal_base")
+def _mensal(df):
+    df = df.dropna().reset_index(drop=True)
+
+    # médias/somas móveis de 12 meses calculadas uma vez sobre todo o histórico
+    df = adicionar_janelas(df)
+    return FrameTemporal(df, "ano_mes")
+
+
+@registrar("anual", "soja_anual1")
+def _anual(df_ano):
+    df_ano["saldo"] = df_ano["estoque_final"] - df_ano["estoque_inicial"]
+    return FrameTemporal(df_ano, pd.to_datetime(df_ano["periodo"].astype(str), format="%Y"))
+
+
+@registrar("cambio", "variacao_cambial")
+def _cambio(df_dolar):
+    df_dolar["periodo"] = df_dolar["datetime"]
+    return df_dolar
+
+
+@registrar("cambio_mensal", "cambio")
+def _cambio_mensal(df_dolar):
+    # fechamento do último pregão de cada mês, com `periodo` no dia 01
+    df_dolar_mensal = alinhar_mensal(df_dolar, "periodo", "close", politica="ultimo")
+    return df_dolar_mensal.rename(columns={"ano_mes": "periodo", "close": "cambio_usdbrl"})
+
+
+@registrar("saldo", "mensal_base", "cambio_mensal")
+def _saldo(df, df_dolar_mensal):
+    # base do forecast: 2000-2024, variação mensal do estoque e câmbio do fim do mês
+    df_saldo = df[(df["ano"] >= 2000) & (df["ano"] <= 2024)].reset_index(drop=True)
+    df_saldo["saldo_estoque"] = df_saldo["estoque"].diff().fillna(0)
+    return df_saldo.merge(df_dolar_mensal[["periodo", "cambio_usdbrl"]], on="periodo", how="left")
+
+
+@registrar("kpis", "anual", "mensal")
+def _kpis(anual, mensal):
+    return materializar_kpis(anual.frame, mensal.frame)
+
+
+@registrar("correlacoes", "mensal")
+def _correlacoes(mensal):
+    # somas acumuladas somente leitura (arrays não graváveis)
+    return calcular_somas(mensal.frame)
+
+
+@registrar("piramide", "variacao_cambial_ohlc")
+def _piramide(df_piramide):
+    # níveis OHLC pré-agregados no ETL
+    return separar_niveis(df_piramide)
+
+
+@st.cache_data(ttl=TTL_CACHE, show_spinner=False)
+def _csv(caminho, assinatura, index_col, parse_dates):
+    return pd.read_csv(caminho, index_col=index_col, parse_dates=list(parse_dates) or None)
+
+
+def carregar_mensal(pasta=DATABASE_DIR):
+    """FrameTemporal do soja_mensal1 sem linhas incompletas, com `periodo` (datetime) e as janelas móveis de 12 meses."""
+
+    return obter("mensal", pasta)
+
+
+def carregar_anual(pasta=DATABASE_DIR):
+    """FrameTemporal do soja_anual1 com o `saldo` anual (estoque final - estoque inicial)."""
+
+    return obter("anual", pasta)
+
+
+def carregar_cambio(ano_inicio=None, ano_fim=None, pasta=DATABASE_DIR):
+    """Série USD/BRL completa (OHLC), opcionalmente filtrada por ano, com `periodo` (datetime)."""
+
+    df_dolar = obter("cambio", pasta)
+    if ano_inicio is not None:
+        df_dolar = df_dolar[(df_dolar["ano"] >= ano_inicio) & (df_dolar["ano"] <= ano_fim)].reset_index(drop=True)
+    return df_dolar
+
+
+def carregar_cambio_mensal(pasta=DATABASE_DIR):
+    """Câmbio mensal (`periodo` no dia 01, `cambio_usdbrl` = fechamento do último pregão do mês)."""
+
+    return obter("cambio_mensal", pasta)
+
+
+def carregar_saldo(pasta=DATABASE_DIR):
+    """Base mensal do forecast (2000-2024) com `saldo_estoque` e o câmbio mensal `cambio_usdbrl`."""
+
+    return obter("saldo", pasta)
+
+
+def carregar_ohlc(ano_inicio, ano_fim, max_candles=MAX_CANDLES, pasta=DATABASE_DIR):
+    """(nível, OHLC) do câmbio entre os anos, no nível mais fino da pirâmide com até `max_candles` candles."""
+
+    inicio, fim = pd.Timestamp(f"{ano_inicio}-01-01"), pd.Timestamp(f"{ano_fim}-12-31 23:59:59")
+    return selecionar_nivel(obter("piramide", pasta), inicio, fim, max_candles)
+
+
+def carregar_kpis(pasta=DATABASE_DIR):
+    """Tabela de KPIs indexada pelo ano: valor e variação YoY (%) de cada indicador e de cada preço."""
+
+    return obter("kpis", pasta)
+
+
+def carregar_correlacoes(pasta=DATABASE_DIR):
+    """Somas acumuladas para correlações de Pearson por faixa de anos (ver utils/correlacao.py)."""
+
+    return obter("correlacoes", pasta)
+
+
+def carregar_eventos(pasta=DATABASE_DIR):
+    """Catálogo de eventos políticos/econômicos marcados no gráfico do câmbio (database/eventos_cambio.csv)."""
+
+    return carregar_csv(os.path.join(pasta, "eventos_cambio.csv"), parse_dates=("data",))
+
+
+def carregar_csv(caminho, index_col=None, parse_dates=()):
+    """Leitura cacheada de um CSV qualquer (datas já convertidas), invalidada quando o arquivo muda."""
+
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"❌ Arquivo não encontrado: {caminho}")
+    return _csv(caminho, assinatura_arquivo(caminho), index_col, tuple(parse_dates))
+
+
+@st.cache_resource(show_spinner=False)
+def cache_figuras():
+    """Cache LRU de figuras plotly compartilhado por todas as sessões (ver utils/cache_figuras.py)."""
+
+    return CacheFiguras()
+
+
+def sessao_atual():
+    """Id da sessão Streamlit que está executando o script (None fora de uma sessão)."""
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+@st.cache_resource(show_spinner=False)
+def metricas():
+    """Tempos (e memória) por seção acumulados no processo, compartilhados por todas as sessões (ver utils/instrumentacao.py)."""
+
+    if FRAMES_TRACEMALLOC and not tracemalloc.is_tracing():
+        tracemalloc.start(FRAMES_TRACEMALLOC)
+    return Metricas(sessao=sessao_atual)
+
+
+def memoria_processo():
+    """Memória residente (bytes) do processo, lida de /proc (None onde não existe)."""
+
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def relatorio_memoria():
+    """Memória do servidor: processo, parte compartilhada (registro + cache de figuras) e consumo por sessão ativa."""
+
+    memoria = metricas().memoria()
+    processo = memoria_processo()
+    compartilhado = int(situacao()["bytes"].sum()) + cache_figuras().estatisticas()["bytes"]
+    ativas = memoria["sessoes_ativas"]
+    picos = [sessao["pico_kb"] * 1024 for sessao in memoria["sessoes"]]
+
+    memoria.update({
+        "processo_bytes": processo,
+        "compartilhado_bytes": compartilhado,
+        # processo inteiro (interpretador e bibliotecas incluídos) dividido pelas sessões ativas
+        "processo_por_sessao_bytes": processo / ativas if processo and ativas else None,
+        "pico_por_sessao_bytes": sum(picos) / len(picos) if picos else None,
+    })
+    return memoria
+
+
+_ultima_exportacao = [0.0]
+
+
+def exportar_metricas(caminho=None, forcar=False):
+    """Grava spans, cache de figuras e registro em `caminho` (padrão: $SOJAMETRICS_METRICAS), no máximo a cada INTERVALO_EXPORTACAO."""
+
+    caminho = caminho or ARQUIVO_METRICAS
+    agora = time.monotonic()
+    if not caminho or (not forcar and agora - _ultima_exportacao[0] < INTERVALO_EXPORTACAO):
+        return
+    _ultima_exportacao[0] = agora
+    exportar(caminho, metricas().spans(), cache_figuras().estatisticas(), contadores(), relatorio_memoria())
+
+
+def versao_dados(pasta=DATABASE_DIR):
+    """Assinaturas dos datasets do dashboard; entra na chave das figuras para invalidá-las quando os dados mudam."""
+
+    return tuple(assinatura_dataset(nome, pasta) for nome in ("soja_mensal1", "soja_anual1", "variacao_cambial", "variacao_cambial_ohlc", "eventos_cambio"))
+
+
+def invalidar_cache():
+    """Descarta todos os dados em cache (próxima chamada relê os arquivos)."""
+
+    invalidar()
+    _csv.clear()
+    cache_figuras().limpar()
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from utils.cache_figuras import normalizar_chave
+from utils.dados import versao_dados
+
+
+# ------------------------------------ download dos dados filtrados (CSV/Parquet em blocos, servidos do disco) ------------------------------------
+
+# o download_button do Streamlit guarda o conteúdo inteiro em memória (media manager); aqui o arquivo é escrito
+# em disco bloco a bloco e baixado por link da pasta static/ (server.enableStaticServing), lido do disco em streaming
+LINHAS_POR_BLOCO = 5000                # linhas convertidas por vez
+PASTA_EXPORTACOES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "exportacoes")
+URL_EXPORTACOES = "app/static/exportacoes"
+VALIDADE_ARQUIVO = 60 * 60             # tempo em que o link de um arquivo gerado fica na tela da sessão (s)
+CARENCIA = 60 * 60                     # folga antes de apagar: um link ainda na tela de outra sessão não dá 404 (s)
+
+FORMATOS = ("csv", "parquet")
+
+
+def blocos_csv(df, linhas=LINHAS_POR_BLOCO):
+    """Gera o CSV (UTF-8) do frame em blocos de bytes: cabeçalho e depois `linhas` linhas por vez."""
+
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8")
+    for inicio in range(0, len(df), linhas):
+        yield df.iloc[inicio:inicio + linhas].to_csv(index=False, header=False).encode("utf-8")
+
+
+def escrever_parquet(df, destino, linhas=LINHAS_POR_BLOCO):
+    """Grava o frame em Parquet no arquivo `destino`, um row group a cada `linhas` linhas."""
+
+    esquema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for inicio in range(0, len(df), linhas):
+            escritor.write_table(pa.Table.from_pandas(df.iloc[inicio:inicio + linhas], schema=esquema, preserve_index=False))
+
+
+def gravar_exportacao(df, formato, caminho, linhas=LINHAS_POR_BLOCO):
+    """Escreve o frame em `formato` direto no arquivo `caminho`, bloco a bloco (no máximo um bloco em memória).
+
+    A escrita vai para um temporário único na mesma pasta (duas sessões exportando o mesmo recorte não se misturam),
+    trocado no fim: um download em andamento nunca lê arquivo pela metade.
+    """
+
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação inválido: {formato!r} (use um de {FORMATOS})")
+
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+    try:
+        if formato == "csv":
+            with os.fdopen(descritor, "wb") as arquivo:
+                for bloco in blocos_csv(df, linhas):
+                    arquivo.write(bloco)
+        else:
+            os.close(descritor)
+            escrever_parquet(df, temporario, linhas)
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def identificador(nome, entradas):
+    """Hash das entradas da seção e da versão dos dados: o mesmo recorte reaproveita o arquivo, sem ler o frame."""
+
+    return hashlib.sha256(repr((nome, normalizar_chave(entradas), versao_dados())).encode()).hexdigest()[:16]
+
+
+def limpar_exportacoes(pasta=PASTA_EXPORTACOES, idade=VALIDADE_ARQUIVO + CARENCIA):
+    """Apaga os arquivos exportados (e temporários órfãos) sem uso há mais de `idade` segundos."""
+
+    limite = time.time() - idade
+    for entrada in os.scandir(pasta):
+        if entrada.is_file() and entrada.stat().st_mtime < limite:
+            try:
+                os.remove(entrada.path)
+            except FileNotFoundError:
+                pass  # outra sessão apagou primeiro
+
+
+def exportar(df, arquivo, formato):
+    """Grava `arquivo` na pasta de exportações, ou só renova o mtime se outra sessão já o gerou (chamado no clique)."""
+
+    os.makedirs(PASTA_EXPORTACOES, exist_ok=True)
+    limpar_exportacoes()
+
+    caminho = os.path.join(PASTA_EXPORTACOES, arquivo)
+    try:
+        os.utime(caminho)  # já exportado: o mtime renovado adia a limpeza
+    except FileNotFoundError:
+        gravar_exportacao(df, formato, caminho)
+
+
+def botoes_download(df, nome, chave, entradas):
+    """Downloads (CSV e Parquet) do frame já filtrado da seção.
+
+    Cada formato é gerado só no clique em "Preparar" e gravado em disco; o link baixa o arquivo servido pelo
+    Streamlit direto do disco. O nome do arquivo vem das `entradas` da seção e da versão dos dados, e os arquivos
+    gerados ficam na sessão: os reruns não leem o frame nem o disco.
+    """
+
+    sufixo = identificador(nome, entradas)
+    gerados = st.session_state.setdefault("exportacoes", {})
+
+    for coluna, formato in zip(st.columns(len(FORMATOS)), FORMATOS):
+        arquivo = f"{nome}_{sufixo}.{formato}"
+        with coluna:
+            if time.time() - gerados.get(arquivo, 0) > VALIDADE_ARQUIVO:
+                if not st.button(f"Preparar {formato.upper()}", key=f"download_{chave}_{formato}", width="stretch"):
+                    continue
+                exportar(df, arquivo, formato)
+                gerados[arquivo] = time.time()
+            st.markdown(f'<a href="{URL_EXPORTACOES}/{arquivo}" download="{nome}.{formato}">⬇️ {formato.upper()}</a>', unsafe_allow_html=True)
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_planilha import CACHE_DIR
+
+
+# ------------------------------------ ETL incremental ------------------------------------
+
+# snapshot das fontes normalizadas da última materialização
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "fontes")
+
+
+def salvar_snapshot(fontes, pasta=SNAPSHOT_DIR):
+    """Guarda as fontes normalizadas usadas na última materialização das saídas."""
+
+    os.makedirs(pasta, exist_ok=True)
+    for nome, df_fonte in fontes.items():
+        df_fonte.to_parquet(os.path.join(pasta, f"{nome}.parquet"), index=False)
+
+
+def carregar_snapshot(nomes, pasta=SNAPSHOT_DIR):
+    """Carrega o snapshot anterior; retorna None se alguma fonte não existir."""
+
+    caminhos = {nome: os.path.join(pasta, f"{nome}.parquet") for nome in nomes}
+    if not all(os.path.exists(caminho) for caminho in caminhos.values()):
+        return None
+    return {nome: pd.read_parquet(caminho) for nome, caminho in caminhos.items()}
+
+
+def chaves_alteradas(novo, antigo, chaves):
+    """Retorna as chaves das linhas que entraram, saíram ou mudaram de valor entre dois snapshots."""
+
+    valores = [c for c in novo.columns if c not in chaves]
+    df_comp = pd.merge(novo, antigo, on=chaves, how="outer", suffixes=("", "_antigo"), indicator=True)
+
+    alterado = df_comp["_merge"] != "both"
+    for coluna in valores:
+        a = df_comp[coluna]
+        b = df_comp[f"{coluna}_antigo"]
+        # NaN nos dois lados não conta como alteração
+        alterado |= ~((a == b) | (a.isna() & b.isna()))
+
+    return df_comp.loc[alterado, chaves]
+
+
+def proximas_datas(datas, alteradas):
+    """Para cada data alterada, devolve a data seguinte na série (dependência de diff, ex.: saldo do estoque)."""
+
+    datas = np.sort(pd.to_datetime(pd.Series(datas)).dropna().unique())
+    if len(datas) == 0 or len(alteradas) == 0:
+        return pd.DatetimeIndex([])
+
+    pos = np.searchsorted(datas, pd.to_datetime(pd.Series(alteradas)).to_numpy(), side="right")
+    pos = pos[pos < len(datas)]
+    return pd.DatetimeIndex(datas[pos])
+
+
+def aplicar_patch(df_atual, df_novo, chave, alteradas):
+    """Remove as linhas afetadas da saída anterior e insere as recalculadas, mantendo a ordem pela chave."""
+
+    df_mantido = df_atual[~df_atual[chave].isin(alteradas)]
+    df_patch = pd.concat([df_mantido, df_novo], ignore_index=True)
+    return df_patch.sort_values(chave, kind="stable").reset_index(drop=True)
@@ -0,0 +1,206 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+# ------------------------------------ tempos por seção/etapa e exportação das métricas ------------------------------------
+
+# etapas medidas em cada seção do dashboard ("total" = execução inteira da seção)
+ETAPAS = ("carga", "filtro", "agregacao", "figura", "serializacao", "total")
+
+JANELA_SESSAO_ATIVA = 10 * 60    # sessão sem rerun há mais que isso deixa de contar como ativa (s)
+
+
+class Metricas:
+    """Acumulador de spans (seção, etapa) compartilhado entre sessões: execuções, soma, máximo e último tempo.
+
+    Com o tracemalloc ligado, cada seção medida por `medir` também registra a memória alocada (pico e líquido)
+    por seção e por sessão. Os contadores do tracemalloc são do processo inteiro: para que o `reset_peak` de uma
+    seção não apague o pico de outra, as seções medidas passam a rodar uma de cada vez (modo de diagnóstico,
+    desligado por padrão). Alocações de outras threads (servidor, websockets) ainda entram no número.
+    """
+
+    def __init__(self, sessao=None):
+        self._spans = {}             # (secao, etapa) -> {"execucoes", "total_s", "max_s", "ultimo_s"}
+        self._memoria = {}           # secao -> {"execucoes", "pico_max_kb", "pico_ultimo_kb", "liquido_ultimo_kb"}
+        self._sessoes = {}           # id da sessão -> {"visto", "secoes": {secao: (pico_kb, liquido_kb)}}
+        self._sessao = sessao        # função que devolve o id da sessão atual (None fora de uma sessão)
+        self._lock = threading.Lock()
+        self._lock_memoria = threading.RLock()  # serializa as seções medidas com o tracemalloc ligado
+
+    def registrar(self, secao, etapa, segundos):
+        with self._lock:
+            span = self._spans.setdefault((secao, etapa), {"execucoes": 0, "total_s": 0.0, "max_s": 0.0, "ultimo_s": 0.0})
+            span["execucoes"] += 1
+            span["total_s"] += segundos
+            span["max_s"] = max(span["max_s"], segundos)
+            span["ultimo_s"] = segundos
+
+    @contextmanager
+    def span(self, secao, etapa):
+        """Mede o bloco `with` e acumula o tempo em (secao, etapa), mesmo se o bloco levantar exceção."""
+
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(secao, etapa, time.perf_counter() - inicio)
+
+    def registrar_memoria(self, secao, pico_kb, liquido_kb):
+        sessao = self._sessao() if self._sessao is not None else None
+        with self._lock:
+            memoria = self._memoria.setdefault(secao, {"execucoes": 0, "pico_max_kb": 0.0, "pico_ultimo_kb": 0.0, "liquido_ultimo_kb": 0.0})
+            memoria["execucoes"] += 1
+            memoria["pico_max_kb"] = max(memoria["pico_max_kb"], pico_kb)
+            memoria["pico_ultimo_kb"] = pico_kb
+            memoria["liquido_ultimo_kb"] = liquido_kb
+            if sessao is not None:
+                self._sessoes.setdefault(sessao, {"visto": 0.0, "secoes": {}})["secoes"][secao] = (pico_kb, liquido_kb)
+
+    def tocar_sessao(self):
+        """Marca a sessão atual como ativa e descarta as sessões paradas há mais de JANELA_SESSAO_ATIVA."""
+
+        sessao = self._sessao() if self._sessao is not None else None
+        if sessao is None:
+            return
+        agora = time.monotonic()
+        with self._lock:
+            self._sessoes.setdefault(sessao, {"visto": 0.0, "secoes": {}})["visto"] = agora
+            for antiga in [s for s, dados in self._sessoes.items() if agora - dados["visto"] > JANELA_SESSAO_ATIVA]:
+                del self._sessoes[antiga]
+
+    def medir(self, secao, etapa="total", depois=None):
+        """Decorador: mede cada chamada da função (ex.: a seção inteira, a cada rerun do fragmento).
+
+        Com o tracemalloc ligado mede também a memória da chamada, uma seção por vez no processo (ver a classe).
+        `depois()` é chamado ao fim de cada chamada medida (ex.: gravar o arquivo de métricas).
+        """
+
+        def decorador(funcao):
+            def executar(*args, **kwargs):
+                with self.span(secao, etapa):
+                    return funcao(*args, **kwargs)
+
+            def com_memoria(*args, **kwargs):
+                with self._lock_memoria:
+                    tracemalloc.reset_peak()
+                    antes = tracemalloc.get_traced_memory()[0]
+                    try:
+                        return executar(*args, **kwargs)
+                    finally:
+                        atual, pico = tracemalloc.get_traced_memory()
+                        self.registrar_memoria(secao, (pico - antes) / 1024, (atual - antes) / 1024)
+
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                try:
+                    if tracemalloc.is_tracing():
+                        return com_memoria(*args, **kwargs)
+                    return executar(*args, **kwargs)
+                finally:
+                    self.tocar_sessao()
+                    if depois is not None:
+                        depois()
+            return medida
+
+        return decorador
+
+    def memoria(self):
+        """Memória por seção e por sessão ativa (KB, do tracemalloc) e a quantidade de sessões ativas.
+
+        O pico de uma sessão é o maior pico entre as suas seções; o líquido é o que ficou alocado após cada seção.
+        """
+
+        with self._lock:
+            secoes = [{"secao": secao, **dict(valores)} for secao, valores in self._memoria.items()]
+            sessoes = [
+                {
+                    "sessao": sessao,
+                    "parada_s": time.monotonic() - dados["visto"],
+                    "pico_kb": max((pico for pico, _ in dados["secoes"].values()), default=0.0),
+                    "liquido_kb": sum(liquido for _, liquido in dados["secoes"].values()),
+                }
+                for sessao, dados in self._sessoes.items()
+            ]
+        return {"rastreando": tracemalloc.is_tracing(), "sessoes_ativas": len(sessoes), "secoes": secoes, "sessoes": sessoes}
+
+    def spans(self):
+        """Lista de spans acumulados, um dicionário por (seção, etapa)."""
+
+        with self._lock:
+            return [{"secao": secao, "etapa": etapa, **dict(valores)} for (secao, etapa), valores in self._spans.items()]
+
+    def limpar(self):
+        with self._lock:
+            self._spans.clear()
+            self._memoria.clear()
+            self._sessoes.clear()
+
+
+def _rotulos(**rotulos):
+    return ",".join(f'{chave}="{valor}"' for chave, valor in rotulos.items())
+
+
+def texto_prometheus(spans, cache, registro, memoria):
+    """Métricas no formato texto do Prometheus (spans, cache de figuras, registro de datasets e memória)."""
+
+    linhas = [
+        "# HELP sojametrics_etapa_segundos_total Tempo acumulado por seção e etapa.",
+        "# TYPE sojametrics_etapa_segundos_total counter",
+        *(f"sojametrics_etapa_segundos_total{{{_rotulos(secao=s['secao'], etapa=s['etapa'])}}} {s['total_s']:.6f}" for s in spans),
+        "# HELP sojametrics_etapa_execucoes_total Execuções medidas por seção e etapa.",
+        "# TYPE sojametrics_etapa_execucoes_total counter",
+        *(f"sojametrics_etapa_execucoes_total{{{_rotulos(secao=s['secao'], etapa=s['etapa'])}}} {s['execucoes']}" for s in spans),
+        "# HELP sojametrics_etapa_segundos_max Maior tempo observado por seção e etapa.",
+        "# TYPE sojametrics_etapa_segundos_max gauge",
+        *(f"sojametrics_etapa_segundos_max{{{_rotulos(secao=s['secao'], etapa=s['etapa'])}}} {s['max_s']:.6f}" for s in spans),
+        "# HELP sojametrics_cache_figuras_total Eventos do cache de figuras por seção.",
+        "# TYPE sojametrics_cache_figuras_total counter",
+        *(f"sojametrics_cache_figuras_total{{{_rotulos(secao=secao, evento=evento)}}} {valor}"
+          for secao, contadores in cache["secoes"].items() for evento, valor in contadores.items()),
+        "# HELP sojametrics_cache_figuras_bytes Memória ocupada pelo cache de figuras.",
+        "# TYPE sojametrics_cache_figuras_bytes gauge",
+        f"sojametrics_cache_figuras_bytes {cache['bytes']}",
+        "# HELP sojametrics_registro_total Consultas ao registro de datasets (hit = já carregado).",
+        "# TYPE sojametrics_registro_total counter",
+        *(f"sojametrics_registro_total{{{_rotulos(dataset=nome, evento=evento)}}} {valor}"
+          for nome, contadores in registro.items() for evento, valor in contadores.items()),
+        "# HELP sojametrics_secao_memoria_pico_bytes Pico de memória alocada na última execução de cada seção (tracemalloc).",
+        "# TYPE sojametrics_secao_memoria_pico_bytes gauge",
+        *(f"sojametrics_secao_memoria_pico_bytes{{{_rotulos(secao=s['secao'])}}} {s['pico_ultimo_kb'] * 1024:.0f}" for s in memoria["secoes"]),
+        "# HELP sojametrics_sessoes_ativas Sessões com rerun nos últimos minutos.",
+        "# TYPE sojametrics_sessoes_ativas gauge",
+        f"sojametrics_sessoes_ativas {memoria['sessoes_ativas']}",
+        "# HELP sojametrics_processo_bytes Memória residente do processo.",
+        "# TYPE sojametrics_processo_bytes gauge",
+        f"sojametrics_processo_bytes {memoria.get('processo_bytes') or 0}",
+        "# HELP sojametrics_compartilhado_bytes Frames do registro e figuras em cache, compartilhados por todas as sessões.",
+        "# TYPE sojametrics_compartilhado_bytes gauge",
+        f"sojametrics_compartilhado_bytes {memoria.get('compartilhado_bytes') or 0}",
+        "# HELP sojametrics_sessao_memoria_pico_bytes Pico médio de memória por sessão ativa (tracemalloc).",
+        "# TYPE sojametrics_sessao_memoria_pico_bytes gauge",
+        f"sojametrics_sessao_memoria_pico_bytes {memoria.get('pico_por_sessao_bytes') or 0:.0f}",
+    ]
+    return "\n".join(linhas) + "\n"
+
+
+def exportar(caminho, spans, cache, registro, memoria):
+    """Grava as métricas em `caminho`: `.jsonl` acrescenta uma linha JSON; qualquer outra extensão vira texto Prometheus.
+
+    O texto Prometheus é gravado num temporário e trocado atomicamente, então um scraper nunca lê arquivo pela metade.
+    """
+
+    if caminho.endswith(".jsonl"):
+        linha = {"instante": time.time(), "spans": spans, "cache_figuras": cache, "registro": registro, "memoria": memoria}
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        return
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto_prometheus(spans, cache, registro, memoria))
+    os.replace(temporario, caminho)
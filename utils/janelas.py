@@ -0,0 +1,58 @@
+import numpy as np
+
+
+# ------------------------------------ janelas móveis por somas acumuladas ------------------------------------
+
+# coluna derivada -> (coluna base, agregação, tamanho da janela em meses)
+JANELAS_PADRAO = {
+    "tendencia_estoque": ("estoque", "media", 12),
+    "producao_12_meses": ("producao", "soma", 12),
+    "importacao_12_meses": ("importacao", "soma", 12),
+    "exportacao_12_meses": ("exportacao", "soma", 12),
+    "processamento_12_meses": ("processamento", "soma", 12),
+}
+
+
+def calcular_prefixos(df, colunas):
+    """Somas acumuladas (com zero inicial) e contagem acumulada de valores válidos de cada coluna."""
+
+    prefixos = {}
+    for coluna in colunas:
+        valores = df[coluna].to_numpy(dtype="float64")
+        validos = ~np.isnan(valores)
+        soma = np.concatenate([[0.0], np.cumsum(np.where(validos, valores, 0.0))])
+        contagem = np.concatenate([[0], np.cumsum(validos)])
+        prefixos[coluna] = (soma, contagem)
+    return prefixos
+
+
+def agregar_janela(prefixos, coluna, janela, agregacao="soma", inicio=0, fim=None):
+    """Janela móvel de qualquer tamanho para as linhas [inicio, fim), em O(1) por linha.
+
+    Equivale a rolling(window=janela, min_periods=1).sum()/.mean() sobre o histórico completo.
+    """
+
+    soma, contagem = prefixos[coluna]
+    fim = len(soma) - 1 if fim is None else fim
+    i = np.arange(inicio, fim) + 1
+    j = np.maximum(i - janela, 0)
+
+    total = soma[i] - soma[j]
+    n = contagem[i] - contagem[j]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        resultado = total / n if agregacao == "media" else np.where(n > 0, total, np.nan)
+    return resultado
+
+
+def adicionar_janelas(df, definicoes=JANELAS_PADRAO):
+    """Materializa as janelas móveis sobre todo o histórico (df já ordenado no tempo).
+
+    As janelas contam linhas, como o rolling(12) original: um mês que falte na série (sem preço, por exemplo)
+    estende a janela para o mês anterior. Por isso qualquer mês que entre ou saia do soja_mensal1 muda as
+    janelas e as correlações seguintes.
+    """
+
+    prefixos = calcular_prefixos(df, {base for base, _, _ in definicoes.values()})
+    for nome, (base, agregacao, janela) in definicoes.items():
+        df[nome] = agregar_janela(prefixos, base, janela, agregacao)
+    return df
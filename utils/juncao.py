@@ -0,0 +1,58 @@
+import pandas as pd
+
+
+# ------------------------------------ junção mensal das fontes ------------------------------------
+
+def inicio_mes(datas):
+    """Normaliza uma série de datas para o primeiro dia do mês."""
+
+    return pd.to_datetime(datas).dt.to_period("M").dt.to_timestamp()
+
+
+def indexar_mensal(df, nome, chave="ano_mes"):
+    """Valida a fonte e devolve seus valores indexados por um PeriodIndex mensal."""
+
+    if chave not in df.columns:
+        raise ValueError(f"Fonte '{nome}' sem a coluna de chave '{chave}'.")
+
+    datas = pd.to_datetime(df[chave], errors="coerce")
+    if datas.isna().any():
+        raise ValueError(f"Fonte '{nome}' tem {int(datas.isna().sum())} datas inválidas em '{chave}'.")
+
+    indice = pd.PeriodIndex(datas, freq="M", name=chave)
+    duplicadas = indice[indice.duplicated()].unique()
+    if len(duplicadas) > 0:
+        raise ValueError(f"Fonte '{nome}' tem meses duplicados: {', '.join(str(p) for p in duplicadas[:5])}")
+
+    df_indexado = df.drop(columns=[chave])
+    df_indexado.index = indice
+    return df_indexado
+
+
+def juntar_mensal(fontes, complementares=None, chave="ano_mes"):
+    """Junta todas as fontes mensais em um único concat(axis=1) sobre um PeriodIndex mensal.
+
+    `fontes` definem os meses da saída (junção externa); `complementares` (ex.: câmbio)
+    só preenchem colunas nos meses já existentes (junção à esquerda).
+    """
+
+    complementares = complementares or {}
+    indexadas = {nome: indexar_mensal(df, nome, chave) for nome, df in {**fontes, **complementares}.items()}
+
+    # a mesma coluna vinda de duas fontes seria sobrescrita em silêncio
+    vistas = {}
+    for nome, df in indexadas.items():
+        for coluna in df.columns:
+            if coluna in vistas:
+                raise ValueError(f"Coluna '{coluna}' presente nas fontes '{vistas[coluna]}' e '{nome}'.")
+            vistas[coluna] = nome
+
+    meses = pd.PeriodIndex([], freq="M", name=chave)
+    for nome in fontes:
+        meses = meses.union(indexadas[nome].index)
+
+    df_junto = pd.concat(indexadas.values(), axis=1, join="outer", sort=True)
+    df_junto = df_junto.reindex(meses.sort_values())
+
+    df_junto.insert(0, chave, df_junto.index.to_timestamp())
+    return df_junto.reset_index(drop=True)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from utils.correlacao import PRECOS
+
+
+# ------------------------------------ tabela materializada dos KPIs por ano ------------------------------------
+
+KPIS_ANUAIS = ["saldo", "usdbrl", "estoque_inicial", "producao", "importacao", "exportacao", "processamento"]
+
+
+def variacao_anual(valores):
+    """Variação (%) de cada ano contra o ano imediatamente anterior (NaN quando o anterior não existe)."""
+
+    anterior = valores.shift(1)
+    return (valores - anterior) / anterior * 100
+
+
+def materializar_kpis(df_ano, df_mensal, kpis=KPIS_ANUAIS, precos=PRECOS):
+    """Tabela indexada pelo ano com o valor e a variação YoY de cada KPI, para todos os anos do soja_anual1.
+
+    Os preços vêm do último mês de cada ano no mensal; `ano_preco` é o último ano mensal disponível
+    até o ano da linha (o painel mostra esse ano no rótulo do preço).
+    """
+
+    # anos consecutivos: o shift(1) da variação sempre compara com o ano calendário anterior
+    anos = np.arange(df_ano["periodo"].min(), df_ano["periodo"].max() + 1)
+    anual = df_ano.set_index("periodo")[kpis].reindex(anos)
+
+    tabela = {}
+    for kpi in kpis:
+        tabela[kpi] = anual[kpi]
+        tabela[f"{kpi}_yoy"] = variacao_anual(anual[kpi])
+
+    # preço de fechamento de cada ano (último mês disponível) e sua variação contra o ano anterior
+    precos_ano = df_mensal.sort_values("ano_mes").groupby("ano")[list(precos)].last()
+    anos_mensal = precos_ano.index
+    precos_ano = precos_ano.reindex(np.arange(anos_mensal.min(), anos_mensal.max() + 1))
+
+    # último ano mensal com dados até cada ano (-1 = nenhum, vira NaN no reindex)
+    ano_preco = pd.Series(anos_mensal, index=anos_mensal).reindex(anos, method="ffill")
+    linhas_preco = ano_preco.fillna(-1).astype(int).to_numpy()
+
+    tabela["ano_preco"] = ano_preco
+    for preco in precos:
+        tabela[preco] = precos_ano[preco].reindex(linhas_preco).set_axis(anos)
+        tabela[f"{preco}_yoy"] = variacao_anual(precos_ano[preco]).reindex(linhas_preco).set_axis(anos)
+
+    return pd.DataFrame(tabela).rename_axis("ano")
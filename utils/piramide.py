@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+
+# ------------------------------------ pirâmide OHLC do câmbio (dia -> semana -> mês -> ano) ------------------------------------
+
+# nível -> (regra do resample, duração nominal em dias)
+NIVEIS = {
+    "dia": ("D", 1),
+    "semana": ("W-SUN", 7),
+    "mes": ("MS", 28),
+    "ano": ("YS", 365),
+}
+
+MAX_CANDLES = 400     # máximo de candles desenhados para a faixa selecionada
+
+
+def agregar_ohlc(df, regra):
+    """Agrega um OHLC (coluna `datetime`) para um período maior: abertura do primeiro, máxima, mínima e fechamento do último."""
+
+    agregado = df.resample(regra, on="datetime").agg({"open": "first", "high": "max", "low": "min", "close": "last"})
+    return agregado.dropna(subset=["close"]).reset_index()
+
+
+def construir_piramide(df_dolar):
+    """Monta todos os níveis, cada um agregado direto da série OHLC original.
+
+    Semanas não se encaixam em meses: agregar o mês das barras semanais jogaria a semana que cruza a virada
+    inteira no mês do domingo e erraria abertura/máxima/mínima/fechamento nas bordas (e o ano herdaria o erro).
+    Níveis mais finos que o espaçamento da própria série (ex.: "dia" numa série semanal) são omitidos.
+    """
+
+    df = df_dolar[["datetime", "open", "high", "low", "close"]].sort_values("datetime", ignore_index=True)
+    espacamento = df["datetime"].diff().median() / pd.Timedelta(days=1)
+
+    niveis = [agregar_ohlc(df, regra).assign(nivel=nivel) for nivel, (regra, dias) in NIVEIS.items() if dias >= espacamento]
+    return pd.concat(niveis, ignore_index=True)[["nivel", "datetime", "open", "high", "low", "close"]]
+
+
+def separar_niveis(df_piramide):
+    """{nível: OHLC ordenado por data} na ordem do mais fino para o mais grosso."""
+
+    return {
+        nivel: df_piramide[df_piramide["nivel"] == nivel].drop(columns="nivel").sort_values("datetime", ignore_index=True)
+        for nivel in NIVEIS
+        if (df_piramide["nivel"] == nivel).any()
+    }
+
+
+def _limites(df_nivel, inicio, fim):
+    datas = df_nivel["datetime"].to_numpy()
+    return np.searchsorted(datas, np.datetime64(inicio), "left"), np.searchsorted(datas, np.datetime64(fim), "right")
+
+
+def selecionar_nivel(niveis, inicio, fim, max_candles=MAX_CANDLES):
+    """Retorna (nível, fatia) do nível mais fino com no máximo `max_candles` candles em [inicio, fim].
+
+    A contagem e o recorte usam busca binária sobre as datas já ordenadas, sem reagregar nada.
+    """
+
+    nivel = None
+    for nivel, df_nivel in niveis.items():
+        i, j = _limites(df_nivel, inicio, fim)
+        if j - i <= max_candles:
+            break
+    return nivel, niveis[nivel].iloc[i:j]
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+# ------------------------------------ redução de séries (usada pelas sparklines dos KPIs) ------------------------------------
+
+METODOS = ("lttb", "minmax")
+
+
+def _numerico(x):
+    # datas viram nanossegundos para o cálculo das áreas do LTTB
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype("int64").astype("float64")
+    return x.astype("float64")
+
+
+def lttb(x, y, n_saida):
+    """Índices escolhidos pelo Largest-Triangle-Three-Buckets (preserva a forma visual da série)."""
+
+    n = len(y)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+
+    x = _numerico(x)
+    y = np.asarray(y, dtype="float64")
+
+    # primeiro e último pontos fixos; os demais divididos em n_saida - 2 baldes
+    limites = np.linspace(1, n - 1, n_saida - 1).astype(np.int64)
+    indices = np.empty(n_saida, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    # vértice C de cada balde = média do balde seguinte (o último balde usa o último ponto)
+    tamanhos = np.diff(limites)
+    cx = np.append((np.add.reduceat(x[:-1], limites[:-1]) / tamanhos)[1:], x[-1])
+    cy = np.append((np.add.reduceat(y[:-1], limites[:-1]) / tamanhos)[1:], y[-1])
+
+    # o vértice A depende do ponto escolhido no balde anterior, então só este passo é sequencial
+    a = 0
+    for i in range(n_saida - 2):
+        ini, fim = limites[i], limites[i + 1]
+        area = np.abs((x[a] - cx[i]) * (y[ini:fim] - y[a]) - (x[a] - x[ini:fim]) * (cy[i] - y[a]))
+        a = ini + int(area.argmax())
+        indices[i + 1] = a
+
+    return indices
+
+
+def minmax(y, n_saida):
+    """Índices do mínimo e do máximo de cada balde (preserva picos; mais barato que o LTTB)."""
+
+    n = len(y)
+    if n_saida >= n or n_saida < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype="float64")
+    n_baldes = (n_saida - 2) // 2
+    baldes = np.arange(n) * n_baldes // n
+
+    # ordenando por (balde, valor): o primeiro de cada balde é o mínimo e o último o máximo
+    ordem = np.lexsort((y, baldes))
+    inicios = np.searchsorted(baldes[ordem], np.arange(n_baldes))
+    fins = np.append(inicios[1:], n) - 1
+    return np.unique(np.concatenate([[0, n - 1], ordem[inicios], ordem[fins]]))
+
+
+def reduzir_serie(x, y, max_pontos, metodo="lttb"):
+    """Retorna (x, y) com no máximo `max_pontos` pontos, sem NaN e na ordem original (séries curtas saem inteiras)."""
+
+    if metodo not in METODOS:
+        raise ValueError(f"Método de redução inválido: {metodo!r} (use um de {METODOS})")
+
+    x = np.asarray(x)
+    y = np.asarray(y, dtype="float64")
+    validos = ~np.isnan(y)
+    x, y = x[validos], y[validos]
+
+    indices = lttb(x, y, max_pontos) if metodo == "lttb" else minmax(y, max_pontos)
+    return x[indices], y[indices]
+
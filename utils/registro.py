@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.armazenamento import DATABASE_DIR, caminho_arrow, carregar_arrow
+from utils.cache_planilha import hash_arquivo
+
+
+# ------------------------------------ registro de datasets compartilhado entre as páginas ------------------------------------
+
+INTERVALO_VERIFICACAO = 30       # intervalo mínimo entre verificações do arquivo em disco (s)
+
+# base imutável: as sessões recebem vistas (cópia rasa) e fatias sem copiar dados. Nos frames quem garante é o
+# copy-on-write do pandas >= 3 (escritas geram cópia própria; `.values`/`to_numpy()` devolvem vistas somente
+# leitura); os arrays numpy soltos (ex.: somas das correlações) são marcados como somente leitura
+BASE_IMUTAVEL = os.environ.get("SOJAMETRICS_BASE_IMUTAVEL", "1") != "0"
+
+# caminho -> (instante da última verificação, assinatura)
+_assinaturas = {}
+
+# nome -> (função, dependências) dos frames derivados
+_derivados = {}
+
+# (nome, pasta) -> (versão, objeto): uma única instância por processo, compartilhada por páginas e sessões
+_carregados = {}
+_lock = threading.RLock()
+
+# nome -> {"hits", "misses"}: consultas atendidas pelo objeto já carregado vs. (re)construções
+_contadores = {}
+
+
+def assinatura_arquivo(caminho, intervalo=INTERVALO_VERIFICACAO):
+    """Retorna (mtime, tamanho, sha256) do arquivo, usada como versão do dataset.
+
+    O stat é feito no máximo uma vez por `intervalo` e o hash só é recalculado quando mtime/tamanho mudam,
+    então as interações com os widgets não leem o disco.
+    """
+
+    agora = time.monotonic()
+    anterior = _assinaturas.get(caminho)
+    if anterior is not None and agora - anterior[0] < intervalo:
+        return anterior[1]
+
+    info = os.stat(caminho)
+    if anterior is not None and anterior[1][:2] == (info.st_mtime_ns, info.st_size):
+        assinatura = anterior[1]
+    else:
+        assinatura = (info.st_mtime_ns, info.st_size, hash_arquivo(caminho))
+
+    _assinaturas[caminho] = (agora, assinatura)
+    return assinatura
+
+
+def assinatura_dataset(nome, pasta=DATABASE_DIR):
+    """Assinatura do .arrow do dataset (ou do CSV, quando o .arrow não existe)."""
+
+    caminho = caminho_arrow(nome, pasta)
+    if not os.path.exists(caminho):
+        caminho = os.path.join(pasta, f"{nome}.csv")
+    return assinatura_arquivo(caminho)
+
+
+def registrar(nome, *dependencias):
+    """Decorador: registra `nome` como frame derivado, construído a partir de `dependencias`.
+
+    Dependências são datasets em disco (soja_mensal1, variacao_cambial, ...) ou outros derivados.
+    """
+
+    def decorador(funcao):
+        _derivados[nome] = (funcao, dependencias)
+        return funcao
+
+    return decorador
+
+
+def _versao(nome, pasta):
+    if nome not in _derivados:
+        return assinatura_dataset(nome, pasta)
+    return tuple(_versao(dependencia, pasta) for dependencia in _derivados[nome][1])
+
+
+def _vista(objeto):
+    # com o copy-on-write do pandas a cópia rasa não duplica os dados, e qualquer escrita de quem
+    # chamou gera cópia própria: o objeto compartilhado nunca é alterado
+    if isinstance(objeto, pd.DataFrame):
+        return objeto.copy(deep=False)
+    if isinstance(objeto, dict):
+        return {chave: _vista(valor) for chave, valor in objeto.items()}
+    return objeto
+
+
+def congelar(objeto):
+    """Marca como somente leitura os arrays numpy soltos de um objeto compartilhado (dicts percorridos recursivamente).
+
+    DataFrames e FrameTemporal não são alterados: o copy-on-write já impede que uma sessão mude a base das outras.
+    """
+
+    if isinstance(objeto, dict):
+        for valor in objeto.values():
+            congelar(valor)
+    elif isinstance(objeto, np.ndarray):
+        objeto.flags.writeable = False
+    return objeto
+
+
+def _obter(nome, pasta):
+    versao = _versao(nome, pasta)
+    with _lock:
+        item = _carregados.get((nome, pasta))
+        contagem = _contadores.setdefault(nome, {"hits": 0, "misses": 0})
+        if item is not None and item[0] == versao:
+            contagem["hits"] += 1
+        else:
+            contagem["misses"] += 1
+            if nome in _derivados:
+                funcao, dependencias = _derivados[nome]
+                objeto = funcao(*(obter(dependencia, pasta) for dependencia in dependencias))
+            else:
+                objeto = carregar_arrow(nome, pasta)
+            if BASE_IMUTAVEL:
+                congelar(objeto)
+            item = _carregados[(nome, pasta)] = (versao, objeto)
+        return item[1]
+
+
+def obter(nome, pasta=DATABASE_DIR):
+    """Dataset (ou frame derivado) carregado uma vez por processo; devolve uma vista somente leitura.
+
+    É recarregado apenas quando a assinatura de algum arquivo de origem muda.
+    """
+
+    # caminho absoluto: "database" e o caminho montado pela página de forecast apontam para a mesma entrada
+    return _vista(_obter(nome, os.path.abspath(pasta)))
+
+
+def _tamanho(objeto):
+    if hasattr(objeto, "frame"):  # FrameTemporal
+        objeto = objeto.frame
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(deep=True).sum())
+    if isinstance(objeto, dict):
+        return sum(_tamanho(valor) for valor in objeto.values())
+    return int(getattr(objeto, "nbytes", 0))
+
+
+def situacao():
+    """Tabela com os datasets e derivados registrados: origem, dependências, se já existem, memória ocupada e hits/misses."""
+
+    with _lock:
+        carregados = dict(_carregados)
+
+    linhas = []
+    for (nome, pasta), (_, objeto) in carregados.items():
+        linhas.append({
+            "nome": nome,
+            "pasta": pasta,
+            "tipo": "derivado" if nome in _derivados else "arquivo",
+            "dependencias": ", ".join(_derivados.get(nome, (None, ()))[1]),
+            "carregado": True,
+            "linhas": len(objeto) if hasattr(objeto, "__len__") else None,
+            "bytes": _tamanho(objeto),
+            **_contadores.get(nome, {"hits": 0, "misses": 0}),
+        })
+
+    for nome, (_, dependencias) in _derivados.items():
+        if not any(nome == carregado for carregado, _ in carregados):
+            linhas.append({"nome": nome, "pasta": None, "tipo": "derivado", "dependencias": ", ".join(dependencias),
+                           "carregado": False, "linhas": None, "bytes": 0, "hits": 0, "misses": 0})
+
+    return pd.DataFrame(linhas, columns=["nome", "pasta", "tipo", "dependencias", "carregado", "linhas", "bytes", "hits", "misses"])
+
+
+def contadores():
+    """Hits/misses de cada dataset ou derivado desde o início do processo."""
+
+    with _lock:
+        return {nome: dict(valores) for nome, valores in _contadores.items()}
+
+
+def invalidar():
+    """Descarta todos os datasets carregados (a próxima chamada relê os arquivos)."""
+
+    with _lock:
+        _carregados.clear()
+        _assinaturas.clear()
@@ -0,0 +1,157 @@
+import json
+import re
+import tomllib
+from html import escape
+
+
+# ------------------------------------ instantâneo estático (HTML/JSON) de uma página já executada ------------------------------------
+
+# cores do tema quando não há .streamlit/config.toml
+TEMA_PADRAO = {
+    "primaryColor": "#FFC107",
+    "backgroundColor": "#121212",
+    "secondaryBackgroundColor": "#1E1E1E",
+    "textColor": "#E0E0E0",
+}
+
+# elementos que não fazem sentido sem o servidor (downloads, popovers, blocos de evento)
+IGNORADOS = {"popover", "download_button", "event"}
+
+
+def carregar_tema(caminho):
+    """Cores do tema do Streamlit (seção [theme] do config.toml), com TEMA_PADRAO para o que faltar."""
+
+    try:
+        with open(caminho, "rb") as arquivo:
+            tema = tomllib.load(arquivo).get("theme", {})
+    except FileNotFoundError:
+        tema = {}
+    return {**TEMA_PADRAO, **{chave: valor for chave, valor in tema.items() if chave in TEMA_PADRAO}}
+
+
+def _markdown(texto):
+    """Markdown mínimo usado nos rótulos da página: **negrito**, [link](url) e quebras de linha."""
+
+    html = escape(texto)
+    html = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html)
+    html = re.sub(r"\[([^\]]+)\]\(([^)\s]+)\)", r'<a href="\2" target="_blank">\1</a>', html)
+    return html.replace("\n", "<br>")
+
+
+class Instantaneo:
+    """Converte a árvore de elementos de um AppTest já executado em HTML estático.
+
+    Os gráficos plotly vão como spec JSON (desenhados pelo plotly.js no navegador) e os widgets como o valor
+    selecionado, com link para a página interativa (`destino`), que assume quando o usuário quer mudar algo.
+    """
+
+    def __init__(self, destino):
+        self.destino = destino
+        self.graficos = []      # specs plotly na ordem da página
+        self.metricas = []      # {"rotulo", "valor", "delta"}
+        self.widgets = []       # {"tipo", "rotulo", "valor"}
+
+    def renderizar(self, no):
+        tipo = getattr(no, "type", None)
+        if tipo in IGNORADOS:
+            return ""
+        filhos = "".join(self.renderizar(filho) for filho in getattr(no, "children", {}).values())
+
+        if tipo == "flex_container":
+            caixa = no.proto.flex_container
+            classes = ["bloco", "horizontal" if caixa.direction == caixa.Direction.HORIZONTAL else "vertical"]
+            if caixa.border:
+                classes.append("borda")
+            return f'<div class="{" ".join(classes)}">{filhos}</div>'
+        if tipo == "column":
+            return f'<div class="coluna" style="flex:{no.weight:g}">{filhos}</div>'
+        if tipo == "markdown":
+            corpo = no.proto.body if no.proto.allow_html else _markdown(no.proto.body)
+            return f'<div class="markdown">{corpo}</div>'
+        if tipo == "metric":
+            return self._metrica(no.proto)
+        if tipo == "plotly_chart":
+            self.graficos.append(json.loads(no.proto.spec))
+            return f'<div class="grafico" id="grafico-{len(self.graficos) - 1}"></div>'
+        if tipo in ("slider", "selectbox"):
+            return self._widget(tipo, no)
+        return filhos
+
+    def _metrica(self, proto):
+        self.metricas.append({"rotulo": proto.label, "valor": proto.body, "delta": proto.delta})
+        delta = ""
+        if proto.delta:
+            sinal = "negativo" if proto.delta.lstrip().startswith("-") else "positivo"
+            delta = f'<div class="delta {sinal}">{escape(proto.delta)}</div>'
+        return (
+            f'<div class="metrica"><div class="rotulo">{_markdown(proto.label)}</div>'
+            f'<div class="valor">{escape(proto.body)}</div>{delta}</div>'
+        )
+
+    def _widget(self, tipo, no):
+        valor = no.value
+        texto = f"{valor[0]} – {valor[1]}" if isinstance(valor, tuple) else str(valor)
+        self.widgets.append({"tipo": tipo, "rotulo": no.label, "valor": list(valor) if isinstance(valor, tuple) else valor})
+        return (
+            f'<a class="widget" href="{escape(self.destino)}" title="Abrir o painel interativo para alterar">'
+            f'<span class="rotulo">{_markdown(no.label)}</span><span class="valor">{escape(texto)}</span></a>'
+        )
+
+
+def pagina_html(at, titulo, tema, gerado_em, destino, plotly_js):
+    """HTML completo do instantâneo da página executada em `at` e os dados exibidos (métricas, widgets e gráficos).
+
+    `plotly_js` é o caminho (relativo ao HTML) do plotly.min.js; `destino` é o endereço do painel interativo.
+    """
+
+    instantaneo = Instantaneo(destino)
+    corpo = instantaneo.renderizar(at.main)
+    barra = instantaneo.renderizar(at.sidebar)
+    graficos = json.dumps(instantaneo.graficos, separators=(",", ":")).replace("</", "<\\/")
+
+    html = f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(titulo)}</title>
+<style>
+body {{ margin: 0; background: {tema["backgroundColor"]}; color: {tema["textColor"]}; font-family: "Source Sans Pro", sans-serif; }}
+a {{ color: {tema["primaryColor"]}; }}
+.aviso {{ position: sticky; top: 0; z-index: 10; padding: 8px 16px; background: {tema["secondaryBackgroundColor"]}; border-bottom: 1px solid {tema["primaryColor"]}; font-size: 14px; }}
+.pagina {{ display: flex; }}
+.lateral {{ width: 240px; flex: none; padding: 16px; background: {tema["secondaryBackgroundColor"]}; }}
+.principal {{ flex: 1; min-width: 0; padding: 16px 48px; }}
+.bloco {{ display: flex; gap: 16px; min-width: 0; }}
+.bloco.vertical {{ flex-direction: column; }}
+.bloco.horizontal {{ flex-direction: row; }}
+.bloco.borda {{ border: 1px solid rgba(250, 250, 250, 0.2); border-radius: 8px; padding: 16px; }}
+.coluna {{ display: flex; flex-direction: column; gap: 16px; min-width: 0; }}
+.markdown p {{ margin: 0; }}
+.metrica {{ border: 1px solid rgba(250, 250, 250, 0.2); border-radius: 8px; padding: 12px; }}
+.metrica .valor {{ font-size: 36px; }}
+.delta.positivo {{ color: #21c354; }}
+.delta.negativo {{ color: #ff4b4b; }}
+.widget {{ display: flex; flex-direction: column; gap: 4px; text-decoration: none; color: inherit; }}
+.widget .valor {{ padding: 8px; border-radius: 8px; background: {tema["secondaryBackgroundColor"]}; }}
+.grafico {{ width: 100%; min-height: 50px; }}
+</style>
+</head>
+<body>
+<div class="aviso">Instantâneo estático gerado em {escape(gerado_em)} com as seleções padrão —
+<a href="{escape(destino)}">Abrir painel interativo</a></div>
+<div class="pagina">
+<div class="lateral">{barra}</div>
+<div class="principal">{corpo}</div>
+</div>
+<script src="{escape(plotly_js)}"></script>
+<script>
+const graficos = {graficos};
+const base = {{paper_bgcolor: "rgba(0,0,0,0)", plot_bgcolor: "rgba(0,0,0,0)", font: {{color: "{tema["textColor"]}"}}}};
+graficos.forEach((spec, i) => Plotly.newPlot("grafico-" + i, spec.data, {{...base, ...spec.layout}}, {{responsive: true, displaylogo: false}}));
+</script>
+</body>
+</html>
+"""
+    dados = {"metricas": instantaneo.metricas, "widgets": instantaneo.widgets, "graficos": instantaneo.graficos}
+    return html, dados
@@ -0,0 +1,64 @@
+from html import escape
+
+import numpy as np
+
+from utils.reducao import reduzir_serie
+
+
+# ------------------------------------ sparklines dos KPIs em SVG inline ------------------------------------
+
+ALTURA = 50           # altura exibida (px), a mesma das antigas figuras plotly
+LARGURA = 300         # largura do viewBox; o SVG estica para a largura da coluna
+PONTOS_MAX = 150      # orçamento de pontos por sparkline (LTTB), suficiente para 300 px de largura
+MARGEM = 20           # margem lateral (px)
+
+# tendência de alta (verde) ou baixa (vermelho): (linha, preenchimento)
+CORES = {
+    True: ("#2ca02c", "rgba(44, 200, 44, 0.3)"),
+    False: ("#d62728", "rgba(214, 39, 40, 0.3)"),
+}
+
+
+def _escala(valores, minimo, maximo, tamanho):
+    amplitude = maximo - minimo
+    if amplitude == 0:
+        return np.full(len(valores), tamanho / 2)
+    return (valores - minimo) / amplitude * tamanho
+
+
+def sparkline_svg(x, y, titulo, pontos_max=PONTOS_MAX):
+    """SVG de uma sparkline (linha + área até o zero), verde se o último valor >= primeiro, senão vermelha."""
+
+    x, y = reduzir_serie(x, y, pontos_max)
+    if len(y) == 0:
+        return ""
+
+    x = x.astype("datetime64[ns]").astype("int64") if np.issubdtype(x.dtype, np.datetime64) else x.astype("float64")
+    cor, preenchimento = CORES[bool(y[-1] >= y[0])]
+
+    # mesmo enquadramento do plotly com fill="tozeroy": o eixo y sempre inclui o zero
+    base, topo = min(y.min(), 0.0), max(y.max(), 0.0)
+    pos_x = _escala(x.astype("float64"), x.min(), x.max(), LARGURA)
+    pos_y = ALTURA - _escala(y, base, topo, ALTURA)
+    zero = ALTURA - _escala(np.zeros(1), base, topo, ALTURA)[0]
+
+    linha = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(pos_x, pos_y))
+    area = f"{pos_x[0]:.1f},{zero:.1f} {linha} {pos_x[-1]:.1f},{zero:.1f}"
+
+    return (
+        f'<svg viewBox="0 0 {LARGURA} {ALTURA}" preserveAspectRatio="none" width="100%" height="{ALTURA}" '
+        f'style="display:block;padding:0 {MARGEM}px;box-sizing:border-box;overflow:visible">'
+        f"<title>{escape(titulo)}</title>"
+        f'<polygon points="{area}" fill="{preenchimento}" stroke="none"/>'
+        f'<polyline points="{linha}" fill="none" stroke="{cor}" stroke-width="2" vector-effect="non-scaling-stroke"/>'
+        "</svg>"
+    )
+
+
+def sparklines_svg(series, pontos_max=PONTOS_MAX):
+    """Gera todas as sparklines de uma vez: {nome: (x, y, título)} -> {nome: svg}.
+
+    Cada sparkline vira um SVG estático de poucos KB, sem instância do plotly.js no navegador.
+    """
+
+    return {nome: sparkline_svg(x, y, titulo, pontos_max) for nome, (x, y, titulo) in series.items()}
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+
+# ------------------------------------ frame indexado no tempo com fatias sem cópia ------------------------------------
+
+class FrameTemporal:
+    """DataFrame ordenado sobre um DatetimeIndex; faixas de datas/anos viram fatias por busca binária.
+
+    As colunas derivadas devem ser gravadas uma única vez no frame base (antes de criar o FrameTemporal);
+    as fatias são vistas do frame compartilhado e, com o copy-on-write do pandas, nunca o alteram.
+    """
+
+    def __init__(self, df, datas):
+        """`datas`: nome da coluna de datas ou valores de data alinhados às linhas de `df`."""
+
+        # resolução fixa em ns, a mesma de Timestamp.value usada nas buscas
+        datas = pd.DatetimeIndex(df[datas] if isinstance(datas, str) else datas).as_unit("ns")
+        ordem = np.argsort(datas.asi8, kind="stable")
+
+        self._frame = df.iloc[ordem].set_axis(datas[ordem].rename(None), axis=0)
+        self._datas = self._frame.index.asi8
+
+    def __len__(self):
+        return len(self._frame)
+
+    @property
+    def frame(self):
+        """Frame completo (vista somente leitura)."""
+
+        return self._frame.copy(deep=False)
+
+    def faixa(self, inicio, fim):
+        """Linhas com data em [inicio, fim], sem máscara booleana nem cópia."""
+
+        i = np.searchsorted(self._datas, pd.Timestamp(inicio).value, "left")
+        j = np.searchsorted(self._datas, pd.Timestamp(fim).value, "right")
+        return self._frame.iloc[i:j]
+
+    def anos(self, ano_inicio, ano_fim):
+        """Linhas dos anos ano_inicio..ano_fim (inclusive)."""
+
+        return self.faixa(pd.Timestamp(year=int(ano_inicio), month=1, day=1),
+                          pd.Timestamp(year=int(ano_fim) + 1, month=1, day=1) - pd.Timedelta(1, "ns"))